@@ -3,27 +3,41 @@
 
 from __future__ import annotations
 
+import json
 import pkgutil
 from dataclasses import dataclass
 from pathlib import PurePath
 from typing import Iterator
 
-from pants.backend.docker.target_types import DockerImageSourceField
+from pants.backend.docker.target_types import DockerImageInstructionsField, DockerImageSourceField
 from pants.backend.docker.util_rules.docker_build_args import DockerBuildArgs
 from pants.backend.python.goals import lockfile
 from pants.backend.python.goals.lockfile import GeneratePythonLockfile
 from pants.backend.python.subsystems.python_tool_base import PythonToolRequirementsBase
 from pants.backend.python.target_types import EntryPoint
 from pants.backend.python.util_rules.pex import PexRequest, VenvPex, VenvPexProcess
+from pants.base.specs import AddressSpecs, SiblingAddresses
 from pants.core.goals.generate_lockfiles import GenerateToolLockfileSentinel
 from pants.engine.addresses import Address
-from pants.engine.fs import CreateDigest, Digest, FileContent
-from pants.engine.process import Process, ProcessResult
-from pants.engine.rules import Get, collect_rules, rule
-from pants.engine.target import HydratedSources, HydrateSourcesRequest, SourcesField, WrappedTarget
+from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests, PathGlobs, Snapshot
+from pants.engine.process import FallibleProcessResult, Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import (
+    HydratedSources,
+    HydrateSourcesRequest,
+    SourcesField,
+    Target,
+    Targets,
+    WrappedTarget,
+)
 from pants.engine.unions import UnionRule
+from pants.option.global_options import FilesNotFoundBehavior
+from pants.option.option_types import IntOption
+from pants.util.collections import partition_containing
 from pants.util.docutil import git_url
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
 
 _DOCKERFILE_SANDBOX_TOOL = "dockerfile_wrapper_script.py"
 _DOCKERFILE_PACKAGE = "pants.backend.docker.subsystems"
@@ -45,6 +59,22 @@ class DockerfileParser(PythonToolRequirementsBase):
     )
     default_lockfile_url = git_url(default_lockfile_path)
 
+    batch_size = IntOption(
+        "--batch-size",
+        default=1,
+        help=(
+            "The maximum number of Dockerfiles to parse in a single parser process.\n\n"
+            "A `docker_image` target is batched with the other `docker_image` targets declared in "
+            "the same BUILD file. Batch boundaries are derived from the addresses of the targets, "
+            "so that adding or removing an image usually only changes the batch that it belongs "
+            "to.\n\n"
+            "Values greater than 1 reduce the number of parser processes on cold runs, at the "
+            "cost of re-parsing the whole batch when one of its Dockerfiles changes. Images "
+            "using `instructions` rather than a Dockerfile are always parsed on their own."
+        ),
+        advanced=True,
+    )
+
 
 class DockerfileParserLockfileSentinel(GenerateToolLockfileSentinel):
     resolve_name = DockerfileParser.options_scope
@@ -139,45 +169,31 @@ def split_iterable(sep: str, obj: list[str] | tuple[str, ...]) -> Iterator[tuple
     yield tuple(obj)
 
 
-@rule
-async def parse_dockerfile(request: DockerfileInfoRequest) -> DockerfileInfo:
-    wrapped_target = await Get(WrappedTarget, Address, request.address)
-    target = wrapped_target.target
-    sources = await Get(
-        HydratedSources,
-        HydrateSourcesRequest(
-            target.get(SourcesField),
-            for_sources_types=(DockerImageSourceField,),
-            enable_codegen=True,
-        ),
-    )
+_DOCKERFILE_COMMANDS = (
+    "version-tags",
+    "putative-targets",
+    "build-args",
+    "from-image-build-args",
+    "copy-sources",
+)
 
-    dockerfile = sources.snapshot.files[0]
-
-    result = await Get(
-        ProcessResult,
-        DockerfileParseRequest(
-            sources.snapshot.digest,
-            (
-                "version-tags,putative-targets,build-args,from-image-build-args,copy-sources",
-                dockerfile,
-            ),
-        ),
-    )
 
-    output = result.stdout.decode("utf-8").strip().split("\n")
+def _dockerfile_info(
+    address: Address, snapshot: Snapshot, outputs: tuple[tuple[str, ...], ...]
+) -> DockerfileInfo:
+    dockerfile = snapshot.files[0]
     (
         version_tags,
         putative_targets,
         build_args,
         from_image_build_arg_names,
         copy_sources,
-    ) = split_iterable("---", output)
+    ) = outputs
 
     try:
         return DockerfileInfo(
-            address=request.address,
-            digest=sources.snapshot.digest,
+            address=address,
+            digest=snapshot.digest,
             source=dockerfile,
             putative_target_addresses=putative_targets,
             version_tags=version_tags,
@@ -187,10 +203,135 @@ async def parse_dockerfile(request: DockerfileInfoRequest) -> DockerfileInfo:
         )
     except ValueError as e:
         raise DockerfileInfoError(
-            f"Error while parsing {dockerfile} for the {request.address} target: {e}"
+            f"Error while parsing {dockerfile} for the {address} target: {e}"
         ) from e
 
 
+def _hydrate_dockerfile_request(target: Target) -> HydrateSourcesRequest:
+    return HydrateSourcesRequest(
+        target.get(SourcesField),
+        for_sources_types=(DockerImageSourceField,),
+        enable_codegen=True,
+    )
+
+
+@dataclass(frozen=True)
+class DockerfileInfoBatchRequest:
+    """Parse the Dockerfiles of several `docker_image` targets in a single parser process."""
+
+    addresses: tuple[Address, ...]
+
+
+@dataclass(frozen=True)
+class DockerfileInfoBatch:
+    """The `DockerfileInfo` for each address of a batch.
+
+    If the batch failed to parse, it is empty: callers should then parse each Dockerfile on its own,
+    in order to report errors against the relevant target.
+    """
+
+    infos: FrozenDict[Address, DockerfileInfo]
+
+    def get(self, address: Address) -> DockerfileInfo | None:
+        return self.infos.get(address)
+
+
+@rule
+async def parse_dockerfiles_batch(
+    request: DockerfileInfoBatchRequest, parser: ParserSetup
+) -> DockerfileInfoBatch:
+    wrapped_targets = await MultiGet(
+        Get(WrappedTarget, Address, address) for address in request.addresses
+    )
+    # Hydrating the sources of a misconfigured target fails, which would fail the whole batch. So
+    # glob for the Dockerfiles without validating them, and only batch the targets with a single
+    # Dockerfile in the source tree: the others (e.g. with generated `instructions`, or a missing
+    # Dockerfile) are parsed on their own, which reports any error against the relevant target.
+    snapshots = await MultiGet(
+        Get(
+            Snapshot,
+            PathGlobs,
+            wrapped.target[DockerImageSourceField].path_globs(FilesNotFoundBehavior.ignore),
+        )
+        for wrapped in wrapped_targets
+    )
+    members = [
+        (wrapped.target.address, snapshot)
+        for wrapped, snapshot in zip(wrapped_targets, snapshots)
+        if len(snapshot.files) == 1 and not wrapped.target[DockerImageInstructionsField].value
+    ]
+    if not members:
+        return DockerfileInfoBatch(FrozenDict())
+
+    input_digest = await Get(Digest, MergeDigests(snapshot.digest for _, snapshot in members))
+    dockerfiles = sorted({snapshot.files[0] for _, snapshot in members})
+
+    result = await Get(
+        FallibleProcessResult,
+        VenvPexProcess(
+            parser.pex,
+            argv=("--json", ",".join(_DOCKERFILE_COMMANDS), *dockerfiles),
+            description=f"Parse {pluralize(len(dockerfiles), 'Dockerfile')}.",
+            input_digest=input_digest,
+            level=LogLevel.DEBUG,
+        ),
+    )
+    if result.exit_code != 0:
+        return DockerfileInfoBatch(FrozenDict())
+
+    outputs_by_dockerfile = json.loads(result.stdout)
+    infos = {}
+    for address, snapshot in members:
+        outputs = outputs_by_dockerfile[snapshot.files[0]]
+        try:
+            infos[address] = _dockerfile_info(
+                address, snapshot, tuple(tuple(outputs[cmd]) for cmd in _DOCKERFILE_COMMANDS)
+            )
+        except DockerfileInfoError:
+            # Leave it to the single Dockerfile fallback to report the error.
+            continue
+    return DockerfileInfoBatch(FrozenDict(infos))
+
+
+@rule
+async def parse_dockerfile(
+    request: DockerfileInfoRequest, dockerfile_parser: DockerfileParser
+) -> DockerfileInfo:
+    if dockerfile_parser.batch_size > 1:
+        # Every image in a batch computes the same batch, so the engine runs it once for all of
+        # them.
+        candidates = await Get(Targets, AddressSpecs([SiblingAddresses(request.address.spec_path)]))
+        batch_addresses = partition_containing(
+            (tgt.address for tgt in candidates if tgt.has_field(DockerImageSourceField)),
+            request.address.spec,
+            key=lambda address: address.spec,
+            size_max=dockerfile_parser.batch_size,
+        )
+        if batch_addresses is not None:
+            batch = await Get(
+                DockerfileInfoBatch, DockerfileInfoBatchRequest(tuple(batch_addresses))
+            )
+            info = batch.get(request.address)
+            if info is not None:
+                return info
+
+    wrapped_target = await Get(WrappedTarget, Address, request.address)
+    sources = await Get(
+        HydratedSources, HydrateSourcesRequest, _hydrate_dockerfile_request(wrapped_target.target)
+    )
+    dockerfile = sources.snapshot.files[0]
+
+    result = await Get(
+        ProcessResult,
+        DockerfileParseRequest(
+            sources.snapshot.digest, (",".join(_DOCKERFILE_COMMANDS), dockerfile)
+        ),
+    )
+
+    output = result.stdout.decode("utf-8").strip().split("\n")
+    return _dockerfile_info(request.address, sources.snapshot, tuple(split_iterable("---", output)))
+
+
 def rules():
     return (
         *collect_rules(),
@@ -0,0 +1,93 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import time
+
+from pants.backend.docker.subsystems.dockerfile_parser import (
+    DockerfileInfo,
+    DockerfileInfoRequest,
+    ParserSetup,
+)
+from pants.backend.docker.subsystems.dockerfile_parser import rules as parser_rules
+from pants.backend.docker.target_types import DockerImageTarget
+from pants.backend.docker.util_rules.dockerfile import rules as dockerfile_rules
+from pants.backend.python.util_rules.pex import rules as pex_rules
+from pants.engine.addresses import Address
+from pants.engine.internals.selectors import Get, MultiGet
+from pants.engine.rules import rule
+from pants.testutil.rule_runner import QueryRule, RuleRunner
+from pants.util.frozendict import FrozenDict
+
+NUM_IMAGES = 200
+
+
+class AllDockerfileInfos(FrozenDict[Address, DockerfileInfo]):
+    pass
+
+
+@rule
+async def all_dockerfile_infos() -> AllDockerfileInfos:
+    addresses = [Address("images", target_name=f"image{i}") for i in range(NUM_IMAGES)]
+    infos = await MultiGet(
+        Get(DockerfileInfo, DockerfileInfoRequest(address)) for address in addresses
+    )
+    return AllDockerfileInfos(zip(addresses, infos))
+
+
+def _bench(batch_size: int) -> tuple[AllDockerfileInfos, int, float]:
+    rule_runner = RuleRunner(
+        rules=[
+            *dockerfile_rules(),
+            *parser_rules(),
+            *pex_rules(),
+            all_dockerfile_infos,
+            QueryRule(ParserSetup, ()),
+            QueryRule(AllDockerfileInfos, ()),
+        ],
+        target_types=[DockerImageTarget],
+    )
+    rule_runner.set_options(
+        ["--no-local-cache", f"--dockerfile-parser-batch-size={batch_size}"],
+        env_inherit={"PATH", "PYENV_ROOT", "HOME"},
+    )
+    rule_runner.write_files(
+        {
+            "images/BUILD": "\n".join(
+                f"docker_image(name='image{i}', source='image{i}.Dockerfile')"
+                for i in range(NUM_IMAGES)
+            ),
+            **{
+                f"images/image{i}.Dockerfile": (
+                    f"ARG BASE=images:image{i - 1}\nFROM $BASE\n"
+                    f"COPY src.python.app/bin{i}.pex /bin\n"
+                )
+                for i in range(NUM_IMAGES)
+            },
+        }
+    )
+
+    # Build the parser up front, so that only the parse processes are measured.
+    rule_runner.request(ParserSetup, [])
+    processes_before = rule_runner.scheduler.get_metrics().get("local_execution_requests", 0)
+    start = time.perf_counter()
+    infos = rule_runner.request(AllDockerfileInfos, [])
+    elapsed = time.perf_counter() - start
+    processes = rule_runner.scheduler.get_metrics().get("local_execution_requests", 0)
+    return infos, processes - processes_before, elapsed
+
+
+def test_bench_batched_dockerfile_parsing() -> None:
+    unbatched_infos, unbatched_processes, unbatched_time = _bench(batch_size=1)
+    batched_infos, batched_processes, batched_time = _bench(batch_size=50)
+    print(
+        f"\nParsing {NUM_IMAGES} Dockerfiles: {unbatched_processes} processes in "
+        f"{unbatched_time:.2f}s unbatched, {batched_processes} processes in {batched_time:.2f}s "
+        "batched"
+    )
+
+    assert batched_infos == unbatched_infos
+    assert unbatched_processes == NUM_IMAGES
+    assert batched_processes < NUM_IMAGES // 10
+    assert batched_time < unbatched_time
@@ -192,3 +192,50 @@ def test_baseimage_tags(rule_runner: RuleRunner) -> None:
         # Stage 2 is not pinned with a tag.
         "stage3 v0.54.0",
     )
+
+
+def test_batched_parse(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(
+        ["--dockerfile-parser-batch-size=16", "--files-not-found-behavior=error"],
+        env_inherit={"PATH", "PYENV_ROOT", "HOME"},
+    )
+    rule_runner.write_files(
+        {
+            "images/BUILD": dedent(
+                """\
+                docker_image(name="a", source="a.Dockerfile")
+                docker_image(name="b", instructions=["FROM other", "ARG OPT=value"])
+                docker_image(name="c", source="c.Dockerfile")
+                docker_image(name="d", source="missing.Dockerfile")
+                """
+            ),
+            "images/a.Dockerfile": "FROM base:1.0\nCOPY some.target/binary.pex /bin\n",
+            "images/c.Dockerfile": (
+                "FROM image1\nARG OPT_A=default_1\nFROM image2\nARG OPT_A=default_2\n"
+            ),
+        }
+    )
+
+    def parse(name: str) -> DockerfileInfo:
+        return rule_runner.request(
+            DockerfileInfo, [DockerfileInfoRequest(Address("images", target_name=name))]
+        )
+
+    info_a = parse("a")
+    assert info_a.source == "images/a.Dockerfile"
+    assert info_a.version_tags == ("stage0 1.0",)
+    assert info_a.putative_target_addresses == ("some/target:binary",)
+
+    info_b = parse("b")
+    assert info_b.version_tags == ("stage0 latest",)
+    assert info_b.build_args == DockerBuildArgs.from_strings("OPT=value")
+
+    # Errors are still reported against the relevant target, without failing the rest of the batch.
+    err_msg = (
+        r"Error while parsing images/c.Dockerfile for the images:c target: DockerBuildArgs: "
+        r"duplicated"
+    )
+    with pytest.raises(ExecutionError, match=err_msg):
+        parse("c")
+    with pytest.raises(ExecutionError, match=r"images:d's `source` field"):
+        parse("d")
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import json
 import re
 import sys
 from dataclasses import dataclass
@@ -68,7 +69,8 @@ _image_ref_regexp = re.compile(
 )
 
 
-def main(cmd: str, args: list[str]) -> None:
+def parse_dockerfiles(cmds: list[str], dockerfiles: list[str]) -> Iterator[dict[str, list[str]]]:
+    """Yield the output of each command, for each Dockerfile in turn."""
     # import here to allow the rest of the file to be tested without a dependency on dockerfile
     from dockerfile import Command, parse_file, parse_string
 
@@ -188,30 +190,48 @@ def main(cmd: str, args: list[str]) -> None:
             """Return all files referenced from the build context using COPY instruction."""
             return tuple(chain(*(cmd.value[:-1] for cmd in self.get_all("COPY"))))
 
-    for parsed in map(ParsedDockerfile.from_file, args):
+    def run(cmd: str, parsed: ParsedDockerfile) -> list[str]:
         if cmd == "putative-targets":
-            for addr in parsed.putative_target_addresses():
-                print(addr)
+            return list(parsed.putative_target_addresses())
         elif cmd == "version-tags":
-            for tag in parsed.baseimage_tags():
-                print(tag)
+            return list(parsed.baseimage_tags())
         elif cmd == "build-args":
-            for arg in parsed.build_args():
-                print(arg)
+            return list(parsed.build_args())
         elif cmd == "from-image-build-args":
-            for build_arg in parsed.from_image_build_args():
-                print(build_arg)
+            return list(parsed.from_image_build_args())
         elif cmd == "copy-sources":
-            for src in parsed.copy_source_references():
-                print(src)
+            return list(parsed.copy_source_references())
+        return []
+
+    for parsed in map(ParsedDockerfile.from_file, dockerfiles):
+        yield {cmd: run(cmd, parsed) for cmd in cmds}
+
+
+def main(cmd: str, args: list[str]) -> None:
+    for output in parse_dockerfiles([cmd], args):
+        for line in output[cmd]:
+            print(line)
+
+
+def main_json(cmds: list[str], args: list[str]) -> None:
+    """Parse each Dockerfile once, and print the output of every command for every Dockerfile.
+
+    The output is a JSON object keyed by Dockerfile, with an object of command outputs as values.
+    """
+    json.dump(dict(zip(args, parse_dockerfiles(cmds, args))), sys.stdout)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
+    if len(sys.argv) > 3 and sys.argv[1] == "--json":
+        main_json([cmd.strip() for cmd in sys.argv[2].split(",")], sys.argv[3:])
+    elif len(sys.argv) > 2:
         for idx, cmd in enumerate(sys.argv[1].split(",")):
             if idx:
                 print("---")
             main(cmd.strip(), sys.argv[2:])
     else:
-        print(f"Not enough arguments.\nUsage: {sys.argv[0]} [COMMAND,COMMAND,...] [DOCKERFILE ...]")
+        print(
+            f"Not enough arguments.\nUsage: {sys.argv[0]} [--json] [COMMAND,COMMAND,...] "
+            "[DOCKERFILE ...]"
+        )
         sys.exit(1)
@@ -28,7 +28,13 @@ from pants.backend.go.util_rules.first_party_pkg import (
 from pants.backend.go.util_rules.import_analysis import ImportConfig, ImportConfigRequest
 from pants.backend.go.util_rules.link import LinkedGoBinary, LinkGoBinaryRequest
 from pants.backend.go.util_rules.tests_analysis import GeneratedTestMain, GenerateTestMainRequest
-from pants.core.goals.test import TestDebugRequest, TestFieldSet, TestResult, TestSubsystem
+from pants.core.goals.test import (
+    TestDebugRequest,
+    TestExtraEnv,
+    TestFieldSet,
+    TestResult,
+    TestSubsystem,
+)
 from pants.core.target_types import FileSourceField
 from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.engine.fs import EMPTY_FILE_DIGEST, AddPrefix, Digest, MergeDigests
@@ -85,6 +91,27 @@ class GoTestFieldSet(TestFieldSet):
         return tgt.get(SkipGoTestsField).value
 
 
+@dataclass(frozen=True)
+class GoTestBinaryRequest:
+    """Build and link the test binary for the synthetic `main` package of a package's tests.
+
+    The request only embeds the DAG of `BuildGoPackageRequest`s, so that building the binary is
+    keyed by the inputs of the binary rather than by the target under test.
+    """
+
+    main_pkg: BuildGoPackageRequest
+
+
+@dataclass(frozen=True)
+class FallibleGoTestBinary:
+    """The digest of the linked `./test_runner` binary, or the compilation error."""
+
+    digest: Digest | None
+    exit_code: int = 0
+    stdout: str | None = None
+    stderr: str | None = None
+
+
 def transform_test_args(args: Sequence[str], timeout_field_value: int | None) -> tuple[str, ...]:
     result = []
     i = 0
@@ -142,7 +169,10 @@ def transform_test_args(args: Sequence[str], timeout_field_value: int | None) ->
 
 @rule(desc="Test with Go", level=LogLevel.DEBUG)
 async def run_go_tests(
-    field_set: GoTestFieldSet, test_subsystem: TestSubsystem, go_test_subsystem: GoTestSubsystem
+    field_set: GoTestFieldSet,
+    test_subsystem: TestSubsystem,
+    go_test_subsystem: GoTestSubsystem,
+    test_extra_env: TestExtraEnv,
 ) -> TestResult:
     maybe_pkg_analysis, maybe_pkg_digest, dependencies = await MultiGet(
         Get(FallibleFirstPartyPkgAnalysis, FirstPartyPkgAnalysisRequest(field_set.address)),
@@ -240,42 +270,22 @@ async def run_go_tests(
         main_direct_deps.append(xtest_pkg_build_request)
 
     # Generate the synthetic main package which imports the test and/or xtest packages.
-    maybe_built_main_pkg = await Get(
-        FallibleBuiltGoPackage,
-        BuildGoPackageRequest(
-            import_path="main",
-            digest=testmain.digest,
-            dir_path="",
-            go_file_names=(GeneratedTestMain.TEST_MAIN_FILE,),
-            s_file_names=(),
-            direct_dependencies=tuple(main_direct_deps),
-            minimum_go_version=pkg_analysis.minimum_go_version,
-        ),
-    )
-    if maybe_built_main_pkg.output is None:
-        assert maybe_built_main_pkg.stderr is not None
-        return compilation_failure(
-            maybe_built_main_pkg.exit_code, maybe_built_main_pkg.stdout, maybe_built_main_pkg.stderr
-        )
-    built_main_pkg = maybe_built_main_pkg.output
-
-    main_pkg_a_file_path = built_main_pkg.import_paths_to_pkg_a_files["main"]
-    import_config = await Get(
-        ImportConfig, ImportConfigRequest(built_main_pkg.import_paths_to_pkg_a_files)
-    )
-    linker_input_digest = await Get(
-        Digest, MergeDigests([built_main_pkg.digest, import_config.digest])
-    )
     binary = await Get(
-        LinkedGoBinary,
-        LinkGoBinaryRequest(
-            input_digest=linker_input_digest,
-            archives=(main_pkg_a_file_path,),
-            import_config_path=import_config.CONFIG_PATH,
-            output_filename="./test_runner",  # TODO: Name test binary the way that `go` does?
-            description=f"Link Go test binary for {field_set.address}",
+        FallibleGoTestBinary,
+        GoTestBinaryRequest(
+            BuildGoPackageRequest(
+                import_path="main",
+                digest=testmain.digest,
+                dir_path="",
+                go_file_names=(GeneratedTestMain.TEST_MAIN_FILE,),
+                s_file_names=(),
+                direct_dependencies=tuple(main_direct_deps),
+                minimum_go_version=pkg_analysis.minimum_go_version,
+            ),
         ),
     )
+    if binary.digest is None:
+        return compilation_failure(binary.exit_code, binary.stdout, binary.stderr)
 
     # To emulate Go's test runner, we set the working directory to the path of the `go_package`.
     # This allows tests to open dependencies on `file` targets regardless of where they are
@@ -300,6 +310,8 @@ async def run_go_tests(
         ProcessCacheScope.PER_SESSION if test_subsystem.force else ProcessCacheScope.SUCCESSFUL
     )
 
+    # NB: Like `go test`'s own test cache, the result is cached by the binary, the inputs, the
+    # arguments and the environment of the test run.
     result = await Get(
         FallibleProcessResult,
         Process(
@@ -307,6 +319,7 @@ async def run_go_tests(
                 "./test_runner",
                 *transform_test_args(go_test_subsystem.args, field_set.timeout.value),
             ],
+            env=test_extra_env.env,
             input_digest=test_input_digest,
             description=f"Run Go tests: {field_set.address}",
             cache_scope=cache_scope,
@@ -317,6 +330,43 @@ async def run_go_tests(
     return TestResult.from_fallible_process_result(result, field_set.address, test_subsystem.output)
 
 
+@rule
+async def build_go_test_binary(request: GoTestBinaryRequest) -> FallibleGoTestBinary:
+    maybe_built_main_pkg = await Get(
+        FallibleBuiltGoPackage, BuildGoPackageRequest, request.main_pkg
+    )
+    if maybe_built_main_pkg.output is None:
+        assert maybe_built_main_pkg.stderr is not None
+        return FallibleGoTestBinary(
+            None,
+            maybe_built_main_pkg.exit_code,
+            stdout=maybe_built_main_pkg.stdout,
+            stderr=maybe_built_main_pkg.stderr,
+        )
+    built_main_pkg = maybe_built_main_pkg.output
+
+    main_pkg_a_file_path = built_main_pkg.import_paths_to_pkg_a_files["main"]
+    # The synthetic main package always depends on the package under test first.
+    tested_import_path = request.main_pkg.direct_dependencies[0].import_path
+    import_config = await Get(
+        ImportConfig, ImportConfigRequest(built_main_pkg.import_paths_to_pkg_a_files)
+    )
+    linker_input_digest = await Get(
+        Digest, MergeDigests([built_main_pkg.digest, import_config.digest])
+    )
+    binary = await Get(
+        LinkedGoBinary,
+        LinkGoBinaryRequest(
+            input_digest=linker_input_digest,
+            archives=(main_pkg_a_file_path,),
+            import_config_path=import_config.CONFIG_PATH,
+            output_filename="./test_runner",  # TODO: Name test binary the way that `go` does?
+            description=f"Link Go test binary for {tested_import_path}",
+        ),
+    )
+    return FallibleGoTestBinary(binary.digest)
+
+
 @rule
 async def generate_go_tests_debug_request(field_set: GoTestFieldSet) -> TestDebugRequest:
     raise NotImplementedError("This is a stub.")
@@ -655,3 +655,36 @@ def test_file_dependencies(rule_runner: RuleRunner) -> None:
     tgt = rule_runner.get_target(Address("foo"))
     result = rule_runner.request(TestResult, [GoTestFieldSet.create(tgt)])
     assert result.exit_code == 0
+
+
+def test_extra_env_vars(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "foo/BUILD": "go_mod(name='mod')\ngo_package()",
+            "foo/go.mod": "module foo",
+            "foo/env_test.go": textwrap.dedent(
+                """
+                package foo
+                import (
+                  "os"
+                  "testing"
+                )
+                func TestEnv(t *testing.T) {
+                  if os.Getenv("GO_TEST_VAR") != "value" {
+                    t.Fail()
+                  }
+                }
+                """
+            ),
+        }
+    )
+    tgt = rule_runner.get_target(Address("foo"))
+    result = rule_runner.request(TestResult, [GoTestFieldSet.create(tgt)])
+    assert result.exit_code == 1
+
+    rule_runner.set_options(
+        ["--go-test-args=-v", "--test-extra-env-vars=GO_TEST_VAR=value"], env_inherit={"PATH"}
+    )
+    result = rule_runner.request(TestResult, [GoTestFieldSet.create(tgt)])
+    assert result.exit_code == 0
+    assert "PASS: TestEnv" in result.stdout
@@ -16,7 +16,7 @@ from pants.core.util_rules.system_binaries import (
 from pants.engine.environment import Environment, EnvironmentRequest
 from pants.engine.process import Process, ProcessCacheScope, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.option.option_types import StrListOption, StrOption
+from pants.option.option_types import BoolOption, IntOption, StrListOption, StrOption
 from pants.option.subsystem import Subsystem
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import OrderedSet
@@ -60,6 +60,32 @@ class GolangSubsystem(Subsystem):
         ),
         advanced=True,
     )
+    package_analysis_batch_size = IntOption(
+        "--package-analysis-batch-size",
+        default=1,
+        help=(
+            "The maximum number of first-party `go_package` targets from the same `go_mod` to "
+            "analyze for imports and other metadata in a single analyzer process.\n\n"
+            "Values greater than 1 reduce the number of processes on cold runs, at the cost of "
+            "re-analyzing every package in a batch when any of them is edited."
+        ),
+        advanced=True,
+    )
+    compile_against_export_data = BoolOption(
+        "--compile-against-export-data",
+        default=False,
+        help=(
+            "Compile each package against only the export data of its dependencies, rather than "
+            "against their full archives.\n\n"
+            "The compiler writes the export data (the package's API, including inlinable "
+            "function bodies) separately from the object code used for linking. Because a "
+            "package's compilation is cached by its inputs, editing a function body in a "
+            "dependency without changing its export data will then reuse the cached compilation "
+            "of downstream packages, like `go build` does with its build IDs. Only linking "
+            "re-runs."
+        ),
+        advanced=True,
+    )
 
     def go_search_paths(self, env: Environment) -> tuple[str, ...]:
         def iter_path_entries():
@@ -6,7 +6,7 @@ import dataclasses
 import os.path
 from dataclasses import dataclass
 
-from pants.backend.go.subsystems.golang import GoRoot
+from pants.backend.go.subsystems.golang import GolangSubsystem, GoRoot
 from pants.backend.go.util_rules.assembly import (
     AssemblyPostCompilation,
     AssemblyPostCompilationRequest,
@@ -17,7 +17,16 @@ from pants.backend.go.util_rules.embedcfg import EmbedConfig
 from pants.backend.go.util_rules.import_analysis import ImportConfig, ImportConfigRequest
 from pants.backend.go.util_rules.sdk import GoSdkProcess
 from pants.engine.engine_aware import EngineAwareParameter, EngineAwareReturnType
-from pants.engine.fs import EMPTY_DIGEST, AddPrefix, CreateDigest, Digest, FileContent, MergeDigests
+from pants.engine.fs import (
+    EMPTY_DIGEST,
+    AddPrefix,
+    CreateDigest,
+    Digest,
+    DigestSubset,
+    FileContent,
+    MergeDigests,
+    PathGlobs,
+)
 from pants.engine.process import FallibleProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.util.frozendict import FrozenDict
@@ -179,10 +188,16 @@ class BuiltGoPackage:
     """A package and its dependencies compiled as `__pkg__.a` files.
 
     The packages are arranged into `__pkgs__/{path_safe(import_path)}/__pkg__.a`.
+
+    If `[golang].compile_against_export_data` is set, the `__pkg__.a` files only hold the object
+    code for linking, and `export_digest` holds the export data of the packages for compiling
+    against them, arranged into `__pkgs__/{path_safe(import_path)}/__pkg__.x`.
     """
 
     digest: Digest
     import_paths_to_pkg_a_files: FrozenDict[str, str]
+    export_digest: Digest = EMPTY_DIGEST
+    import_paths_to_export_files: FrozenDict[str, str] = FrozenDict()
 
 
 @dataclass(frozen=True)
@@ -200,15 +215,19 @@ class RenderedEmbedConfig:
 # (triggered by `FallibleBuiltGoPackage` subclassing `EngineAwareReturnType`).
 @rule(desc="Compile with Go", level=LogLevel.DEBUG)
 async def build_go_package(
-    request: BuildGoPackageRequest, go_root: GoRoot
+    request: BuildGoPackageRequest, go_root: GoRoot, golang_subsystem: GolangSubsystem
 ) -> FallibleBuiltGoPackage:
     maybe_built_deps = await MultiGet(
         Get(FallibleBuiltGoPackage, BuildGoPackageRequest, build_request)
         for build_request in request.direct_dependencies
     )
 
+    export_data_only = golang_subsystem.compile_against_export_data
+
     import_paths_to_pkg_a_files: dict[str, str] = {}
+    import_paths_to_export_files: dict[str, str] = {}
     dep_digests = []
+    dep_export_digests = []
     for maybe_dep in maybe_built_deps:
         if maybe_dep.output is None:
             return dataclasses.replace(
@@ -216,11 +235,24 @@ async def build_go_package(
             )
         dep = maybe_dep.output
         import_paths_to_pkg_a_files.update(dep.import_paths_to_pkg_a_files)
+        import_paths_to_export_files.update(dep.import_paths_to_export_files)
         dep_digests.append(dep.digest)
+        dep_export_digests.append(dep.export_digest)
 
+    # NB: When compiling against export data, the compilation does not depend on the object code
+    # of the dependencies at all, so it is a cache hit as long as their export data is unchanged.
     merged_deps_digest, import_config, embedcfg = await MultiGet(
-        Get(Digest, MergeDigests(dep_digests)),
-        Get(ImportConfig, ImportConfigRequest(FrozenDict(import_paths_to_pkg_a_files))),
+        Get(Digest, MergeDigests(dep_export_digests if export_data_only else dep_digests)),
+        Get(
+            ImportConfig,
+            ImportConfigRequest(
+                FrozenDict(
+                    import_paths_to_export_files
+                    if export_data_only
+                    else import_paths_to_pkg_a_files
+                )
+            ),
+        ),
         Get(RenderedEmbedConfig, RenderEmbedConfigRequest(request.embed_config)),
     )
 
@@ -251,8 +283,11 @@ async def build_go_package(
     compile_args = [
         "tool",
         "compile",
-        "-o",
-        "__pkg__.a",
+        *(
+            ("-o", "__pkg__.x", "-linkobj", "__pkg__.a")
+            if export_data_only
+            else ("-o", "__pkg__.a")
+        ),
         "-pack",
         "-p",
         request.import_path,
@@ -288,7 +323,7 @@ async def build_go_package(
             input_digest=input_digest,
             command=tuple(compile_args),
             description=f"Compile Go package: {request.import_path}",
-            output_files=("__pkg__.a",),
+            output_files=("__pkg__.a", "__pkg__.x") if export_data_only else ("__pkg__.a",),
         ),
     )
     if compile_result.exit_code != 0:
@@ -301,6 +336,12 @@ async def build_go_package(
         )
 
     compilation_digest = compile_result.output_digest
+    export_data_digest = EMPTY_DIGEST
+    if export_data_only:
+        compilation_digest, export_data_digest = await MultiGet(
+            Get(Digest, DigestSubset(compilation_digest, PathGlobs(["__pkg__.a"]))),
+            Get(Digest, DigestSubset(compilation_digest, PathGlobs(["__pkg__.x"]))),
+        )
     if assembly_digests:
         assembly_result = await Get(
             AssemblyPostCompilation,
@@ -327,7 +368,20 @@ async def build_go_package(
     output_digest = await Get(Digest, AddPrefix(compilation_digest, path_prefix))
     merged_result_digest = await Get(Digest, MergeDigests([*dep_digests, output_digest]))
 
-    output = BuiltGoPackage(merged_result_digest, FrozenDict(import_paths_to_pkg_a_files))
+    merged_export_digest = EMPTY_DIGEST
+    if export_data_only:
+        import_paths_to_export_files[request.import_path] = os.path.join(path_prefix, "__pkg__.x")
+        export_output_digest = await Get(Digest, AddPrefix(export_data_digest, path_prefix))
+        merged_export_digest = await Get(
+            Digest, MergeDigests([*dep_export_digests, export_output_digest])
+        )
+
+    output = BuiltGoPackage(
+        merged_result_digest,
+        FrozenDict(import_paths_to_pkg_a_files),
+        export_digest=merged_export_digest,
+        import_paths_to_export_files=FrozenDict(import_paths_to_export_files),
+    )
     return FallibleBuiltGoPackage(output, request.import_path)
 
 
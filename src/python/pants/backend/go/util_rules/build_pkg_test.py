@@ -25,7 +25,7 @@ from pants.backend.go.util_rules.build_pkg import (
     BuiltGoPackage,
     FallibleBuiltGoPackage,
 )
-from pants.engine.fs import Snapshot
+from pants.engine.fs import DigestSubset, PathGlobs, Snapshot
 from pants.engine.rules import QueryRule
 from pants.testutil.rule_runner import RuleRunner
 from pants.util.strutil import path_safe
@@ -46,6 +46,7 @@ def rule_runner() -> RuleRunner:
             *target_type_rules.rules(),
             QueryRule(BuiltGoPackage, [BuildGoPackageRequest]),
             QueryRule(FallibleBuiltGoPackage, [BuildGoPackageRequest]),
+            QueryRule(Snapshot, [DigestSubset]),
         ],
         target_types=[GoModTarget],
     )
@@ -206,3 +207,85 @@ def test_build_invalid_pkg(rule_runner: RuleRunner) -> None:
         invalid_dep_result.stdout
         == "./dep/f.go:1:1: syntax error: package statement must be first\n"
     )
+
+
+def test_compile_against_export_data(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--golang-compile-against-export-data"], env_inherit={"PATH"})
+
+    def dep_request(body: str) -> BuildGoPackageRequest:
+        return BuildGoPackageRequest(
+            import_path="example.com/foo/dep",
+            dir_path="dep",
+            go_file_names=("f.go",),
+            digest=rule_runner.make_snapshot(
+                {
+                    "dep/f.go": dedent(
+                        f"""\
+                        package dep
+
+                        //go:noinline
+                        func Quote(s string) string {{
+                            return {body}
+                        }}
+                        """
+                    )
+                }
+            ).digest,
+            s_file_names=(),
+            direct_dependencies=(),
+            minimum_go_version=None,
+        )
+
+    def main_request(dep: BuildGoPackageRequest) -> BuildGoPackageRequest:
+        return BuildGoPackageRequest(
+            import_path="example.com/foo",
+            dir_path="",
+            go_file_names=("f.go",),
+            digest=rule_runner.make_snapshot(
+                {
+                    "f.go": dedent(
+                        """\
+                        package foo
+
+                        import "example.com/foo/dep"
+
+                        func Quote() string {
+                            return dep.Quote("Hello world!")
+                        }
+                        """
+                    )
+                }
+            ).digest,
+            s_file_names=(),
+            direct_dependencies=(dep,),
+            minimum_go_version=None,
+        )
+
+    main_before = rule_runner.request(BuiltGoPackage, [main_request(dep_request('">> " + s'))])
+    main_after = rule_runner.request(BuiltGoPackage, [main_request(dep_request('"<< " + s'))])
+    assert_built(
+        rule_runner,
+        main_request(dep_request("s")),
+        expected_import_paths=["example.com/foo", "example.com/foo/dep"],
+    )
+
+    def files(built: BuiltGoPackage, import_path: str) -> tuple[Snapshot, Snapshot]:
+        prefix = os.path.join("__pkgs__", path_safe(import_path))
+        return (
+            rule_runner.request(Snapshot, [DigestSubset(built.digest, PathGlobs([f"{prefix}/*"]))]),
+            rule_runner.request(
+                Snapshot, [DigestSubset(built.export_digest, PathGlobs([f"{prefix}/*"]))]
+            ),
+        )
+
+    dep_before, dep_export_before = files(main_before, "example.com/foo/dep")
+    dep_after, dep_export_after = files(main_after, "example.com/foo/dep")
+    assert dep_export_before.files == ("__pkgs__/example.com_foo_dep/__pkg__.x",)
+    # The body of a function which can't be inlined is not part of the export data, so the
+    # downstream package is compiled against identical inputs.
+    assert dep_before.digest != dep_after.digest
+    assert dep_export_before.digest == dep_export_after.digest
+
+    main_before_files, _ = files(main_before, "example.com/foo")
+    main_after_files, _ = files(main_after, "example.com/foo")
+    assert main_before_files.digest == main_after_files.digest
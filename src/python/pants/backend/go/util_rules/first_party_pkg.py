@@ -6,19 +6,26 @@ from __future__ import annotations
 import json
 import logging
 from dataclasses import dataclass
+from typing import Any
+
+import ijson
 
 from pants.backend.go.go_sources import load_go_binary
 from pants.backend.go.go_sources.load_go_binary import LoadedGoBinary, LoadedGoBinaryRequest
+from pants.backend.go.subsystems.golang import GolangSubsystem
 from pants.backend.go.target_types import GoPackageSourcesField
 from pants.backend.go.util_rules import pkg_analyzer
 from pants.backend.go.util_rules.embedcfg import EmbedConfig
 from pants.backend.go.util_rules.go_mod import (
     GoModInfo,
     GoModInfoRequest,
+    OwnedGoPackageDirectories,
+    OwnedGoPackageDirectoriesRequest,
     OwningGoMod,
     OwningGoModRequest,
 )
 from pants.backend.go.util_rules.pkg_analyzer import PackageAnalyzerSetup
+from pants.base.specs import AddressSpecs, MaybeEmptySiblingAddresses
 from pants.build_graph.address import Address
 from pants.core.target_types import ResourceSourceField
 from pants.core.util_rules import source_files
@@ -36,8 +43,11 @@ from pants.engine.target import (
     Targets,
     WrappedTarget,
 )
+from pants.util.collections import partition_containing
 from pants.util.dirutil import fast_relpath
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +120,27 @@ class FirstPartyPkgAnalysisRequest(EngineAwareParameter):
         return self.address.spec
 
 
+@dataclass(frozen=True)
+class FirstPartyPkgAnalysisBatchRequest:
+    """Analyze several first-party packages with a single analyzer process."""
+
+    addresses: tuple[Address, ...]
+
+
+@dataclass(frozen=True)
+class FirstPartyPkgAnalysisBatch:
+    """The analysis of each package in a batch.
+
+    Packages which the batch could not handle, e.g. because the analyzer failed, are missing: they
+    should be analyzed on their own, in order to report errors against the relevant package.
+    """
+
+    analyses: FrozenDict[Address, FallibleFirstPartyPkgAnalysis]
+
+    def get(self, address: Address) -> FallibleFirstPartyPkgAnalysis | None:
+        return self.analyses.get(address)
+
+
 @dataclass(frozen=True)
 class FirstPartyPkgDigest:
     """The source files needed to build the package."""
@@ -156,11 +187,148 @@ async def compute_first_party_package_import_path(
     return FirstPartyPkgImportPath(import_path, dir_path_rel_to_gomod)
 
 
+def _first_party_pkg_analysis(
+    address: Address, import_path: str, go_mod_info: GoModInfo, metadata: dict[str, Any]
+) -> FallibleFirstPartyPkgAnalysis:
+    if "Error" in metadata or "InvalidGoFiles" in metadata:
+        error = metadata.get("Error", "")
+        if error:
+            error += "\n"
+        if "InvalidGoFiles" in metadata:
+            error += "\n".join(
+                f"{filename}: {error}"
+                for filename, error in metadata.get("InvalidGoFiles", {}).items()
+            )
+            error += "\n"
+        return FallibleFirstPartyPkgAnalysis(
+            analysis=None, import_path=import_path, exit_code=1, stderr=error
+        )
+
+    if "CgoFiles" in metadata:
+        raise NotImplementedError(
+            f"The first-party package {address} includes `CgoFiles`, which Pants does "
+            "not yet support. Please open a feature request at "
+            "https://github.com/pantsbuild/pants/issues/new/choose so that we know to "
+            "prioritize adding support."
+        )
+
+    analysis = FirstPartyPkgAnalysis(
+        dir_path=address.spec_path,
+        import_path=import_path,
+        imports=tuple(metadata.get("Imports", [])),
+        test_imports=tuple(metadata.get("TestImports", [])),
+        xtest_imports=tuple(metadata.get("XTestImports", [])),
+        go_files=tuple(metadata.get("GoFiles", [])),
+        test_files=tuple(metadata.get("TestGoFiles", [])),
+        xtest_files=tuple(metadata.get("XTestGoFiles", [])),
+        s_files=tuple(metadata.get("SFiles", [])),
+        minimum_go_version=go_mod_info.minimum_go_version,
+        embed_patterns=tuple(metadata.get("EmbedPatterns", [])),
+        test_embed_patterns=tuple(metadata.get("TestEmbedPatterns", [])),
+        xtest_embed_patterns=tuple(metadata.get("XTestEmbedPatterns", [])),
+    )
+    return FallibleFirstPartyPkgAnalysis(analysis, import_path)
+
+
+@rule
+async def analyze_first_party_packages_batch(
+    request: FirstPartyPkgAnalysisBatchRequest, analyzer: PackageAnalyzerSetup
+) -> FirstPartyPkgAnalysisBatch:
+    wrapped_targets = await MultiGet(
+        Get(WrappedTarget, Address, address) for address in request.addresses
+    )
+    import_path_infos = await MultiGet(
+        Get(FirstPartyPkgImportPath, FirstPartyPkgImportPathRequest(address))
+        for address in request.addresses
+    )
+    owning_go_mods = await MultiGet(
+        Get(OwningGoMod, OwningGoModRequest(address)) for address in request.addresses
+    )
+    go_mod_infos = await MultiGet(
+        Get(GoModInfo, GoModInfoRequest(owning_go_mod.address)) for owning_go_mod in owning_go_mods
+    )
+    all_pkg_sources = await MultiGet(
+        Get(HydratedSources, HydrateSourcesRequest(wrapped.target[GoPackageSourcesField]))
+        for wrapped in wrapped_targets
+    )
+
+    input_digest = await Get(
+        Digest,
+        MergeDigests([*(sources.snapshot.digest for sources in all_pkg_sources), analyzer.digest]),
+    )
+    result = await Get(
+        FallibleProcessResult,
+        Process(
+            (analyzer.path, *(address.spec_path or "." for address in request.addresses)),
+            input_digest=input_digest,
+            description=(
+                "Determine metadata for "
+                f"{pluralize(len(request.addresses), 'first-party Go package')}"
+            ),
+            level=LogLevel.DEBUG,
+        ),
+    )
+    if result.exit_code != 0:
+        return FirstPartyPkgAnalysisBatch(FrozenDict())
+
+    analyses = {}
+    # The analyzer writes one JSON object per directory, in order.
+    for address, import_path_info, go_mod_info, metadata in zip(
+        request.addresses,
+        import_path_infos,
+        go_mod_infos,
+        ijson.items(result.stdout, "", multiple_values=True),
+    ):
+        if "CgoFiles" in metadata:
+            # Leave it to the single package analysis to raise the error.
+            continue
+        analyses[address] = _first_party_pkg_analysis(
+            address, import_path_info.import_path, go_mod_info, metadata
+        )
+    return FirstPartyPkgAnalysisBatch(FrozenDict(analyses))
+
+
 @rule
 async def analyze_first_party_package(
     request: FirstPartyPkgAnalysisRequest,
     analyzer: PackageAnalyzerSetup,
+    golang_subsystem: GolangSubsystem,
 ) -> FallibleFirstPartyPkgAnalysis:
+    batch_size = golang_subsystem.package_analysis_batch_size
+    if batch_size > 1:
+        # Every package in a batch of the package directories of the owning `go_mod` computes the
+        # same batch, so the engine runs the analyzer once for all of them.
+        owning_go_mod = await Get(OwningGoMod, OwningGoModRequest(request.address))
+        package_dirs = await Get(
+            OwnedGoPackageDirectories, OwnedGoPackageDirectoriesRequest(owning_go_mod.address)
+        )
+        batch_dirs = partition_containing(
+            package_dirs.dirs,
+            request.address.spec_path,
+            key=lambda dir_path: dir_path,
+            size_max=batch_size,
+        )
+        if batch_dirs:
+            candidate_targets = await Get(
+                Targets,
+                AddressSpecs(MaybeEmptySiblingAddresses(dir_path) for dir_path in batch_dirs),
+            )
+            batch = await Get(
+                FirstPartyPkgAnalysisBatch,
+                FirstPartyPkgAnalysisBatchRequest(
+                    tuple(
+                        sorted(
+                            tgt.address
+                            for tgt in candidate_targets
+                            if tgt.has_field(GoPackageSourcesField)
+                        )
+                    )
+                ),
+            )
+            maybe_analysis = batch.get(request.address)
+            if maybe_analysis is not None:
+                return maybe_analysis
+
     wrapped_target, import_path_info, owning_go_mod = await MultiGet(
         Get(WrappedTarget, Address, request.address),
         Get(FirstPartyPkgImportPath, FirstPartyPkgImportPathRequest(request.address)),
@@ -192,44 +360,9 @@ async def analyze_first_party_package(
         )
 
     metadata = json.loads(result.stdout)
-    if "Error" in metadata or "InvalidGoFiles" in metadata:
-        error = metadata.get("Error", "")
-        if error:
-            error += "\n"
-        if "InvalidGoFiles" in metadata:
-            error += "\n".join(
-                f"{filename}: {error}"
-                for filename, error in metadata.get("InvalidGoFiles", {}).items()
-            )
-            error += "\n"
-        return FallibleFirstPartyPkgAnalysis(
-            analysis=None, import_path=import_path_info.import_path, exit_code=1, stderr=error
-        )
-
-    if "CgoFiles" in metadata:
-        raise NotImplementedError(
-            f"The first-party package {request.address} includes `CgoFiles`, which Pants does "
-            "not yet support. Please open a feature request at "
-            "https://github.com/pantsbuild/pants/issues/new/choose so that we know to "
-            "prioritize adding support."
-        )
-
-    analysis = FirstPartyPkgAnalysis(
-        dir_path=request.address.spec_path,
-        import_path=import_path_info.import_path,
-        imports=tuple(metadata.get("Imports", [])),
-        test_imports=tuple(metadata.get("TestImports", [])),
-        xtest_imports=tuple(metadata.get("XTestImports", [])),
-        go_files=tuple(metadata.get("GoFiles", [])),
-        test_files=tuple(metadata.get("TestGoFiles", [])),
-        xtest_files=tuple(metadata.get("XTestGoFiles", [])),
-        s_files=tuple(metadata.get("SFiles", [])),
-        minimum_go_version=go_mod_info.minimum_go_version,
-        embed_patterns=tuple(metadata.get("EmbedPatterns", [])),
-        test_embed_patterns=tuple(metadata.get("TestEmbedPatterns", [])),
-        xtest_embed_patterns=tuple(metadata.get("XTestEmbedPatterns", [])),
+    return _first_party_pkg_analysis(
+        request.address, import_path_info.import_path, go_mod_info, metadata
     )
-    return FallibleFirstPartyPkgAnalysis(analysis, import_path_info.import_path)
 
 
 @rule
@@ -23,6 +23,8 @@ from pants.backend.go.util_rules.embedcfg import EmbedConfig
 from pants.backend.go.util_rules.first_party_pkg import (
     FallibleFirstPartyPkgAnalysis,
     FallibleFirstPartyPkgDigest,
+    FirstPartyPkgAnalysisBatch,
+    FirstPartyPkgAnalysisBatchRequest,
     FirstPartyPkgAnalysisRequest,
     FirstPartyPkgDigestRequest,
     FirstPartyPkgImportPath,
@@ -48,6 +50,7 @@ def rule_runner() -> RuleRunner:
             *link.rules(),
             *assembly.rules(),
             QueryRule(FallibleFirstPartyPkgAnalysis, [FirstPartyPkgAnalysisRequest]),
+            QueryRule(FirstPartyPkgAnalysisBatch, [FirstPartyPkgAnalysisBatchRequest]),
             QueryRule(FallibleFirstPartyPkgDigest, [FirstPartyPkgDigestRequest]),
             QueryRule(FirstPartyPkgImportPath, [FirstPartyPkgImportPathRequest]),
         ],
@@ -231,6 +234,54 @@ def test_invalid_package(rule_runner) -> None:
     assert "bad.go:1:1: expected 'package', found invalid\n" in maybe_analysis.stderr
 
 
+def test_package_analysis_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--golang-package-analysis-batch-size=2"], env_inherit={"PATH"})
+    rule_runner.write_files(
+        {
+            "BUILD": "go_mod(name='mod')\n",
+            "go.mod": "module go.example.com/foo\ngo 1.17\n",
+            "a/BUILD": "go_package()",
+            "a/a.go": 'package a\nimport "fmt"\n',
+            "b/BUILD": "go_package()",
+            "b/b.go": "invalid!!!",
+            "c/BUILD": "go_package()",
+            "c/c.go": 'package c\nimport "go.example.com/foo/a"\n',
+            "c/c_test.go": 'package c_test\nimport "testing"\n',
+        }
+    )
+
+    batch = rule_runner.request(
+        FirstPartyPkgAnalysisBatch,
+        [FirstPartyPkgAnalysisBatchRequest((Address("a"), Address("b"), Address("c")))],
+    )
+    assert set(batch.analyses) == {Address("a"), Address("b"), Address("c")}
+
+    def analyze(addr: Address) -> FallibleFirstPartyPkgAnalysis:
+        maybe_analysis = rule_runner.request(
+            FallibleFirstPartyPkgAnalysis, [FirstPartyPkgAnalysisRequest(addr)]
+        )
+        assert batch.get(addr) == maybe_analysis
+        return maybe_analysis
+
+    analysis_a = analyze(Address("a")).analysis
+    assert analysis_a is not None
+    assert analysis_a.import_path == "go.example.com/foo/a"
+    assert analysis_a.imports == ("fmt",)
+
+    analysis_b = analyze(Address("b"))
+    assert analysis_b.analysis is None
+    assert analysis_b.exit_code == 1
+    assert (
+        analysis_b.stderr and "b/b.go:1:1: expected 'package', found invalid" in analysis_b.stderr
+    )
+
+    analysis_c = analyze(Address("c")).analysis
+    assert analysis_c is not None
+    assert analysis_c.imports == ("go.example.com/foo/a",)
+    assert analysis_c.xtest_imports == ("testing",)
+    assert analysis_c.xtest_files == ("c_test.go",)
+
+
 @pytest.mark.xfail(reason="cgo is ignored")
 def test_cgo_not_supported(rule_runner: RuleRunner) -> None:
     rule_runner.write_files(
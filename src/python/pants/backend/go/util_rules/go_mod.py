@@ -12,9 +12,9 @@ from pants.backend.go.util_rules.sdk import GoSdkProcess
 from pants.base.specs import AddressSpecs, AscendantAddresses
 from pants.build_graph.address import Address
 from pants.engine.engine_aware import EngineAwareParameter
-from pants.engine.fs import Digest
+from pants.engine.fs import Digest, PathGlobs, Paths
 from pants.engine.process import ProcessResult
-from pants.engine.rules import Get, collect_rules, rule
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import (
     HydratedSources,
     HydrateSourcesRequest,
@@ -63,6 +63,48 @@ async def find_nearest_go_mod(request: OwningGoModRequest) -> OwningGoMod:
     return OwningGoMod(nearest_go_mod_target.address)
 
 
+@dataclass(frozen=True)
+class OwnedGoPackageDirectoriesRequest(EngineAwareParameter):
+    go_mod_address: Address
+
+    def debug_hint(self) -> str:
+        return self.go_mod_address.spec
+
+
+@dataclass(frozen=True)
+class OwnedGoPackageDirectories:
+    """The directories with `.go` files which belong to a `go_mod`, rather than to a nested module.
+
+    This only globs for files, so unlike resolving the targets below the `go_mod`, it does not need
+    to parse any BUILD files.
+    """
+
+    dirs: tuple[str, ...]
+
+
+@rule
+async def find_owned_go_package_directories(
+    request: OwnedGoPackageDirectoriesRequest,
+) -> OwnedGoPackageDirectories:
+    go_mod_dir = request.go_mod_address.spec_path
+    go_file_paths, go_mod_paths = await MultiGet(
+        Get(Paths, PathGlobs([os.path.join(go_mod_dir, "**/*.go")])),
+        Get(Paths, PathGlobs([os.path.join(go_mod_dir, "**/go.mod")])),
+    )
+    nested_module_dirs = {os.path.dirname(path) for path in go_mod_paths.files} - {go_mod_dir}
+
+    def in_nested_module(dir_path: str) -> bool:
+        return any(
+            dir_path == nested_dir or dir_path.startswith(f"{nested_dir}/")
+            for nested_dir in nested_module_dirs
+        )
+
+    package_dirs = {os.path.dirname(path) for path in go_file_paths.files}
+    return OwnedGoPackageDirectories(
+        tuple(sorted(dir_path for dir_path in package_dirs if not in_nested_module(dir_path)))
+    )
+
+
 @dataclass(frozen=True)
 class GoModInfo:
     # Import path of the Go module, based on the `module` in `go.mod`.
@@ -12,6 +12,8 @@ from pants.backend.go.util_rules import go_mod, sdk
 from pants.backend.go.util_rules.go_mod import (
     GoModInfo,
     GoModInfoRequest,
+    OwnedGoPackageDirectories,
+    OwnedGoPackageDirectoriesRequest,
     OwningGoMod,
     OwningGoModRequest,
 )
@@ -27,6 +29,7 @@ def rule_runner() -> RuleRunner:
             *sdk.rules(),
             *go_mod.rules(),
             QueryRule(OwningGoMod, [OwningGoModRequest]),
+            QueryRule(OwnedGoPackageDirectories, [OwnedGoPackageDirectoriesRequest]),
             QueryRule(GoModInfo, [GoModInfoRequest]),
         ],
         target_types=[GoModTarget, GoPackageTarget],
@@ -61,6 +64,34 @@ def test_owning_go_mod(rule_runner: RuleRunner) -> None:
     assert_owner(Address("dir/subdir/another"), Address("dir/subdir", target_name="mod"))
 
 
+def test_owned_go_package_directories(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "go.mod": "",
+            "f.go": "",
+            "BUILD": "go_mod(name='mod')\ngo_package(name='pkg')",
+            "dir/f.go": "",
+            "dir/BUILD": "go_package()",
+            "dir/no_go_files/BUILD": "",
+            "dir/subdir/go.mod": "",
+            "dir/subdir/BUILD": "go_mod(name='mod')\ngo_package()",
+            "dir/subdir/f.go": "",
+            "dir/subdir/another/f.go": "",
+            "dir/subdir/another/BUILD": "go_package()",
+            "dir/subdir_sibling/f.go": "",
+        }
+    )
+
+    def assert_dirs(mod: Address, expected: tuple[str, ...]) -> None:
+        owned = rule_runner.request(
+            OwnedGoPackageDirectories, [OwnedGoPackageDirectoriesRequest(mod)]
+        )
+        assert owned.dirs == expected
+
+    assert_dirs(Address("", target_name="mod"), ("", "dir", "dir/subdir_sibling"))
+    assert_dirs(Address("dir/subdir", target_name="mod"), ("dir/subdir", "dir/subdir/another"))
+
+
 def test_go_mod_info(rule_runner: RuleRunner) -> None:
     go_mod_content = dedent(
         """\
@@ -7,7 +7,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
 
 import ijson
 
@@ -18,11 +18,13 @@ from pants.core.goals.tailor import group_by_dir
 from pants.engine.engine_aware import EngineAwareParameter
 from pants.engine.fs import (
     EMPTY_DIGEST,
+    CreateDigest,
     Digest,
+    DigestContents,
     DigestSubset,
+    FileContent,
     GlobExpansionConjunction,
     GlobMatchErrorBehavior,
-    MergeDigests,
     PathGlobs,
     Snapshot,
 )
@@ -114,17 +116,23 @@ class ModuleDescriptor:
 @dataclass(frozen=True)
 class ModuleDescriptors:
     modules: FrozenOrderedSet[ModuleDescriptor]
-    go_mods_digest: Digest
 
 
 @dataclass(frozen=True)
 class AnalyzeThirdPartyModuleRequest:
-    go_mod_digest: Digest
-    go_mod_path: str
+    """Download and analyze a single third-party module.
+
+    The request only depends on the module itself and on its `go.sum` entries, rather than on the
+    `go.mod` which requires it, so the analysis of a `module@version` is shared by every `go_mod`
+    using it, and its processes are cached across runs by their content.
+    """
+
     import_path: str
     name: str
     version: str
     minimum_go_version: str | None
+    # The lines of the requiring `go.sum` for this module, used to verify the download.
+    go_sum_entries: tuple[str, ...]
 
 
 @dataclass(frozen=True)
@@ -175,7 +183,6 @@ async def analyze_module_dependencies(request: ModuleDescriptorsRequest) -> Modu
         GoSdkProcess(
             command=["list", "-mod=readonly", "-e", "-m", "-json", "all"],
             input_digest=request.digest,
-            output_directories=("gopath",),
             working_dir=request.path if request.path else None,
             # Allow downloads of the module metadata (i.e., go.mod files).
             allow_downloads=True,
@@ -184,7 +191,7 @@ async def analyze_module_dependencies(request: ModuleDescriptorsRequest) -> Modu
     )
 
     if len(mod_list_result.stdout) == 0:
-        return ModuleDescriptors(FrozenOrderedSet(), EMPTY_DIGEST)
+        return ModuleDescriptors(FrozenOrderedSet())
 
     descriptors: dict[tuple[str, str], ModuleDescriptor] = {}
 
@@ -213,7 +220,7 @@ async def analyze_module_dependencies(request: ModuleDescriptorsRequest) -> Modu
     # Gazelle does this, mainly to store the sum on the go_repository rule. We could store it (or its
     # absence) to be able to download sums automatically.
 
-    return ModuleDescriptors(FrozenOrderedSet(descriptors.values()), mod_list_result.output_digest)
+    return ModuleDescriptors(FrozenOrderedSet(descriptors.values()))
 
 
 def strip_sandbox_prefix(path: str, marker: str) -> str:
@@ -249,18 +256,68 @@ def _freeze_json_dict(d: dict[Any, Any]) -> FrozenDict[str, Any]:
     return FrozenDict(result)
 
 
+def go_sum_entries_by_module(go_sum: str) -> dict[tuple[str, str], tuple[str, ...]]:
+    """Group the lines of a `go.sum` by the `(module, version)` they are for.
+
+    Each module usually has two lines: the hash of its sources, and the hash of its `go.mod` (with
+    a `/go.mod` suffix on the version).
+    """
+    entries: dict[tuple[str, str], list[str]] = {}
+    for line in go_sum.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        name, version, _ = parts
+        if version.endswith("/go.mod"):
+            version = version[: -len("/go.mod")]
+        entries.setdefault((name, version), []).append(line)
+    return {key: tuple(lines) for key, lines in entries.items()}
+
+
+def analyze_third_party_module_requests(
+    modules: Iterable[ModuleDescriptor], go_sum: str
+) -> tuple[AnalyzeThirdPartyModuleRequest, ...]:
+    """The requests to analyze each of the given modules, which are required by the given `go.sum`.
+
+    Requests only hold the `go.sum` entries of their own module, so the requests of `go.mod`s
+    which share a `module@version` are equal, and the engine only analyzes it once.
+    """
+    go_sum_entries = go_sum_entries_by_module(go_sum)
+    return tuple(
+        AnalyzeThirdPartyModuleRequest(
+            import_path=mod.name,
+            name=mod.name,
+            version=mod.version,
+            minimum_go_version=mod.minimum_go_version,
+            go_sum_entries=go_sum_entries.get((mod.name, mod.version), ()),
+        )
+        for mod in modules
+    )
+
+
 @rule
 async def analyze_go_third_party_module(
     request: AnalyzeThirdPartyModuleRequest,
     analyzer: PackageAnalyzerSetup,
 ) -> AnalyzedThirdPartyModule:
-    # Download the module.
+    # Download the module, from within a stub module whose `go.sum` only has the entries for this
+    # module. `go` still verifies the download against those entries.
+    download_input_digest = await Get(
+        Digest,
+        CreateDigest(
+            [
+                FileContent("go.mod", b"module __pants_third_party_module_download\n"),
+                FileContent(
+                    "go.sum", "".join(f"{line}\n" for line in request.go_sum_entries).encode()
+                ),
+            ]
+        ),
+    )
     download_result = await Get(
         ProcessResult,
         GoSdkProcess(
             ("mod", "download", "-json", f"{request.name}@{request.version}"),
-            input_digest=request.go_mod_digest,  # for go.sum
-            working_dir=os.path.dirname(request.go_mod_path) if request.go_mod_path else None,
+            input_digest=download_input_digest,
             # Allow downloads of the module sources.
             allow_downloads=True,
             output_directories=("gopath",),
@@ -450,23 +507,18 @@ async def download_and_analyze_third_party_packages(
         ),
     )
 
-    go_mod_digest = await Get(
-        Digest, MergeDigests([request.go_mod_digest, module_analysis.go_mods_digest])
+    go_sum_contents = await Get(
+        DigestContents,
+        DigestSubset(
+            request.go_mod_digest,
+            PathGlobs([os.path.join(os.path.dirname(request.go_mod_path), "go.sum")]),
+        ),
     )
+    go_sum = go_sum_contents[0].content.decode("utf-8") if go_sum_contents else ""
 
     analyzed_modules = await MultiGet(
-        Get(
-            AnalyzedThirdPartyModule,
-            AnalyzeThirdPartyModuleRequest(
-                go_mod_digest=go_mod_digest,
-                go_mod_path=request.go_mod_path,
-                import_path=mod.name,
-                name=mod.name,
-                version=mod.version,
-                minimum_go_version=mod.minimum_go_version,
-            ),
-        )
-        for mod in module_analysis.modules
+        Get(AnalyzedThirdPartyModule, AnalyzeThirdPartyModuleRequest, module_request)
+        for module_request in analyze_third_party_module_requests(module_analysis.modules, go_sum)
     )
 
     import_path_to_info = {
@@ -24,8 +24,13 @@ from pants.backend.go.util_rules import (
 from pants.backend.go.util_rules.third_party_pkg import (
     AllThirdPartyPackages,
     AllThirdPartyPackagesRequest,
+    AnalyzeThirdPartyModuleRequest,
+    ModuleDescriptors,
+    ModuleDescriptorsRequest,
     ThirdPartyPkgAnalysis,
     ThirdPartyPkgAnalysisRequest,
+    analyze_third_party_module_requests,
+    go_sum_entries_by_module,
 )
 from pants.engine.fs import Digest, Snapshot
 from pants.engine.process import ProcessExecutionFailure
@@ -49,6 +54,7 @@ def rule_runner() -> RuleRunner:
             *go_mod.rules(),
             QueryRule(AllThirdPartyPackages, [AllThirdPartyPackagesRequest]),
             QueryRule(ThirdPartyPkgAnalysis, [ThirdPartyPkgAnalysisRequest]),
+            QueryRule(ModuleDescriptors, [ModuleDescriptorsRequest]),
         ],
         target_types=[GoModTarget],
     )
@@ -243,6 +249,46 @@ def test_download_and_analyze_all_packages(rule_runner: RuleRunner) -> None:
     )
 
 
+def test_go_sum_entries_by_module() -> None:
+    entries = go_sum_entries_by_module(GO_SUM + "\nmalformed line\n")
+    assert entries[("rsc.io/quote", "v1.5.2")] == (
+        "rsc.io/quote v1.5.2 h1:w5fcysjrx7yqtD/aO+QwRjYZOKnaM9Uh2b40tElTs3Y=",
+        "rsc.io/quote v1.5.2/go.mod h1:LzX7hefJvL54yjefDEDHNONDjII0t9xZLPXsUe+TKr0=",
+    )
+    assert len(entries) == 4
+
+
+def test_modules_shared_across_go_mods(rule_runner: RuleRunner) -> None:
+    # A module required by two different `go.mod`s is analyzed once, with identical results.
+    other_go_mod = GO_MOD.replace("example.com/third-party-module", "example.com/other-module")
+    digest = rule_runner.make_snapshot(
+        {
+            "go.mod": GO_MOD,
+            "go.sum": GO_SUM,
+            "other/go.mod": other_go_mod,
+            "other/go.sum": GO_SUM,
+        }
+    ).digest
+    all_packages = rule_runner.request(
+        AllThirdPartyPackages, [AllThirdPartyPackagesRequest(digest, "go.mod")]
+    )
+    other_all_packages = rule_runner.request(
+        AllThirdPartyPackages, [AllThirdPartyPackagesRequest(digest, "other/go.mod")]
+    )
+    assert all_packages.import_paths_to_pkg_info == other_all_packages.import_paths_to_pkg_info
+
+    # The modules are analyzed with equal requests, which the engine memoizes as one.
+    def module_requests(go_mod_dir: str) -> tuple[AnalyzeThirdPartyModuleRequest, ...]:
+        descriptors = rule_runner.request(
+            ModuleDescriptors, [ModuleDescriptorsRequest(digest, go_mod_dir)]
+        )
+        return analyze_third_party_module_requests(descriptors.modules, GO_SUM)
+
+    requests = module_requests("")
+    assert requests
+    assert module_requests("other") == requests
+
+
 def test_invalid_go_sum(rule_runner: RuleRunner) -> None:
     digest = set_up_go_mod(
         rule_runner,
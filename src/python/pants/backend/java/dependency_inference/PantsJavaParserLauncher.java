@@ -114,10 +114,20 @@ public class PantsJavaParserLauncher {
     return new ArrayList<>();
   }
 
+  // Arguments are pairs of `analysisOutputPath sourceToAnalyze`, so that a single JVM can analyze
+  // a batch of sources.
   public static void main(String[] args) throws Exception {
-    String analysisOutputPath = args[0];
-    String sourceToAnalyze = args[1];
+    if (args.length % 2 != 0) {
+      throw new IllegalArgumentException(
+          "Expected pairs of `analysisOutputPath sourceToAnalyze` arguments.");
+    }
+    for (int i = 0; i < args.length; i += 2) {
+      analyze(args[i], args[i + 1]);
+    }
+  }
 
+  private static void analyze(String analysisOutputPath, String sourceToAnalyze)
+      throws Exception {
     CompilationUnit cu = StaticJavaParser.parse(new File(sourceToAnalyze));
 
     // Get the source's declare package.
@@ -14,13 +14,22 @@ from pants.backend.java.dependency_inference.java_parser_launcher import (
     java_parser_artifact_requirements,
 )
 from pants.backend.java.dependency_inference.types import JavaSourceDependencyAnalysis
-from pants.core.util_rules.source_files import SourceFiles
+from pants.backend.java.target_types import JavaSourceField
+from pants.base.specs import AddressSpecs, SiblingAddresses
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.engine.fs import AddPrefix, Digest, DigestContents
 from pants.engine.process import FallibleProcessResult, ProcessExecutionFailure
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import Targets
+from pants.jvm.dependency_inference import batched_source_analysis
+from pants.jvm.dependency_inference.batched_source_analysis import (
+    SourceAnalysisBatch,
+    SourceAnalysisBatchRequest,
+)
 from pants.jvm.jdk_rules import InternalJdk, JvmProcess
 from pants.jvm.resolve.coursier_fetch import ToolClasspath, ToolClasspathRequest
 from pants.option.global_options import ProcessCleanupOption
+from pants.util.collections import partition_containing
 from pants.util.logging import LogLevel
 
 logger = logging.getLogger(__name__)
@@ -125,8 +134,54 @@ async def analyze_java_source_dependencies(
     return FallibleJavaSourceDependencyAnalysisResult(process_result=process_result)
 
 
+@dataclass(frozen=True)
+class BatchedJavaSourceDependencyAnalysisRequest:
+    """Analyze a single Java source as part of a batch of its sibling sources.
+
+    The batch is formed by stably partitioning the Java sources living in the same directory into
+    batches of at most `batch_size` files. Every file in a batch resolves to the same
+    `SourceAnalysisBatchRequest`, so the engine only starts one JVM per batch.
+    """
+
+    source: JavaSourceField
+    batch_size: int
+
+
+@rule(level=LogLevel.DEBUG)
+async def analyze_java_source_dependencies_in_batch(
+    request: BatchedJavaSourceDependencyAnalysisRequest,
+    processor_classfiles: JavaParserCompiledClassfiles,
+) -> JavaSourceDependencyAnalysis:
+    address = request.source.address
+    if request.batch_size > 1:
+        sibling_targets = await Get(Targets, AddressSpecs([SiblingAddresses(address.spec_path)]))
+        batch_sources = partition_containing(
+            (tgt[JavaSourceField] for tgt in sibling_targets if tgt.has_field(JavaSourceField)),
+            address.spec,
+            key=lambda field: field.address.spec,
+            size_max=request.batch_size,
+        )
+        if batch_sources:
+            batch = await Get(
+                SourceAnalysisBatch,
+                SourceAnalysisBatchRequest(
+                    tuple(batch_sources),
+                    main="org.pantsbuild.javaparser.PantsJavaParserLauncher",
+                    artifact_requirements=java_parser_artifact_requirements(),
+                    analyzer_classfiles=processor_classfiles.digest,
+                    source_description="Java file",
+                ),
+            )
+            analysis = batch.get(address)
+            if analysis is not None:
+                return JavaSourceDependencyAnalysis.from_json_dict(json.loads(analysis))
+
+    return await Get(JavaSourceDependencyAnalysis, SourceFilesRequest([request.source]))
+
+
 def rules():
     return [
         *collect_rules(),
         *java_parser_launcher.rules(),
+        *batched_source_analysis.rules(),
     ]
@@ -8,6 +8,7 @@ from textwrap import dedent
 import pytest
 
 from pants.backend.java.dependency_inference.java_parser import (
+    BatchedJavaSourceDependencyAnalysisRequest,
     FallibleJavaSourceDependencyAnalysisResult,
 )
 from pants.backend.java.dependency_inference.java_parser import rules as java_parser_rules
@@ -42,6 +43,7 @@ def rule_runner() -> RuleRunner:
             *jdk_rules.rules(),
             QueryRule(FallibleJavaSourceDependencyAnalysisResult, (SourceFiles,)),
             QueryRule(JavaSourceDependencyAnalysis, (SourceFiles,)),
+            QueryRule(JavaSourceDependencyAnalysis, (BatchedJavaSourceDependencyAnalysisRequest,)),
             QueryRule(SourceFiles, (SourceFilesRequest,)),
         ],
         target_types=[JavaSourceTarget],
@@ -291,3 +293,38 @@ def test_java_parser_consumed_types(rule_runner: RuleRunner) -> None:
         "String",
         "provider",  # note: false positive on a variable identifier
     ]
+
+
+@maybe_skip_jdk_test
+def test_java_parser_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "BUILD": dedent(
+                """\
+                java_source(name='a', source='A.java')
+                java_source(name='b', source='B.java')
+                java_source(name='broken', source='Broken.java')
+                """
+            ),
+            "A.java": "package org.pantsbuild.a;\nimport org.pantsbuild.b.B;\npublic class A {}\n",
+            "B.java": "package org.pantsbuild.b;\npublic class B {}\n",
+            "Broken.java": "syntax error!\n",
+        }
+    )
+
+    def analyze(name: str, batch_size: int) -> JavaSourceDependencyAnalysis:
+        target = rule_runner.get_target(Address("", target_name=name))
+        return rule_runner.request(
+            JavaSourceDependencyAnalysis,
+            [BatchedJavaSourceDependencyAnalysisRequest(target[JavaSourceField], batch_size)],
+        )
+
+    # Batches of any size analyze the same as analyzing each file on its own.
+    assert analyze("a", batch_size=2) == analyze("a", batch_size=1)
+    assert analyze("b", batch_size=2).top_level_types == ("org.pantsbuild.b.B",)
+
+    # If a batch contains a broken file, its files fall back to being analyzed on their own.
+    assert analyze("b", batch_size=3) == analyze("b", batch_size=1)
+    with pytest.raises(ExecutionError) as exc_info:
+        analyze("broken", batch_size=3)
+    assert isinstance(exc_info.value.wrapped_exceptions[0], ProcessExecutionFailure)
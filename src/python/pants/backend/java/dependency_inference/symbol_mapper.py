@@ -5,9 +5,12 @@ from __future__ import annotations
 
 import logging
 
+from pants.backend.java.dependency_inference.java_parser import (
+    BatchedJavaSourceDependencyAnalysisRequest,
+)
 from pants.backend.java.dependency_inference.types import JavaSourceDependencyAnalysis
+from pants.backend.java.subsystems.java_infer import JavaInferSubsystem
 from pants.backend.java.target_types import JavaSourceField
-from pants.core.util_rules.source_files import SourceFilesRequest
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import AllTargets, Targets
 from pants.engine.unions import UnionRule
@@ -38,9 +41,15 @@ async def map_first_party_java_targets_to_symbols(
     _: FirstPartyJavaTargetsMappingRequest,
     java_targets: AllJavaTargets,
     jvm: JvmSubsystem,
+    java_infer_subsystem: JavaInferSubsystem,
 ) -> SymbolMap:
     source_analysis = await MultiGet(
-        Get(JavaSourceDependencyAnalysis, SourceFilesRequest([target[JavaSourceField]]))
+        Get(
+            JavaSourceDependencyAnalysis,
+            BatchedJavaSourceDependencyAnalysisRequest(
+                target[JavaSourceField], batch_size=java_infer_subsystem.parser_batch_size
+            ),
+        )
         for target in java_targets
     )
     address_and_analysis = zip(
@@ -2,7 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 from typing import Any
 
-from pants.option.option_types import BoolOption, DictOption
+from pants.option.option_types import BoolOption, DictOption, IntOption
 from pants.option.subsystem import Subsystem
 
 
@@ -25,6 +25,19 @@ class JavaInferSubsystem(Subsystem):
         default=True,
         help="Infer a target's third-party dependencies using Java import statements.",
     )
+    parser_batch_size = IntOption(
+        "--parser-batch-size",
+        default=1,
+        advanced=True,
+        help=(
+            "The maximum number of Java files from the same directory to analyze for dependency "
+            "inference in a single JVM process.\n\n"
+            "Values greater than 1 amortize JVM startup and warmup over many files, which speeds "
+            "up cold dependency inference. Editing a file re-analyzes the rest of its batch. If a "
+            "batch fails, its files are analyzed individually so that the error is attributed to "
+            "the right file."
+        ),
+    )
     # TODO: Move to `coursier` or a generic `jvm` subsystem.
     third_party_import_mapping = DictOption[Any](
         "--third-party-import-mapping",
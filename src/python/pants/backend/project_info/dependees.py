@@ -1,7 +1,9 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from collections import defaultdict
+from __future__ import annotations
+
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import Iterable, Set
 
@@ -10,7 +12,13 @@ from pants.engine.collection import DeduplicatedCollection
 from pants.engine.console import Console
 from pants.engine.goal import Goal, GoalSubsystem, LineOriented
 from pants.engine.rules import Get, MultiGet, collect_rules, goal_rule, rule
-from pants.engine.target import AllUnexpandedTargets, Dependencies, DependenciesRequest
+from pants.engine.target import (
+    AllTargetsShardDirectories,
+    AllTargetsShardRequest,
+    AllUnexpandedTargetsShard,
+    Dependencies,
+    DependenciesRequest,
+)
 from pants.option.option_types import BoolOption
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
@@ -23,17 +31,51 @@ class AddressToDependees:
     mapping: FrozenDict[Address, FrozenOrderedSet[Address]]
 
 
-@rule(desc="Map all targets to their dependees", level=LogLevel.DEBUG)
-async def map_addresses_to_dependees(all_targets: AllUnexpandedTargets) -> AddressToDependees:
+@dataclass(frozen=True)
+class AddressToDependeesShard:
+    """The reverse dependency edges contributed by the targets of one `AllTargetsShardRequest`.
+
+    Shards are memoized independently, so after a change only the shards for directories whose
+    targets changed need to recompute their dependencies.
+    """
+
+    mapping: FrozenDict[Address, tuple[Address, ...]]
+
+
+@rule(desc="Map targets in a directory to their dependees", level=LogLevel.DEBUG)
+async def map_shard_addresses_to_dependees(
+    request: AllTargetsShardRequest,
+) -> AddressToDependeesShard:
+    targets = await Get(AllUnexpandedTargetsShard, AllTargetsShardRequest, request)
     dependencies_per_target = await MultiGet(
         Get(Addresses, DependenciesRequest(tgt.get(Dependencies), include_special_cased_deps=True))
-        for tgt in all_targets
+        for tgt in targets
     )
 
-    address_to_dependees = defaultdict(set)
-    for tgt, dependencies in zip(all_targets, dependencies_per_target):
+    address_to_dependees = defaultdict(list)
+    for tgt, dependencies in zip(targets, dependencies_per_target):
         for dependency in dependencies:
-            address_to_dependees[dependency].add(tgt.address)
+            address_to_dependees[dependency].append(tgt.address)
+    return AddressToDependeesShard(
+        FrozenDict(
+            (addr, tuple(dependees)) for addr, dependees in sorted(address_to_dependees.items())
+        )
+    )
+
+
+@rule(desc="Map all targets to their dependees", level=LogLevel.DEBUG)
+async def map_addresses_to_dependees(
+    shard_directories: AllTargetsShardDirectories,
+) -> AddressToDependees:
+    shards = await MultiGet(
+        Get(AddressToDependeesShard, AllTargetsShardRequest(directory))
+        for directory in shard_directories
+    )
+
+    address_to_dependees = defaultdict(set)
+    for shard in shards:
+        for dependency, dependees in shard.mapping.items():
+            address_to_dependees[dependency].update(dependees)
     return AddressToDependees(
         FrozenDict(
             {addr: FrozenOrderedSet(dependees) for addr, dependees in address_to_dependees.items()}
@@ -64,22 +106,25 @@ class Dependees(DeduplicatedCollection[Address]):
 def find_dependees(
     request: DependeesRequest, address_to_dependees: AddressToDependees
 ) -> Dependees:
-    check = set(request.addresses)
-    known_dependents: Set[Address] = set()
-    while True:
-        dependents = set(known_dependents)
-        for target in check:
-            target_dependees = address_to_dependees.mapping.get(target, FrozenOrderedSet())
-            dependents.update(target_dependees)
-        check = dependents - known_dependents
-        if not check or not request.transitive:
-            result = (
-                dependents | set(request.addresses)
-                if request.include_roots
-                else dependents - set(request.addresses)
-            )
-            return Dependees(result)
-        known_dependents = dependents
+    # A single breadth-first search over the reverse dependency edges. For direct dependees, we
+    # only expand the roots.
+    dependents: Set[Address] = set()
+    queue = deque(request.addresses)
+    while queue:
+        address = queue.popleft()
+        for dependee in address_to_dependees.mapping.get(address, ()):
+            if dependee in dependents:
+                continue
+            dependents.add(dependee)
+            if request.transitive:
+                queue.append(dependee)
+
+    result = (
+        dependents | set(request.addresses)
+        if request.include_roots
+        else dependents - set(request.addresses)
+    )
+    return Dependees(result)
 
 
 class DependeesSubsystem(LineOriented, GoalSubsystem):
@@ -98,3 +98,19 @@ def test_special_cased_dependencies(rule_runner: RuleRunner) -> None:
         transitive=True,
         expected=["intermediate:intermediate", "leaf:leaf", "special:special"],
     )
+
+
+def test_transitive_cycle(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "cycle1/BUILD": "tgt(dependencies=['cycle2', 'leaf'])",
+            "cycle2/BUILD": "tgt(dependencies=['cycle1'])",
+        }
+    )
+    assert_dependees(
+        rule_runner,
+        targets=["base"],
+        transitive=True,
+        expected=["cycle1:cycle1", "cycle2:cycle2", "intermediate:intermediate", "leaf:leaf"],
+    )
+    assert_dependees(rule_runner, targets=["cycle1"], transitive=True, expected=["cycle2:cycle2"])
@@ -0,0 +1,222 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Long-lived import parser processes, used to avoid paying interpreter startup per file.
+
+The workers live for as long as the Pants process that started them, so under pantsd they are
+reused across runs. They only ever see file contents handed to them by rules, which get those
+contents from the engine, so invalidation is still driven by the engine.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import select
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from pants.util.dirutil import safe_mkdtemp
+
+logger = logging.getLogger(__name__)
+
+
+class ImportParserWorkerError(Exception):
+    """An import parser worker died or responded with garbage."""
+
+
+class ImportParserWorkerTimeout(ImportParserWorkerError):
+    """An import parser worker did not respond in time."""
+
+
+@dataclass(frozen=True)
+class ImportParserWorkerKey:
+    """Identifies a set of interchangeable workers.
+
+    The interpreter is the one selected for the requesting file's interpreter constraints, so this
+    effectively keys the workers by interpreter constraints.
+    """
+
+    python: str
+    string_imports: bool
+    string_imports_min_dots: int
+
+    def env(self) -> dict[str, str]:
+        return {
+            "STRING_IMPORTS": "y" if self.string_imports else "n",
+            "MIN_DOTS": str(self.string_imports_min_dots),
+        }
+
+
+class ImportParserWorker:
+    """A single parser process, speaking the line-based protocol of `import_parser.py --worker`."""
+
+    def __init__(self, key: ImportParserWorkerKey, script_path: str) -> None:
+        self.key = key
+        self._process = subprocess.Popen(
+            [key.python, script_path, "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=key.env(),
+        )
+        assert self._process.stdin is not None
+        # So that a hung worker which stops reading can't block writes past the deadline.
+        os.set_blocking(self._process.stdin.fileno(), False)
+        self._buffer = b""
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def _write(self, data: bytes, deadline: float) -> None:
+        assert self._process.stdin is not None
+        fd = self._process.stdin.fileno()
+        while data:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([], [fd], [], remaining)[1]:
+                raise ImportParserWorkerTimeout("Timed out writing to the import parser.")
+            try:
+                written = os.write(fd, data)
+            except BlockingIOError:
+                continue
+            data = data[written:]
+
+    def _read_line(self, deadline: float) -> bytes:
+        assert self._process.stdout is not None
+        fd = self._process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise ImportParserWorkerTimeout("Timed out waiting for the import parser.")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b""
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line
+
+    def parse(self, path: str, content: bytes, timeout: float) -> dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        request = {"path": path, "content": base64.b64encode(content).decode("ascii")}
+        try:
+            self._write(json.dumps(request).encode("utf8") + b"\n", deadline)
+            response = self._read_line(deadline)
+        except OSError as e:
+            raise ImportParserWorkerError(f"Failed to communicate with the import parser: {e}")
+        if not response:
+            raise ImportParserWorkerError(
+                f"The import parser exited with {self._process.poll()} while parsing {path}."
+            )
+        try:
+            return json.loads(response.decode("utf8"))  # type: ignore[no-any-return]
+        except ValueError as e:
+            raise ImportParserWorkerError(f"Invalid response from the import parser: {e}")
+
+    def close(self) -> None:
+        if self._process.stdin:
+            self._process.stdin.close()
+        try:
+            self._process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self) -> None:
+        self._process.kill()
+        self._process.wait()
+        for pipe in (self._process.stdin, self._process.stdout):
+            if pipe:
+                pipe.close()
+
+
+class ImportParserWorkerPool:
+    """Hands out idle workers per key, starting new ones up to `max_workers_per_key`.
+
+    A worker that crashes is discarded and the request is retried once on a fresh worker. A worker
+    that does not respond within `timeout` seconds is killed, and the request fails with
+    `ImportParserWorkerTimeout` rather than being retried, since the same input would likely hang
+    a fresh worker too. Waiting for a worker to become available is bounded by the same timeout.
+    """
+
+    def __init__(
+        self, script: bytes, max_workers_per_key: int | None = None, timeout: float = 60.0
+    ) -> None:
+        self._script = script
+        self._script_path: str | None = None
+        self._max_workers_per_key = max_workers_per_key or os.cpu_count() or 1
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._idle: defaultdict[ImportParserWorkerKey, list[ImportParserWorker]] = defaultdict(list)
+        self._started: defaultdict[ImportParserWorkerKey, int] = defaultdict(int)
+
+    def _ensure_script(self) -> str:
+        if self._script_path is None:
+            script_path = os.path.join(safe_mkdtemp(prefix="import_parser."), "import_parser.py")
+            with open(script_path, "wb") as f:
+                f.write(self._script)
+            self._script_path = script_path
+        return self._script_path
+
+    def _acquire(self, key: ImportParserWorkerKey) -> ImportParserWorker:
+        deadline = time.monotonic() + self._timeout
+        with self._condition:
+            while True:
+                idle = self._idle[key]
+                while idle:
+                    worker = idle.pop()
+                    if worker.alive:
+                        return worker
+                    self._started[key] -= 1
+                if self._started[key] < self._max_workers_per_key:
+                    self._started[key] += 1
+                    script_path = self._ensure_script()
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise ImportParserWorkerTimeout(
+                        f"Timed out waiting for an idle import parser for {key.python}."
+                    )
+        try:
+            return ImportParserWorker(key, script_path)
+        except OSError:
+            self._discard(key)
+            raise
+
+    def _release(self, worker: ImportParserWorker) -> None:
+        with self._condition:
+            self._idle[worker.key].append(worker)
+            self._condition.notify()
+
+    def _discard(self, key: ImportParserWorkerKey) -> None:
+        with self._condition:
+            self._started[key] -= 1
+            self._condition.notify()
+
+    def parse(self, key: ImportParserWorkerKey, path: str, content: bytes) -> dict[str, Any]:
+        for attempt in range(2):
+            worker = self._acquire(key)
+            try:
+                result = worker.parse(path, content, self._timeout)
+            except ImportParserWorkerError as e:
+                worker.kill()
+                self._discard(key)
+                if attempt or isinstance(e, ImportParserWorkerTimeout):
+                    raise
+                logger.debug(f"Restarting the import parser for {key.python}: {e}")
+                continue
+            self._release(worker)
+            return result
+        raise AssertionError("Unreachable.")
+
+    def shutdown(self) -> None:
+        with self._condition:
+            for key, workers in self._idle.items():
+                for worker in workers:
+                    worker.close()
+                self._started[key] -= len(workers)
+            self._idle.clear()
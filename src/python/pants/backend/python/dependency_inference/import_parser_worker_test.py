@@ -0,0 +1,96 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import pkgutil
+import sys
+import time
+from typing import Iterator
+
+import pytest
+
+from pants.backend.python.dependency_inference import import_parser_worker
+from pants.backend.python.dependency_inference.import_parser_worker import (
+    ImportParserWorkerError,
+    ImportParserWorkerKey,
+    ImportParserWorkerPool,
+    ImportParserWorkerTimeout,
+)
+
+
+@pytest.fixture
+def pool() -> Iterator[ImportParserWorkerPool]:
+    script = pkgutil.get_data(import_parser_worker.__name__, "scripts/import_parser.py")
+    assert script is not None
+    pool = ImportParserWorkerPool(script, max_workers_per_key=2)
+    yield pool
+    pool.shutdown()
+
+
+KEY = ImportParserWorkerKey(sys.executable, string_imports=True, string_imports_min_dots=2)
+
+
+def test_parse(pool: ImportParserWorkerPool) -> None:
+    assert pool.parse(KEY, "project/foo.py", b"import os\nfrom . import bar\n") == {
+        "os": {"lineno": 1, "weak": False},
+        "project.bar": {"lineno": 2, "weak": False},
+    }
+    assert pool.parse(KEY, "project/foo.py", b"x = 'a.b.c'\n") == {
+        "a.b.c": {"lineno": 1, "weak": True}
+    }
+    assert pool.parse(KEY, "project/bad.py", b"def (:\n") == {}
+
+
+# Answers each request with its pid, and crashes or hangs on request.
+FAKE_WORKER_SCRIPT = b"""\
+import base64, json, os, sys, time
+
+for line in iter(sys.stdin.buffer.readline, b""):
+    content = base64.b64decode(json.loads(line)["content"]).decode()
+    command, _, marker = content.partition(" ")
+    if command == "crash" or (command == "crash-once" and not os.path.exists(marker)):
+        if marker:
+            open(marker, "w").close()
+        os._exit(1)
+    if command == "hang":
+        time.sleep(60)
+    sys.stdout.buffer.write(json.dumps({"pid": os.getpid()}).encode() + b"\\n")
+    sys.stdout.buffer.flush()
+"""
+
+
+@pytest.fixture
+def fake_pool() -> Iterator[ImportParserWorkerPool]:
+    pool = ImportParserWorkerPool(FAKE_WORKER_SCRIPT, max_workers_per_key=1, timeout=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_reuses_worker(fake_pool: ImportParserWorkerPool) -> None:
+    first = fake_pool.parse(KEY, "foo.py", b"ok")
+    assert fake_pool.parse(KEY, "foo.py", b"ok") == first
+
+
+def test_restarts_crashed_worker(fake_pool: ImportParserWorkerPool, tmp_path) -> None:
+    first = fake_pool.parse(KEY, "foo.py", b"ok")
+    retried = fake_pool.parse(KEY, "foo.py", f"crash-once {tmp_path / 'crashed'}".encode())
+    assert retried != first
+    assert fake_pool.parse(KEY, "foo.py", b"ok") == retried
+
+
+def test_fails_when_worker_keeps_crashing(fake_pool: ImportParserWorkerPool) -> None:
+    with pytest.raises(ImportParserWorkerError):
+        fake_pool.parse(KEY, "foo.py", b"crash")
+    # The crashed workers gave their slot back.
+    assert "pid" in fake_pool.parse(KEY, "foo.py", b"ok")
+
+
+def test_kills_hung_worker(fake_pool: ImportParserWorkerPool) -> None:
+    first = fake_pool.parse(KEY, "foo.py", b"ok")
+    start = time.monotonic()
+    with pytest.raises(ImportParserWorkerTimeout):
+        fake_pool.parse(KEY, "foo.py", b"hang")
+    assert time.monotonic() - start < 10
+    # The hung worker was replaced, rather than left to block the only slot.
+    assert fake_pool.parse(KEY, "foo.py", b"ok") != first
@@ -19,6 +19,7 @@ from pants.backend.python.dependency_inference.default_module_mapping import (
 )
 from pants.backend.python.dependency_inference.module_mapper import (
     FirstPartyPythonModuleMapping,
+    FirstPartyPythonModuleMappingShard,
     ModuleProvider,
     ModuleProviderType,
     PythonModuleOwners,
@@ -34,6 +35,7 @@ from pants.backend.python.target_types import (
 )
 from pants.core.util_rules import stripped_source_files
 from pants.engine.addresses import Address
+from pants.engine.target import AllTargetsShardRequest
 from pants.testutil.rule_runner import QueryRule, RuleRunner
 from pants.util.frozendict import FrozenDict
 
@@ -188,6 +190,7 @@ def rule_runner() -> RuleRunner:
             *target_types_rules.rules(),
             *protobuf_target_type_rules(),
             QueryRule(FirstPartyPythonModuleMapping, []),
+            QueryRule(FirstPartyPythonModuleMappingShard, [AllTargetsShardRequest]),
             QueryRule(ThirdPartyPythonModuleMapping, []),
             QueryRule(PythonModuleOwners, [PythonModuleOwnersRequest]),
         ],
@@ -292,6 +295,39 @@ def test_map_first_party_modules_to_addresses(rule_runner: RuleRunner) -> None:
     )
 
 
+def test_first_party_mapping_shards(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--source-root-patterns=['src/python']"])
+    rule_runner.write_files(
+        {
+            "src/python/project/app.py": "",
+            "src/python/project/BUILD": "python_sources()",
+            "src/python/project/lib/util.py": "",
+            "src/python/project/lib/BUILD": "python_sources()",
+        }
+    )
+    app_provider = ModuleProvider(
+        Address("src/python/project", relative_file_path="app.py"), ModuleProviderType.IMPL
+    )
+    util_provider = ModuleProvider(
+        Address("src/python/project/lib", relative_file_path="util.py"), ModuleProviderType.IMPL
+    )
+
+    def get_shard(directory: str) -> FirstPartyPythonModuleMappingShard:
+        return rule_runner.request(
+            FirstPartyPythonModuleMappingShard, [AllTargetsShardRequest(directory)]
+        )
+
+    assert get_shard("src/python/project") == FirstPartyPythonModuleMappingShard(
+        {"project.app": (app_provider,)}
+    )
+    assert get_shard("src/python/project/lib") == FirstPartyPythonModuleMappingShard(
+        {"project.lib.util": (util_provider,)}
+    )
+    assert rule_runner.request(FirstPartyPythonModuleMapping, []) == FirstPartyPythonModuleMapping(
+        {"project.app": (app_provider,), "project.lib.util": (util_provider,)}
+    )
+
+
 def test_map_third_party_modules_to_addresses(rule_runner: RuleRunner) -> None:
     def req(
         tgt_name: str,
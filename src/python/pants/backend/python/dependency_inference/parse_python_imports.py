@@ -1,20 +1,40 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+from __future__ import annotations
+
+import atexit
 import json
+import logging
 import pkgutil
+import threading
+from collections import defaultdict
 from dataclasses import dataclass
+from typing import DefaultDict
 
+from pants.backend.python.dependency_inference.import_parser_worker import (
+    ImportParserWorkerError,
+    ImportParserWorkerKey,
+    ImportParserWorkerPool,
+)
+from pants.backend.python.subsystems.setup import PythonSetup
 from pants.backend.python.target_types import PythonSourceField
 from pants.backend.python.util_rules.interpreter_constraints import InterpreterConstraints
 from pants.backend.python.util_rules.pex_environment import PythonExecutable
+from pants.base.specs import AddressSpecs, SiblingAddresses
 from pants.core.util_rules.source_files import SourceFilesRequest
 from pants.core.util_rules.stripped_source_files import StrippedSourceFiles
-from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
+from pants.engine.addresses import Address
+from pants.engine.fs import CreateDigest, Digest, DigestContents, FileContent, MergeDigests
 from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import Targets
+from pants.util.collections import partition_containing
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -39,13 +59,90 @@ class ParsePythonImportsRequest:
     string_imports_min_dots: int
 
 
+@dataclass(frozen=True)
+class ParsePythonImportsBatchRequest:
+    """Parse the imports of many Python source files in a single process.
+
+    Each file's result is also cached individually by the parser, so rerunning a batch because
+    one of its files changed does not reparse the rest of the batch.
+    """
+
+    sources: tuple[PythonSourceField, ...]
+    interpreter_constraints: InterpreterConstraints
+    string_imports: bool
+    string_imports_min_dots: int
+
+
+class ParsedPythonImportsBatch(FrozenDict[Address, ParsedPythonImports]):
+    """The discovered imports for each Python source file in a batch, keyed by its address."""
+
+
+@dataclass(frozen=True)
+class WorkerParsePythonImportsRequest:
+    """Parse the imports of a single file using a long-lived parser process.
+
+    The workers are keyed by the interpreter selected for the interpreter constraints (and the
+    string import options), live as long as the Pants process (so across runs under pantsd), and
+    are restarted if they crash or hang. If no worker can parse the file, it is parsed by a separate
+    process, as for `ParsePythonImportsRequest`.
+    """
+
+    request: ParsePythonImportsRequest
+
+
+@dataclass(frozen=True)
+class BatchedParsePythonImportsRequest:
+    """Parse the imports of a single file as part of a batch of its sibling files.
+
+    The batch is formed by stably partitioning the `python_source` targets living in the same
+    directory with the same interpreter constraints into batches of at most `batch_size` files.
+    Every file in a batch resolves to the same `ParsePythonImportsBatchRequest`, so the engine only
+    runs one parser process per batch.
+    """
+
+    request: ParsePythonImportsRequest
+    batch_size: int
+
+
+_PARSER_SCRIPT_NAME = "__parse_python_imports.py"
+_PARSER_CACHE_NAME = "python_import_parser"
+
+
+def _parser_env(string_imports: bool, string_imports_min_dots: int) -> dict[str, str]:
+    return {
+        "STRING_IMPORTS": "y" if string_imports else "n",
+        "MIN_DOTS": str(string_imports_min_dots),
+    }
+
+
+def _parse_output(output: dict[str, dict]) -> ParsedPythonImports:
+    return ParsedPythonImports(
+        (imp, ParsedPythonImportInfo(**info)) for imp, info in output.items()
+    )
+
+
+_import_parser_worker_pool_lock = threading.Lock()
+_import_parser_worker_pool_instance: ImportParserWorkerPool | None = None
+
+
+def _import_parser_worker_pool() -> ImportParserWorkerPool:
+    global _import_parser_worker_pool_instance
+    with _import_parser_worker_pool_lock:
+        if _import_parser_worker_pool_instance is None:
+            script = pkgutil.get_data(__name__, "scripts/import_parser.py")
+            assert script is not None
+            _import_parser_worker_pool_instance = ImportParserWorkerPool(script)
+            atexit.register(_import_parser_worker_pool_instance.shutdown)
+        return _import_parser_worker_pool_instance
+
+
 @rule
 async def parse_python_imports(request: ParsePythonImportsRequest) -> ParsedPythonImports:
     script = pkgutil.get_data(__name__, "scripts/import_parser.py")
     assert script is not None
     python_interpreter, script_digest, stripped_sources = await MultiGet(
         Get(PythonExecutable, InterpreterConstraints, request.interpreter_constraints),
-        Get(Digest, CreateDigest([FileContent("__parse_python_imports.py", script)])),
+        Get(Digest, CreateDigest([FileContent(_PARSER_SCRIPT_NAME, script)])),
         Get(StrippedSourceFiles, SourceFilesRequest([request.source])),
     )
 
@@ -61,24 +158,150 @@ async def parse_python_imports(request: ParsePythonImportsRequest) -> ParsedPyth
         Process(
             argv=[
                 python_interpreter.path,
-                "./__parse_python_imports.py",
+                f"./{_PARSER_SCRIPT_NAME}",
                 file,
             ],
             input_digest=input_digest,
             description=f"Determine Python imports for {request.source.address}",
-            env={
-                "STRING_IMPORTS": "y" if request.string_imports else "n",
-                "MIN_DOTS": str(request.string_imports_min_dots),
-            },
+            env=_parser_env(request.string_imports, request.string_imports_min_dots),
             level=LogLevel.DEBUG,
         ),
     )
     # See above for where we explicitly encoded as utf8. Even though utf8 is the
     # default for decode(), we make that explicit here for emphasis.
     process_output = process_result.stdout.decode("utf8") or "{}"
-    return ParsedPythonImports(
-        (imp, ParsedPythonImportInfo(**info)) for imp, info in json.loads(process_output).items()
+    return _parse_output(json.loads(process_output))
+
+
+@rule
+async def parse_python_imports_batch(
+    request: ParsePythonImportsBatchRequest,
+) -> ParsedPythonImportsBatch:
+    if not request.sources:
+        return ParsedPythonImportsBatch()
+
+    script = pkgutil.get_data(__name__, "scripts/import_parser.py")
+    assert script is not None
+    python_interpreter, script_digest = await MultiGet(
+        Get(PythonExecutable, InterpreterConstraints, request.interpreter_constraints),
+        Get(Digest, CreateDigest([FileContent(_PARSER_SCRIPT_NAME, script)])),
+    )
+    all_stripped_sources = await MultiGet(
+        Get(StrippedSourceFiles, SourceFilesRequest([source])) for source in request.sources
+    )
+
+    # We operate on PythonSourceField, which should be one file. But several targets may own the
+    # same file, in which case it is parsed once for all of them.
+    file_to_addresses: DefaultDict[str, list[Address]] = defaultdict(list)
+    for source, stripped_sources in zip(request.sources, all_stripped_sources):
+        assert len(stripped_sources.snapshot.files) == 1
+        file_to_addresses[stripped_sources.snapshot.files[0]].append(source.address)
+
+    input_digest = await Get(
+        Digest,
+        MergeDigests(
+            [script_digest, *(stripped.snapshot.digest for stripped in all_stripped_sources)]
+        ),
+    )
+    cache_dir = f".cache/{_PARSER_CACHE_NAME}"
+    process_result = await Get(
+        ProcessResult,
+        Process(
+            argv=[
+                python_interpreter.path,
+                f"./{_PARSER_SCRIPT_NAME}",
+                "--batch",
+                *sorted(file_to_addresses),
+            ],
+            input_digest=input_digest,
+            description=(
+                f"Determine Python imports for {pluralize(len(file_to_addresses), 'file')}"
+            ),
+            env={
+                **_parser_env(request.string_imports, request.string_imports_min_dots),
+                "IMPORT_PARSER_CACHE_DIR": cache_dir,
+            },
+            append_only_caches={_PARSER_CACHE_NAME: cache_dir},
+            level=LogLevel.DEBUG,
+        ),
+    )
+    process_output = json.loads(process_result.stdout.decode("utf8") or "{}")
+    return ParsedPythonImportsBatch(
+        (address, _parse_output(output))
+        for file, output in process_output.items()
+        for address in file_to_addresses[file]
+    )
+
+
+@rule
+async def parse_python_imports_in_batch(
+    request: BatchedParsePythonImportsRequest, python_setup: PythonSetup
+) -> ParsedPythonImports:
+    imports_request = request.request
+    address = imports_request.source.address
+    if request.batch_size <= 1:
+        return await Get(ParsedPythonImports, ParsePythonImportsRequest, imports_request)
+
+    sibling_targets = await Get(Targets, AddressSpecs([SiblingAddresses(address.spec_path)]))
+    batch_fields = partition_containing(
+        (
+            tgt[PythonSourceField]
+            for tgt in sibling_targets
+            if tgt.has_field(PythonSourceField)
+            and InterpreterConstraints.create_from_targets([tgt], python_setup)
+            == imports_request.interpreter_constraints
+        ),
+        address.spec,
+        key=lambda field: field.address.spec,
+        size_max=request.batch_size,
+    )
+    if not batch_fields:
+        # E.g. the interpreter constraints were not computed from the target itself.
+        return await Get(ParsedPythonImports, ParsePythonImportsRequest, imports_request)
+
+    batch = await Get(
+        ParsedPythonImportsBatch,
+        ParsePythonImportsBatchRequest(
+            tuple(batch_fields),
+            imports_request.interpreter_constraints,
+            string_imports=imports_request.string_imports,
+            string_imports_min_dots=imports_request.string_imports_min_dots,
+        ),
+    )
+    return batch[address]
+
+
+@rule
+async def parse_python_imports_with_worker(
+    request: WorkerParsePythonImportsRequest,
+) -> ParsedPythonImports:
+    imports_request = request.request
+    python_interpreter, stripped_sources = await MultiGet(
+        Get(PythonExecutable, InterpreterConstraints, imports_request.interpreter_constraints),
+        Get(StrippedSourceFiles, SourceFilesRequest([imports_request.source])),
     )
+    digest_contents = await Get(DigestContents, Digest, stripped_sources.snapshot.digest)
+
+    # We operate on PythonSourceField, which should be one file.
+    assert len(digest_contents) == 1
+    file_content = digest_contents[0]
+
+    try:
+        output = _import_parser_worker_pool().parse(
+            ImportParserWorkerKey(
+                python_interpreter.path,
+                string_imports=imports_request.string_imports,
+                string_imports_min_dots=imports_request.string_imports_min_dots,
+            ),
+            file_content.path,
+            file_content.content,
+        )
+    except ImportParserWorkerError as e:
+        logger.warning(
+            f"Falling back to a separate process to parse the imports of {file_content.path}: {e}"
+        )
+        return await Get(ParsedPythonImports, ParsePythonImportsRequest, imports_request)
+    return _parse_output(output)
 
 
 def rules():
@@ -8,11 +8,16 @@ from textwrap import dedent
 import pytest
 
 from pants.backend.python.dependency_inference import parse_python_imports
+from pants.backend.python.dependency_inference.parse_python_imports import (
+    BatchedParsePythonImportsRequest,
+)
 from pants.backend.python.dependency_inference.parse_python_imports import (
     ParsedPythonImportInfo as ImpInfo,
 )
 from pants.backend.python.dependency_inference.parse_python_imports import (
     ParsedPythonImports,
+    ParsedPythonImportsBatch,
+    ParsePythonImportsBatchRequest,
     ParsePythonImportsRequest,
 )
 from pants.backend.python.target_types import PythonSourceField, PythonSourceTarget
@@ -36,6 +41,8 @@ def rule_runner() -> RuleRunner:
             *stripped_source_files.rules(),
             *pex.rules(),
             QueryRule(ParsedPythonImports, [ParsePythonImportsRequest]),
+            QueryRule(ParsedPythonImports, [BatchedParsePythonImportsRequest]),
+            QueryRule(ParsedPythonImportsBatch, [ParsePythonImportsBatchRequest]),
         ],
         target_types=[PythonSourceTarget],
     )
@@ -458,3 +465,119 @@ def test_works_with_python39(rule_runner: RuleRunner) -> None:
             "dep.from.str": ImpInfo(lineno=13, weak=True),
         },
     )
+
+
+def test_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options([], env_inherit={"PATH", "PYENV_ROOT", "HOME"})
+    rule_runner.write_files(
+        {
+            "project/BUILD": "python_sources()",
+            "project/a.py": "import os\nfrom . import b\n",
+            "project/b.py": "import json\n",
+            "project/c.py": "import os\nimport demo\n",
+            "project/bad.py": "def (:\n",
+        }
+    )
+    addresses = [
+        Address("project", relative_file_path=f) for f in ("a.py", "b.py", "c.py", "bad.py")
+    ]
+    sources = tuple(rule_runner.get_target(addr)[PythonSourceField] for addr in addresses)
+    batch = rule_runner.request(
+        ParsedPythonImportsBatch,
+        [
+            ParsePythonImportsBatchRequest(
+                sources,
+                InterpreterConstraints([">=3.6"]),
+                string_imports=False,
+                string_imports_min_dots=2,
+            )
+        ],
+    )
+    assert dict(batch) == {
+        addresses[0]: ParsedPythonImports(
+            {"os": ImpInfo(lineno=1, weak=False), "project.b": ImpInfo(lineno=2, weak=False)}
+        ),
+        addresses[1]: ParsedPythonImports({"json": ImpInfo(lineno=1, weak=False)}),
+        addresses[2]: ParsedPythonImports(
+            {"os": ImpInfo(lineno=1, weak=False), "demo": ImpInfo(lineno=2, weak=False)}
+        ),
+        addresses[3]: ParsedPythonImports(),
+    }
+
+    def parse_in_batch(address: Address, batch_size: int) -> ParsedPythonImports:
+        return rule_runner.request(
+            ParsedPythonImports,
+            [
+                BatchedParsePythonImportsRequest(
+                    ParsePythonImportsRequest(
+                        rule_runner.get_target(address)[PythonSourceField],
+                        InterpreterConstraints([">=3.6"]),
+                        string_imports=False,
+                        string_imports_min_dots=2,
+                    ),
+                    batch_size=batch_size,
+                )
+            ],
+        )
+
+    for batch_size in (1, 2, 10):
+        for address in addresses:
+            assert parse_in_batch(address, batch_size) == batch[address]
+
+
+def test_batch_shared_file(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options([], env_inherit={"PATH", "PYENV_ROOT", "HOME"})
+    rule_runner.write_files(
+        {
+            "project/BUILD": dedent(
+                """\
+                python_source(name="x", source="shared.py")
+                python_source(name="y", source="shared.py")
+                python_source(name="z", source="other.py")
+                """
+            ),
+            "project/shared.py": "import os\n",
+            "project/other.py": "import json\n",
+        }
+    )
+    addresses = [Address("project", target_name=name) for name in ("x", "y", "z")]
+    shared_imports = ParsedPythonImports({"os": ImpInfo(lineno=1, weak=False)})
+    other_imports = ParsedPythonImports({"json": ImpInfo(lineno=1, weak=False)})
+
+    # Both owners of the shared file get its imports, rather than only the last one in the batch.
+    batch = rule_runner.request(
+        ParsedPythonImportsBatch,
+        [
+            ParsePythonImportsBatchRequest(
+                tuple(rule_runner.get_target(addr)[PythonSourceField] for addr in addresses),
+                InterpreterConstraints([">=3.6"]),
+                string_imports=False,
+                string_imports_min_dots=2,
+            )
+        ],
+    )
+    assert dict(batch) == {
+        addresses[0]: shared_imports,
+        addresses[1]: shared_imports,
+        addresses[2]: other_imports,
+    }
+
+    def parse_in_batch(address: Address) -> ParsedPythonImports:
+        return rule_runner.request(
+            ParsedPythonImports,
+            [
+                BatchedParsePythonImportsRequest(
+                    ParsePythonImportsRequest(
+                        rule_runner.get_target(address)[PythonSourceField],
+                        InterpreterConstraints([">=3.6"]),
+                        string_imports=False,
+                        string_imports_min_dots=2,
+                    ),
+                    batch_size=10,
+                )
+            ],
+        )
+
+    assert parse_in_batch(addresses[0]) == shared_imports
+    assert parse_in_batch(addresses[1]) == shared_imports
+    assert parse_in_batch(addresses[2]) == other_imports
@@ -9,6 +9,8 @@
 from __future__ import print_function, unicode_literals
 
 import ast
+import base64
+import hashlib
 import itertools
 import json
 import os
@@ -157,22 +159,24 @@ class AstVisitor(ast.NodeVisitor):
             self.maybe_add_string_import(node, node.value)
 
 
-def main(filename):
+def parse_file(filename):
+    """Return a dict of module name to import info for the file, or None if it can't be parsed."""
     with open(filename, "rb") as f:
         content = f.read()
+    return parse_content(filename, content)
+
+
+def parse_content(filename, content):
+    """Like `parse_file`, but for content that has already been read."""
     try:
         tree = ast.parse(content, filename=filename)
     except SyntaxError:
-        return
+        return None
 
     package_parts = os.path.dirname(filename).split(os.path.sep)
     visitor = AstVisitor(package_parts, content)
     visitor.visit(tree)
 
-    # We have to be careful to set the encoding explicitly and write raw bytes ourselves.
-    # See below for where we explicitly decode.
-    buffer = sys.stdout if sys.version_info[0:2] == (2, 7) else sys.stdout.buffer
-
     # N.B. Start with weak and `update` with definitive so definite "wins"
     result = {
         module_name: {"lineno": lineno, "weak": True}
@@ -184,9 +188,97 @@ def main(filename):
             for module_name, lineno in visitor.strong_imports.items()
         }
     )
+    return result
+
+
+def _cache_key(filename):
+    # The result depends on this script, the parse options, the file's location (for relative
+    # imports) and the file's content.
+    hasher = hashlib.sha256()
+    with open(__file__, "rb") as f:
+        hasher.update(f.read())
+    hasher.update(
+        "{}\0{}\0{}\0".format(MIN_DOTS, os.environ["STRING_IMPORTS"], filename).encode("utf8")
+    )
+    with open(filename, "rb") as f:
+        hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def parse_file_cached(filename, cache_dir):
+    """Like `parse_file`, but consults and populates a per-file cache under `cache_dir`.
+
+    The cache lets a batch that is rerun because one of its files changed skip reparsing the
+    files that did not change.
+    """
+    cache_path = os.path.join(cache_dir, _cache_key(filename) + ".json")
+    try:
+        with open(cache_path, "rb") as f:
+            return json.loads(f.read().decode("utf8"))
+    except (IOError, OSError, ValueError):
+        pass
+
+    result = parse_file(filename)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+    except OSError:
+        # Likely a concurrent creation of the same directory.
+        pass
+    # Write atomically, since other parser processes may be reading the same cache.
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(result).encode("utf8"))
+        os.rename(tmp_path, cache_path)
+    except (IOError, OSError):
+        pass
+    return result
+
+
+def _write_json(obj):
+    # We have to be careful to set the encoding explicitly and write raw bytes ourselves.
+    # See ../parse_python_imports.py for where we explicitly decode.
+    buffer = sys.stdout if sys.version_info[0:2] == (2, 7) else sys.stdout.buffer
+    buffer.write(json.dumps(obj).encode("utf8"))
+
+
+def main(filename):
+    result = parse_file(filename)
+    if result is not None:
+        _write_json(result)
+
+
+def main_batch(filenames):
+    """Parse many files in one process, writing a JSON object of filename to import info."""
+    cache_dir = os.environ.get("IMPORT_PARSER_CACHE_DIR")
+    results = {}
+    for filename in filenames:
+        result = parse_file_cached(filename, cache_dir) if cache_dir else parse_file(filename)
+        results[filename] = result or {}
+    _write_json(results)
+
+
+def main_worker():
+    """Serve parse requests over stdin/stdout until stdin is closed.
 
-    buffer.write(json.dumps(result).encode("utf8"))
+    Each request is a line holding a JSON object with the file's `path` and its base64-encoded
+    `content`, and each response is a line holding the JSON import info for that file.
+    """
+    stdin = sys.stdin if sys.version_info[0:2] == (2, 7) else sys.stdin.buffer
+    stdout = sys.stdout if sys.version_info[0:2] == (2, 7) else sys.stdout.buffer
+    for line in iter(stdin.readline, b""):
+        request = json.loads(line.decode("utf8"))
+        content = base64.b64decode(request["content"])
+        result = parse_content(request["path"], content) or {}
+        stdout.write(json.dumps(result).encode("utf8") + b"\n")
+        stdout.flush()
 
 
 if __name__ == "__main__":
-    main(sys.argv[1])
+    if sys.argv[1] == "--batch":
+        main_batch(sys.argv[2:])
+    elif sys.argv[1] == "--worker":
+        main_worker()
+    else:
+        main(sys.argv[1])
@@ -50,6 +50,7 @@ from pants.engine.unions import UnionRule
 from pants.option.custom_types import file_option
 from pants.option.global_options import ProcessCleanupOption
 from pants.source.source_root import AllSourceRoots
+from pants.util.collections import partition_sequentially
 from pants.util.docutil import git_url
 from pants.util.logging import LogLevel
 
@@ -196,6 +197,20 @@ class CoverageSubsystem(PythonToolBase):
             ),
         )
 
+        register(
+            "--merge-batch-size",
+            type=int,
+            default=64,
+            advanced=True,
+            help=(
+                "The approximate number of coverage data files to combine in each process when "
+                "merging the coverage data of many tests.\n\n"
+                "Coverage data is merged in a tree of batches, so that batches can be combined in "
+                "parallel, and so that batches whose inputs didn't change are cached when only "
+                "some tests are rerun."
+            ),
+        )
+
     @property
     def filter(self) -> tuple[str, ...]:
         return tuple(self.options.filter)
@@ -235,6 +250,10 @@ class CoverageSubsystem(PythonToolBase):
     def fail_under(self) -> int:
         return cast(int, self.options.fail_under)
 
+    @property
+    def merge_batch_size(self) -> int:
+        return max(2, cast(int, self.options.merge_batch_size))
+
 
 class CoveragePyLockfileSentinel(GenerateToolLockfileSentinel):
     resolve_name = CoverageSubsystem.options_scope
@@ -385,6 +404,41 @@ class MergedCoverageData:
     addresses: tuple[Address, ...]
 
 
+@dataclass(frozen=True)
+class CoverageDataBatch:
+    """`.coverage` files to combine into a single `.coverage` file, each at the root of a digest."""
+
+    digests: tuple[Digest, ...]
+
+
+@dataclass(frozen=True)
+class CombinedCoverageData:
+    digest: Digest
+
+
+@rule(desc="Combine a batch of Pytest coverage data", level=LogLevel.DEBUG)
+async def combine_coverage_data_batch(
+    batch: CoverageDataBatch, coverage_setup: CoverageSetup
+) -> CombinedCoverageData:
+    prefixed_digests = await MultiGet(
+        Get(Digest, AddPrefix(digest, prefix=str(i))) for i, digest in enumerate(batch.digests)
+    )
+    input_digest = await Get(Digest, MergeDigests(prefixed_digests))
+    result = await Get(
+        ProcessResult,
+        VenvPexProcess(
+            coverage_setup.pex,
+            # We tell combine to keep the original input files, to aid debugging in the sandbox.
+            argv=("combine", "--keep", *(f"{i}/.coverage" for i in range(len(batch.digests)))),
+            input_digest=input_digest,
+            output_files=(".coverage",),
+            description=f"Merge {len(batch.digests)} Pytest coverage reports.",
+            level=LogLevel.DEBUG,
+        ),
+    )
+    return CombinedCoverageData(result.output_digest)
+
+
 @rule(desc="Merge Pytest coverage data", level=LogLevel.DEBUG)
 async def merge_coverage_data(
     data_collection: PytestCoverageDataCollection,
@@ -397,16 +451,37 @@ async def merge_coverage_data(
         coverage_data = data_collection[0]
         return MergedCoverageData(coverage_data.digest, (coverage_data.address,))
 
-    coverage_digest_gets = []
-    coverage_data_file_paths = []
-    addresses = []
-    for data in data_collection:
-        # We prefix each .coverage file with its corresponding address to avoid collisions.
-        coverage_digest_gets.append(
-            Get(Digest, AddPrefix(data.digest, prefix=data.address.path_safe_spec))
+    # We merge the data in a tree of batches, from the data of each test in order of address up to
+    # a single `.coverage` file. The leaf batches are partitioned by address and the batches above
+    # them by digest, so when only some tests are rerun, most batches hit the process cache.
+    sorted_data = sorted(data_collection, key=lambda data: data.address)
+    addresses = tuple(data.address for data in sorted_data)
+    batch_size = coverage.merge_batch_size
+    coverage_digests = [data.digest for data in sorted_data]
+    batches = [
+        tuple(data.digest for data in batch)
+        for batch in partition_sequentially(
+            sorted_data, key=lambda data: data.address.spec, size_target=batch_size
         )
-        coverage_data_file_paths.append(f"{data.address.path_safe_spec}/.coverage")
-        addresses.append(data.address)
+    ]
+    # NB: We stop if a level didn't combine anything, which can only happen if all of the keys of
+    # a level happen to be batch boundaries.
+    while len(coverage_digests) > batch_size and len(batches) < len(coverage_digests):
+        combined = await MultiGet(
+            Get(CombinedCoverageData, CoverageDataBatch(batch))
+            for batch in batches
+            if len(batch) > 1
+        )
+        combined_digests = iter(combined)
+        coverage_digests = [
+            next(combined_digests).digest if len(batch) > 1 else batch[0] for batch in batches
+        ]
+        batches = [
+            tuple(batch)
+            for batch in partition_sequentially(
+                coverage_digests, key=lambda digest: digest.fingerprint, size_target=batch_size
+            )
+        ]
 
     if coverage.global_report:
         # It's important to set the `branch` value in the empty base report to the value it will
@@ -468,31 +543,18 @@ async def merge_coverage_data(
                 level=LogLevel.DEBUG,
             ),
         )
-        coverage_digest_gets.append(
-            Get(
-                Digest, AddPrefix(digest=result.output_digest, prefix=str(global_coverage_base_dir))
-            )
-        )
-        coverage_data_file_paths.append(str(global_coverage_base_dir / ".coverage"))
+        coverage_digests.append(result.output_digest)
     else:
         extra_sources_digest = EMPTY_DIGEST
 
-    input_digest = await Get(Digest, MergeDigests(await MultiGet(coverage_digest_gets)))
-    result = await Get(
-        ProcessResult,
-        VenvPexProcess(
-            coverage_setup.pex,
-            # We tell combine to keep the original input files, to aid debugging in the sandbox.
-            argv=("combine", "--keep", *sorted(coverage_data_file_paths)),
-            input_digest=input_digest,
-            output_files=(".coverage",),
-            description=f"Merge {len(coverage_data_file_paths)} Pytest coverage reports.",
-            level=LogLevel.DEBUG,
-        ),
-    )
+    if len(coverage_digests) == 1:
+        merged_digest = coverage_digests[0]
+    else:
+        combined_data = await Get(CombinedCoverageData, CoverageDataBatch(tuple(coverage_digests)))
+        merged_digest = combined_data.digest
     return MergedCoverageData(
-        await Get(Digest, MergeDigests((result.output_digest, extra_sources_digest))),
-        tuple(addresses),
+        await Get(Digest, MergeDigests((merged_digest, extra_sources_digest))),
+        addresses,
     )
 
 
@@ -1,6 +1,8 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+from __future__ import annotations
+
 import sqlite3
 from pathlib import Path
 from textwrap import dedent
@@ -206,6 +208,20 @@ def test_coverage_global() -> None:
     ), result.stderr
 
 
+def test_coverage_merged_in_batches() -> None:
+    def report(result: PantsResult) -> list[str]:
+        lines = result.stderr.splitlines()
+        start = next(i for i, line in enumerate(lines) if line.startswith("Name "))
+        end = next(i for i, line in enumerate(lines) if line.startswith("TOTAL "))
+        return lines[start : end + 1]
+
+    with setup_tmpdir(SOURCES) as tmpdir:
+        # The default batch size combines the data of all of the tests at once.
+        single_combine_result = run_coverage(tmpdir)
+        batched_result = run_coverage(tmpdir, "--coverage-py-merge-batch-size=2")
+    assert report(batched_result) == report(single_combine_result)
+
+
 def test_coverage_with_filter() -> None:
     with setup_tmpdir(SOURCES) as tmpdir:
         result = run_coverage(tmpdir, "--coverage-py-filter=['project.lib', 'project_test.no_src']")
@@ -1,10 +1,14 @@
 # Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import dataclasses
 import logging
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+from xml.etree import ElementTree
 
 from pants.backend.python.goals.coverage_py import (
     CoverageConfig,
@@ -13,14 +17,28 @@ from pants.backend.python.goals.coverage_py import (
 )
 from pants.backend.python.subsystems.pytest import PyTest, PythonTestFieldSet
 from pants.backend.python.subsystems.setup import PythonSetup
+from pants.backend.python.target_types import (
+    InterpreterConstraintsField,
+    PythonResolveField,
+    PythonTestsBatchCompatibilityTagField,
+    PythonTestsExtraEnvVarsField,
+)
 from pants.backend.python.util_rules.interpreter_constraints import InterpreterConstraints
 from pants.backend.python.util_rules.local_dists import LocalDistsPex, LocalDistsPexRequest
-from pants.backend.python.util_rules.pex import Pex, PexRequest, VenvPex, VenvPexProcess
+from pants.backend.python.util_rules.pex import (
+    ExtractedPexDistributions,
+    ExtractPexDistributionsRequest,
+    Pex,
+    PexRequest,
+    VenvPex,
+    VenvPexProcess,
+)
 from pants.backend.python.util_rules.pex_from_targets import RequirementsPexRequest
 from pants.backend.python.util_rules.python_sources import (
     PythonSourceFiles,
     PythonSourceFilesRequest,
 )
+from pants.base.specs import AddressSpecs, SiblingAddresses
 from pants.core.goals.test import (
     BuildPackageDependenciesRequest,
     BuiltPackageDependencies,
@@ -40,8 +58,10 @@ from pants.engine.fs import (
     EMPTY_DIGEST,
     CreateDigest,
     Digest,
+    DigestContents,
     DigestSubset,
     Directory,
+    FileContent,
     MergeDigests,
     PathGlobs,
     RemovePrefix,
@@ -50,14 +70,24 @@ from pants.engine.fs import (
 from pants.engine.process import (
     FallibleProcessResult,
     InteractiveProcess,
+    InteractiveProcessRequest,
     Process,
     ProcessCacheScope,
 )
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.engine.target import Target, TransitiveTargets, TransitiveTargetsRequest, WrappedTarget
+from pants.engine.target import (
+    Target,
+    Targets,
+    TransitiveTargets,
+    TransitiveTargetsRequest,
+    WrappedTarget,
+)
 from pants.engine.unions import UnionMembership, UnionRule, union
 from pants.option.global_options import GlobalOptions
+from pants.util.collections import partition_containing
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger()
 
@@ -103,22 +133,25 @@ class AllPytestPluginSetups(Collection[PytestPluginSetup]):
 # TODO: Why is this necessary? We should be able to use `PythonTestFieldSet` as the rule param.
 @dataclass(frozen=True)
 class AllPytestPluginSetupsRequest:
-    address: Address
+    addresses: Tuple[Address, ...]
 
 
 @rule
 async def run_all_setup_plugins(
     request: AllPytestPluginSetupsRequest, union_membership: UnionMembership
 ) -> AllPytestPluginSetups:
-    wrapped_tgt = await Get(WrappedTarget, Address, request.address)
-    applicable_setup_request_types = tuple(
-        request
-        for request in union_membership.get(PytestPluginSetupRequest)
-        if request.is_applicable(wrapped_tgt.target)
+    wrapped_tgts = await MultiGet(
+        Get(WrappedTarget, Address, address) for address in request.addresses
+    )
+    applicable_setup_requests = tuple(
+        setup_request_type(wrapped_tgt.target)  # type: ignore[misc, abstract]
+        for wrapped_tgt in wrapped_tgts
+        for setup_request_type in union_membership.get(PytestPluginSetupRequest)
+        if setup_request_type.is_applicable(wrapped_tgt.target)
     )
     setups = await MultiGet(
-        Get(PytestPluginSetup, PytestPluginSetupRequest, request(wrapped_tgt.target))  # type: ignore[misc, abstract]
-        for request in applicable_setup_request_types
+        Get(PytestPluginSetup, PytestPluginSetupRequest, setup_request)
+        for setup_request in applicable_setup_requests
     )
     return AllPytestPluginSetups(setups)
 
@@ -133,10 +166,15 @@ async def run_all_setup_plugins(
 # ./pants test <target> -- --html=extra-output/report.html
 _EXTRA_OUTPUT_DIR = "extra-output"
 
+# With `[pytest].share_requirements`, the directory containing each third-party distribution.
+_REQUIREMENTS_DIR = "__requirements"
+
 
 @dataclass(frozen=True)
 class TestSetupRequest:
-    field_set: PythonTestFieldSet
+    """Set up a single Pytest process for one test file, or for a batch of compatible test files."""
+
+    field_sets: Tuple[PythonTestFieldSet, ...]
     is_debug: bool
 
 
@@ -160,17 +198,16 @@ async def setup_pytest_for_target(
     test_extra_env: TestExtraEnv,
     global_options: GlobalOptions,
 ) -> TestSetup:
+    addresses = tuple(field_set.address for field_set in request.field_sets)
     transitive_targets, plugin_setups = await MultiGet(
-        Get(TransitiveTargets, TransitiveTargetsRequest([request.field_set.address])),
-        Get(AllPytestPluginSetups, AllPytestPluginSetupsRequest(request.field_set.address)),
+        Get(TransitiveTargets, TransitiveTargetsRequest(addresses)),
+        Get(AllPytestPluginSetups, AllPytestPluginSetupsRequest(addresses)),
     )
     all_targets = transitive_targets.closure
 
     interpreter_constraints = InterpreterConstraints.create_from_targets(all_targets, python_setup)
 
-    requirements_pex_get = Get(
-        Pex, RequirementsPexRequest([request.field_set.address], internal_only=True)
-    )
+    requirements_pex_get = Get(Pex, RequirementsPexRequest(addresses, internal_only=True))
     pytest_pex_get = Get(
         Pex,
         PexRequest(
@@ -190,10 +227,13 @@ async def setup_pytest_for_target(
 
     # Get the file names for the test_target so that we can specify to Pytest precisely which files
     # to test, rather than using auto-discovery.
-    field_set_source_files_get = Get(SourceFiles, SourceFilesRequest([request.field_set.source]))
+    field_set_source_files_get = Get(
+        SourceFiles, SourceFilesRequest(field_set.source for field_set in request.field_sets)
+    )
 
+    # NB: Batches only contain field sets with the same `extra_env_vars`.
     field_set_extra_env_get = Get(
-        Environment, EnvironmentRequest(request.field_set.extra_env_vars.value or ())
+        Environment, EnvironmentRequest(request.field_sets[0].extra_env_vars.value or ())
     )
 
     (
@@ -215,13 +255,29 @@ async def setup_pytest_for_target(
     local_dists = await Get(
         LocalDistsPex,
         LocalDistsPexRequest(
-            [request.field_set.address],
+            addresses,
             internal_only=True,
             interpreter_constraints=interpreter_constraints,
             sources=prepared_sources,
         ),
     )
 
+    # If requirements are shared, they are put on the `sys.path` rather than being installed into
+    # the runner's venv, so that the venv is the same for every test.
+    requirements_sys_path: Tuple[str, ...] = ()
+    requirements_immutable_input_digests: Dict[str, Digest] = {}
+    if pytest.share_requirements:
+        requirements_dists = await Get(
+            ExtractedPexDistributions, ExtractPexDistributionsRequest(requirements_pex)
+        )
+        requirements_sys_path = requirements_dists.sys_path(_REQUIREMENTS_DIR)
+        requirements_immutable_input_digests = requirements_dists.immutable_input_digests(
+            _REQUIREMENTS_DIR
+        )
+        pex_path = [pytest_pex, local_dists.pex]
+    else:
+        pex_path = [pytest_pex, requirements_pex, local_dists.pex]
+
     pytest_runner_pex_get = Get(
         VenvPex,
         PexRequest(
@@ -229,7 +285,7 @@ async def setup_pytest_for_target(
             interpreter_constraints=interpreter_constraints,
             main=pytest.main,
             internal_only=True,
-            pex_path=[pytest_pex, requirements_pex, local_dists.pex],
+            pex_path=pex_path,
         ),
     )
     config_files_get = Get(
@@ -257,7 +313,7 @@ async def setup_pytest_for_target(
 
     results_file_name = None
     if not request.is_debug:
-        results_file_name = f"{request.field_set.address.path_safe_spec}.xml"
+        results_file_name = f"{addresses[0].path_safe_spec}.xml"
         add_opts.extend(
             (f"--junitxml={results_file_name}", "-o", f"junit_family={pytest.options.junit_family}")
         )
@@ -286,7 +342,7 @@ async def setup_pytest_for_target(
 
     extra_env = {
         "PYTEST_ADDOPTS": " ".join(add_opts),
-        "PEX_EXTRA_SYS_PATH": ":".join(prepared_sources.source_roots),
+        "PEX_EXTRA_SYS_PATH": ":".join((*prepared_sources.source_roots, *requirements_sys_path)),
         **test_extra_env.env,
         # NOTE: field_set_extra_env intentionally after `test_extra_env` to allow overriding within
         # `python_tests`.
@@ -297,6 +353,9 @@ async def setup_pytest_for_target(
     cache_scope = (
         ProcessCacheScope.PER_SESSION if test_subsystem.force else ProcessCacheScope.SUCCESSFUL
     )
+    description = f"Run Pytest for {addresses[0]}"
+    if len(addresses) > 1:
+        description += f" and {pluralize(len(addresses) - 1, 'other test file')}"
     process = await Get(
         Process,
         VenvPexProcess(
@@ -304,11 +363,12 @@ async def setup_pytest_for_target(
             argv=(*pytest.options.args, *coverage_args, *field_set_source_files.files),
             extra_env=extra_env,
             input_digest=input_digest,
+            immutable_input_digests=requirements_immutable_input_digests,
             output_directories=(_EXTRA_OUTPUT_DIR,),
             output_files=output_files,
-            timeout_seconds=request.field_set.timeout.calculate_from_global_options(pytest),
+            timeout_seconds=_timeout_seconds(request.field_sets, pytest),
             execution_slot_variable=pytest.options.execution_slot_var,
-            description=f"Run Pytest for {request.field_set.address}",
+            description=description,
             level=LogLevel.DEBUG,
             cache_scope=cache_scope,
         ),
@@ -316,12 +376,280 @@ async def setup_pytest_for_target(
     return TestSetup(process, results_file_name=results_file_name)
 
 
+def _timeout_seconds(field_sets: Iterable[PythonTestFieldSet], pytest: PyTest) -> Optional[int]:
+    """The timeout for a process running all of the field sets: the sum of their timeouts."""
+    timeouts = [field_set.timeout.calculate_from_global_options(pytest) for field_set in field_sets]
+    if any(timeout is None for timeout in timeouts):
+        return None
+    return sum(cast(int, timeout) for timeout in timeouts)
+
+
+# -----------------------------------------------------------------------------------------
+# Batched execution
+# -----------------------------------------------------------------------------------------
+
+
+def _batch_compatibility_key(tgt: Target, python_setup: PythonSetup) -> Optional[Tuple[Any, ...]]:
+    """Test files may only be batched together if they have the same key, and not at all if they
+    have no key.
+
+    NB: The interpreter constraints of the transitive closure of each test file must also match,
+    which is only checked once a batch is run.
+    """
+    if (
+        not PythonTestFieldSet.is_applicable(tgt)
+        or tgt[PythonTestsBatchCompatibilityTagField].value is None
+    ):
+        return None
+    return (
+        tgt[PythonTestsBatchCompatibilityTagField].value,
+        tgt[PythonResolveField].normalized_value(python_setup),
+        tgt[InterpreterConstraintsField].value_or_global_default(python_setup),
+        tgt[PythonTestsExtraEnvVarsField].value or (),
+    )
+
+
+@dataclass(frozen=True)
+class PytestBatchRequest:
+    field_sets: Tuple[PythonTestFieldSet, ...]
+
+
+@dataclass(frozen=True)
+class PytestBatchResults:
+    """The results of the test files of a `PytestBatchRequest` which could be split out of the
+    batch's results, by address."""
+
+    results: FrozenDict[Address, TestResult]
+
+    def get(self, address: Address) -> Optional[TestResult]:
+        return self.results.get(address)
+
+
+def _junit_testsuite_attrs(testcases: Iterable[ElementTree.Element]) -> Dict[str, str]:
+    tests = failures = errors = skipped = 0
+    time = 0.0
+    for testcase in testcases:
+        tests += 1
+        failures += len(testcase.findall("failure"))
+        errors += len(testcase.findall("error"))
+        skipped += len(testcase.findall("skipped"))
+        time += float(testcase.get("time", 0))
+    return {
+        "tests": str(tests),
+        "failures": str(failures),
+        "errors": str(errors),
+        "skipped": str(skipped),
+        "time": f"{time:.3f}",
+    }
+
+
+def split_junit_xml(content: bytes, files: Iterable[str]) -> Optional[Dict[str, bytes]]:
+    """Split the JUnit XML written by Pytest for several test files into a report per file.
+
+    Pytest derives the `classname` of each test case from its node ID, i.e. from the path of its
+    file relative to the rootdir, so each test case is matched to the file with the longest such
+    path. Only files with at least one test case are included in the result.
+
+    Returns None if any test case cannot be matched to exactly one file.
+    """
+    root = ElementTree.fromstring(content)
+    testsuite = root if root.tag == "testsuite" else root.find("testsuite")
+    if testsuite is None:
+        return None
+
+    # Every possible relative path of each file, as a dotted name: `a.b.c_test`, `b.c_test`, etc.
+    dotted_suffixes: Dict[str, List[str]] = {}
+    for file in files:
+        parts = (file[: -len(".py")] if file.endswith(".py") else file).split("/")
+        dotted_suffixes[file] = [".".join(parts[i:]) for i in range(len(parts))]
+
+    testcases_by_file: Dict[str, List[ElementTree.Element]] = defaultdict(list)
+    for testcase in testsuite.findall("testcase"):
+        classname = testcase.get("classname", "")
+        matches = [
+            (len(suffix), file)
+            for file, suffixes in dotted_suffixes.items()
+            for suffix in suffixes
+            if classname == suffix or classname.startswith(f"{suffix}.")
+        ]
+        if not matches:
+            return None
+        matches.sort(reverse=True)
+        if len(matches) > 1 and matches[0][0] == matches[1][0]:
+            return None
+        testcases_by_file[matches[0][1]].append(testcase)
+
+    result = {}
+    for file, testcases in testcases_by_file.items():
+        file_testsuite = ElementTree.Element(
+            testsuite.tag, {**testsuite.attrib, **_junit_testsuite_attrs(testcases)}
+        )
+        file_testsuite.extend(testsuite.findall("properties"))
+        file_testsuite.extend(testcases)
+        file_root = file_testsuite
+        if root is not testsuite:
+            file_root = ElementTree.Element(root.tag, root.attrib)
+            file_root.append(file_testsuite)
+        output = BytesIO()
+        ElementTree.ElementTree(file_root).write(output, encoding="utf-8", xml_declaration=True)
+        result[file] = output.getvalue()
+    return result
+
+
+def _junit_xml_failed(content: bytes) -> bool:
+    return any(
+        int(testsuite.get("failures", 0)) > 0 or int(testsuite.get("errors", 0)) > 0
+        for testsuite in ElementTree.fromstring(content).iter("testsuite")
+    )
+
+
+@rule(desc="Run Pytest for a batch of test files", level=LogLevel.DEBUG)
+async def run_python_test_batch(
+    request: PytestBatchRequest,
+    test_subsystem: TestSubsystem,
+    python_setup: PythonSetup,
+) -> PytestBatchResults:
+    """Run the test files of a batch in a single Pytest process, and split the results per file.
+
+    Test files whose results cannot be split out of the batch's results are omitted, and callers
+    fall back to running those files on their own. That includes the whole batch if Pytest was
+    interrupted (e.g. by a collection error), so that errors are reported against the file that
+    caused them.
+    """
+    transitive_targets_per_field_set = await MultiGet(
+        Get(TransitiveTargets, TransitiveTargetsRequest([field_set.address]))
+        for field_set in request.field_sets
+    )
+    interpreter_constraints = {
+        InterpreterConstraints.create_from_targets(transitive_targets.closure, python_setup)
+        for transitive_targets in transitive_targets_per_field_set
+    }
+    if len(interpreter_constraints) > 1:
+        logger.debug(
+            f"Not batching {pluralize(len(request.field_sets), 'test file')} with incompatible "
+            "interpreter constraints."
+        )
+        return PytestBatchResults(FrozenDict())
+
+    setup = await Get(TestSetup, TestSetupRequest(request.field_sets, is_debug=False))
+    result = await Get(FallibleProcessResult, Process, setup.process)
+    # Pytest exits with 0 if all tests passed, and 1 if some failed: any other exit code means
+    # that the run was interrupted, or that there were no tests to run.
+    if result.exit_code not in (0, 1) or not setup.results_file_name:
+        return PytestBatchResults(FrozenDict())
+
+    xml_results_digest = await Get(
+        Digest, DigestSubset(result.output_digest, PathGlobs([setup.results_file_name]))
+    )
+    xml_results_digest_contents = await Get(DigestContents, Digest, xml_results_digest)
+    if not xml_results_digest_contents:
+        logger.warning(
+            f"Failed to generate JUnit XML data for the batch containing "
+            f"{request.field_sets[0].address}."
+        )
+        return PytestBatchResults(FrozenDict())
+
+    xml_results_by_file = split_junit_xml(
+        xml_results_digest_contents[0].content,
+        (field_set.source.file_path for field_set in request.field_sets),
+    )
+    if xml_results_by_file is None:
+        return PytestBatchResults(FrozenDict())
+    field_sets = [
+        field_set
+        for field_set in request.field_sets
+        if field_set.source.file_path in xml_results_by_file
+    ]
+    xml_results_snapshots = await MultiGet(
+        Get(
+            Snapshot,
+            CreateDigest(
+                [
+                    FileContent(
+                        f"{field_set.address.path_safe_spec}.xml",
+                        xml_results_by_file[field_set.source.file_path],
+                    )
+                ]
+            ),
+        )
+        for field_set in field_sets
+    )
+
+    # NB: Coverage is measured per process rather than per test file, so each test file is
+    # assigned the coverage data of the whole batch. Since coverage data is combined by union, this
+    # has no effect on the combined report.
+    coverage_snapshot = None
+    if test_subsystem.use_coverage:
+        coverage_snapshot = await Get(
+            Snapshot, DigestSubset(result.output_digest, PathGlobs([".coverage"]))
+        )
+        if coverage_snapshot.files != (".coverage",):
+            logger.warning(
+                f"Failed to generate coverage data for the batch containing "
+                f"{request.field_sets[0].address}."
+            )
+            coverage_snapshot = None
+    extra_output_snapshot = await Get(
+        Snapshot, DigestSubset(result.output_digest, PathGlobs([f"{_EXTRA_OUTPUT_DIR}/**"]))
+    )
+    extra_output_snapshot = await Get(
+        Snapshot, RemovePrefix(extra_output_snapshot.digest, _EXTRA_OUTPUT_DIR)
+    )
+
+    results = {}
+    for field_set, xml_results_snapshot in zip(field_sets, xml_results_snapshots):
+        test_result = TestResult.from_fallible_process_result(
+            result,
+            address=field_set.address,
+            output_setting=test_subsystem.output,
+            coverage_data=(
+                PytestCoverageData(field_set.address, coverage_snapshot.digest)
+                if coverage_snapshot
+                else None
+            ),
+            xml_results=xml_results_snapshot,
+            extra_output=extra_output_snapshot,
+        )
+        failed = _junit_xml_failed(xml_results_by_file[field_set.source.file_path])
+        results[field_set.address] = dataclasses.replace(test_result, exit_code=int(failed))
+    return PytestBatchResults(FrozenDict(results))
+
+
 @rule(desc="Run Pytest", level=LogLevel.DEBUG)
 async def run_python_test(
     field_set: PythonTestFieldSet,
     test_subsystem: TestSubsystem,
+    pytest: PyTest,
+    python_setup: PythonSetup,
 ) -> TestResult:
-    setup = await Get(TestSetup, TestSetupRequest(field_set, is_debug=False))
+    if pytest.batch_size > 1 and field_set.batch_compatibility_tag.value is not None:
+        # Test files are batched with the compatible test files in the same directory. Every test
+        # file in a batch computes the same batch, so the engine runs it once for all of them.
+        sibling_tgts = await Get(
+            Targets, AddressSpecs([SiblingAddresses(field_set.address.spec_path)])
+        )
+        tgt = next((tgt for tgt in sibling_tgts if tgt.address == field_set.address), None)
+        batch_key = _batch_compatibility_key(tgt, python_setup) if tgt else None
+        if batch_key is not None:
+            batch_tgts = partition_containing(
+                (
+                    candidate
+                    for candidate in sibling_tgts
+                    if _batch_compatibility_key(candidate, python_setup) == batch_key
+                ),
+                field_set.address.spec,
+                key=lambda candidate: candidate.address.spec,
+                size_max=pytest.batch_size,
+            )
+            batch = await Get(
+                PytestBatchResults,
+                PytestBatchRequest(tuple(PythonTestFieldSet.create(t) for t in batch_tgts or ())),
+            )
+            test_result = batch.get(field_set.address)
+            if test_result is not None:
+                return test_result
+
+    setup = await Get(TestSetup, TestSetupRequest((field_set,), is_debug=False))
     result = await Get(FallibleProcessResult, Process, setup.process)
 
     coverage_data = None
@@ -360,12 +688,14 @@ async def run_python_test(
 
 @rule(desc="Set up Pytest to run interactively", level=LogLevel.DEBUG)
 async def debug_python_test(field_set: PythonTestFieldSet) -> TestDebugRequest:
-    setup = await Get(TestSetup, TestSetupRequest(field_set, is_debug=True))
-    return TestDebugRequest(
-        InteractiveProcess.from_process(
+    setup = await Get(TestSetup, TestSetupRequest((field_set,), is_debug=True))
+    interactive_process = await Get(
+        InteractiveProcess,
+        InteractiveProcessRequest(
             setup.process, forward_signals_to_process=False, restartable=True
-        )
+        ),
     )
+    return TestDebugRequest(interactive_process)
 
 
 # -----------------------------------------------------------------------------------------
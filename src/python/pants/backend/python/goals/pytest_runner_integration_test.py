@@ -152,7 +152,8 @@ def test_failing(rule_runner: RuleRunner) -> None:
     assert f"{PACKAGE}/tests.py F" in result.stdout
 
 
-def test_dependencies(rule_runner: RuleRunner) -> None:
+@pytest.mark.parametrize("share_requirements", [False, True])
+def test_dependencies(rule_runner: RuleRunner, share_requirements: bool) -> None:
     """Ensure direct and transitive dependencies work."""
     rule_runner.write_files(
         {
@@ -205,7 +206,9 @@ def test_dependencies(rule_runner: RuleRunner) -> None:
     )
 
     tgt = rule_runner.get_target(Address(PACKAGE, relative_file_path="tests.py"))
-    result = run_pytest(rule_runner, tgt)
+    result = run_pytest(
+        rule_runner, tgt, extra_args=[f"--pytest-share-requirements={share_requirements}"]
+    )
     assert result.exit_code == 0
     assert f"{PACKAGE}/tests.py ." in result.stdout
 
@@ -346,6 +349,48 @@ def test_coverage(rule_runner: RuleRunner) -> None:
     assert result.coverage_data is not None
 
 
+def test_batched(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            f"{PACKAGE}/bad_test.py": "def test():\n    assert False\n",
+            f"{PACKAGE}/good_test.py": GOOD_TEST,
+            f"{PACKAGE}/unbatched_test.py": GOOD_TEST,
+            f"{PACKAGE}/BUILD": dedent(
+                """\
+                python_tests(
+                    batch_compatibility_tag="default",
+                    overrides={"unbatched_test.py": {"batch_compatibility_tag": None}},
+                )
+                """
+            ),
+        }
+    )
+
+    def run(file_name: str) -> TestResult:
+        tgt = rule_runner.get_target(Address(PACKAGE, relative_file_path=file_name))
+        # NB: Batches are partitioned stably by address, and this size puts both batchable files
+        # in the same batch.
+        return run_pytest(rule_runner, tgt, extra_args=["--pytest-batch-size=16"])
+
+    bad_result = run("bad_test.py")
+    assert bad_result.exit_code == 1
+    good_result = run("good_test.py")
+    assert good_result.exit_code == 0
+    # Both files were run by the same process, so they share its output, but each has its own
+    # JUnit XML results.
+    assert f"{PACKAGE}/bad_test.py F" in good_result.stdout
+    assert f"{PACKAGE}/good_test.py ." in good_result.stdout
+    assert good_result.xml_results is not None
+    xml_contents = rule_runner.request(DigestContents, [good_result.xml_results.digest])
+    assert len(xml_contents) == 1
+    assert b"bad_test" not in xml_contents[0].content
+    assert b"good_test" in xml_contents[0].content
+
+    unbatched_result = run("unbatched_test.py")
+    assert unbatched_result.exit_code == 0
+    assert f"{PACKAGE}/good_test.py" not in unbatched_result.stdout
+
+
 def test_conftest_dependency_injection(rule_runner: RuleRunner) -> None:
     # See `test_skip_tests` for a test that we properly skip running on conftest.py.
     rule_runner.write_files(
@@ -0,0 +1,52 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+from xml.etree import ElementTree
+
+from pants.backend.python.goals.pytest_runner import split_junit_xml
+
+JUNIT_XML = b"""\
+<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest" errors="0" failures="1" skipped="1" tests="4" time="0.100">
+    <testcase classname="project.foo_test" name="test_a" time="0.010" />
+    <testcase classname="project.sub.foo_test.TestFoo" name="test_b" time="0.020">
+      <failure message="assert False">Traceback</failure>
+    </testcase>
+    <testcase classname="project.foo_test" name="test_c" time="0.030">
+      <skipped message="skipped" />
+    </testcase>
+    <testcase classname="project.sub.foo_test.TestFoo" name="test_d" time="0.040" />
+  </testsuite>
+</testsuites>
+"""
+
+
+def test_split_junit_xml() -> None:
+    result = split_junit_xml(
+        JUNIT_XML,
+        ["src/project/foo_test.py", "src/project/sub/foo_test.py", "src/project/bar_test.py"],
+    )
+    assert result is not None
+    assert set(result) == {"src/project/foo_test.py", "src/project/sub/foo_test.py"}
+
+    def summarize(content: bytes) -> tuple[dict[str, str], list[str]]:
+        testsuite = ElementTree.fromstring(content).find("testsuite")
+        assert testsuite is not None
+        attrs = {k: testsuite.attrib[k] for k in ("tests", "failures", "skipped", "time")}
+        return attrs, [testcase.attrib["name"] for testcase in testsuite.iter("testcase")]
+
+    assert summarize(result["src/project/foo_test.py"]) == (
+        {"tests": "2", "failures": "0", "skipped": "1", "time": "0.040"},
+        ["test_a", "test_c"],
+    )
+    assert summarize(result["src/project/sub/foo_test.py"]) == (
+        {"tests": "2", "failures": "1", "skipped": "0", "time": "0.060"},
+        ["test_b", "test_d"],
+    )
+
+
+def test_split_junit_xml_unmatched() -> None:
+    assert split_junit_xml(JUNIT_XML, ["src/project/foo_test.py"]) is None
@@ -17,6 +17,7 @@ from pants.backend.python.subsystems.python_tool_base import PythonToolBase
 from pants.backend.python.subsystems.setup import PythonSetup
 from pants.backend.python.target_types import (
     ConsoleScript,
+    PythonTestsBatchCompatibilityTagField,
     PythonTestsExtraEnvVarsField,
     PythonTestSourceField,
     PythonTestsTimeoutField,
@@ -50,6 +51,7 @@ class PythonTestFieldSet(TestFieldSet):
     timeout: PythonTestsTimeoutField
     runtime_package_dependencies: RuntimePackageDependenciesField
     extra_env_vars: PythonTestsExtraEnvVarsField
+    batch_compatibility_tag: PythonTestsBatchCompatibilityTagField
 
     @classmethod
     def opt_out(cls, tgt: Target) -> bool:
@@ -107,6 +109,42 @@ class PyTest(PythonToolBase):
             advanced=True,
             help="The maximum timeout (in seconds) that may be used on a `python_tests` target.",
         )
+        register(
+            "--batch-size",
+            type=int,
+            default=1,
+            advanced=True,
+            help=(
+                "The maximum number of test files to run in a single Pytest process.\n\n"
+                "Only test files in the same directory which set the same "
+                "`batch_compatibility_tag` (and which have the same resolve, interpreter "
+                "constraints and `extra_env_vars`) are batched together. Values greater than 1 "
+                "avoid paying the cost of Pytest startup and sandbox setup per file, at the cost "
+                "of re-running the whole batch when one of its files changes.\n\n"
+                "Pass/fail results and JUnit XML are reported per test file. The stdout and "
+                "stderr of the Pytest process, its coverage data and its extra output are shared "
+                "by all of the test files in a batch."
+            ),
+        )
+        register(
+            "--share-requirements",
+            type=bool,
+            default=False,
+            advanced=True,
+            help=(
+                "If true, the third-party requirements of a test are not installed into a "
+                "virtualenv for that test. Instead, each distribution is extracted once, passed "
+                "to test processes as an immutable input, and only the distributions needed by "
+                "the test are put on the `sys.path`.\n\n"
+                "This means that the virtualenv used to run Pytest is shared by all tests with the "
+                "same interpreter constraints, rather than being created for each distinct subset "
+                "of the lockfile, which is much faster when there are many test files with "
+                "different requirements. Cached test results still only depend on the "
+                "requirements of each test.\n\n"
+                "Distributions which rely on `.pth` files to work may not be importable in this "
+                "mode."
+            ),
+        )
         register(
             "--junit-family",
             type=str,
@@ -156,6 +194,14 @@ class PyTest(PythonToolBase):
     def timeout_maximum(self) -> int | None:
         return cast("int | None", self.options.timeout_maximum)
 
+    @property
+    def share_requirements(self) -> bool:
+        return cast(bool, self.options.share_requirements)
+
+    @property
+    def batch_size(self) -> int:
+        return cast(int, self.options.batch_size)
+
     def config_request(self, dirs: Iterable[str]) -> ConfigFilesRequest:
         # Refer to https://docs.pytest.org/en/stable/customize.html#finding-the-rootdir for how
         # config files are discovered.
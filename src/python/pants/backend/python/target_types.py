@@ -681,12 +681,27 @@ class SkipPythonTestsField(BoolField):
     help = "If true, don't run this target's tests."
 
 
+class PythonTestsBatchCompatibilityTagField(StringField):
+    alias = "batch_compatibility_tag"
+    help = (
+        "An arbitrary value used to mark the test files belonging to this target as valid for "
+        "batched execution.\n\n"
+        "If `[pytest].batch_size` is greater than 1, test files in the same directory which set "
+        "the same tag, and which also have the same resolve, interpreter constraints and "
+        "`extra_env_vars`, may be run together in a single Pytest process. If unset, the test "
+        "files are always run in their own process.\n\n"
+        "Only set the same tag on tests that don't interfere with one another, e.g. through "
+        "global state or fixtures with side effects."
+    )
+
+
 _PYTHON_TEST_MOVED_FIELDS = (
     *COMMON_TARGET_FIELDS,
     PythonResolveField,
     PythonTestsTimeoutField,
     RuntimePackageDependenciesField,
     PythonTestsExtraEnvVarsField,
+    PythonTestsBatchCompatibilityTagField,
     SkipPythonTestsField,
 )
 
@@ -41,6 +41,8 @@ from pants.backend.python.util_rules.pex_requirements import (
 )
 from pants.backend.python.util_rules.pex_requirements import maybe_validate_metadata
 from pants.core.target_types import FileSourceField
+from pants.core.util_rules import archive
+from pants.core.util_rules.archive import ExtractedArchive
 from pants.core.util_rules.system_binaries import BashBinary
 from pants.engine.addresses import UnparsedAddressInputs
 from pants.engine.collection import Collection, DeduplicatedCollection
@@ -51,7 +53,9 @@ from pants.engine.fs import (
     CreateDigest,
     Digest,
     DigestContents,
+    DigestEntries,
     FileContent,
+    FileEntry,
     GlobMatchErrorBehavior,
     MergeDigests,
     PathGlobs,
@@ -924,6 +928,8 @@ class VenvPexProcess:
     execution_slot_variable: str | None
     concurrency_available: int
     cache_scope: ProcessCacheScope
+    append_only_caches: FrozenDict[str, str]
+    immutable_input_digests: FrozenDict[str, Digest]
 
     def __init__(
         self,
@@ -941,6 +947,8 @@ class VenvPexProcess:
         execution_slot_variable: str | None = None,
         concurrency_available: int = 0,
         cache_scope: ProcessCacheScope = ProcessCacheScope.SUCCESSFUL,
+        append_only_caches: Mapping[str, str] | None = None,
+        immutable_input_digests: Mapping[str, Digest] | None = None,
     ) -> None:
         self.venv_pex = venv_pex
         self.argv = tuple(argv)
@@ -955,6 +963,8 @@ class VenvPexProcess:
         self.execution_slot_variable = execution_slot_variable
         self.concurrency_available = concurrency_available
         self.cache_scope = cache_scope
+        self.append_only_caches = FrozenDict(append_only_caches or {})
+        self.immutable_input_digests = FrozenDict(immutable_input_digests or {})
 
 
 @rule
@@ -982,9 +992,13 @@ async def setup_venv_pex_process(
         env=request.extra_env,
         output_files=request.output_files,
         output_directories=request.output_directories,
-        append_only_caches=pex_environment.in_sandbox(
-            working_directory=request.working_directory
-        ).append_only_caches,
+        append_only_caches={
+            **pex_environment.in_sandbox(
+                working_directory=request.working_directory
+            ).append_only_caches,
+            **request.append_only_caches,
+        },
+        immutable_input_digests=request.immutable_input_digests,
         timeout_seconds=request.timeout_seconds,
         execution_slot_variable=request.execution_slot_variable,
         concurrency_available=request.concurrency_available,
@@ -992,6 +1006,58 @@ async def setup_venv_pex_process(
     )
 
 
+@dataclass(frozen=True)
+class ExtractPexDistributionsRequest:
+    """Extract each of the distributions of a `packed` layout PEX, such as an internal-only PEX."""
+
+    pex: Pex
+
+
+@dataclass(frozen=True)
+class ExtractedPexDistributions:
+    """The distributions of a PEX, each extracted to a directory which can be put on `sys.path`.
+
+    Every distribution has its own digest, keyed by its wheel name, so a distribution shared by
+    many PEXes is only extracted once, and can be passed to processes as an immutable input.
+    """
+
+    digests: FrozenDict[str, Digest]
+
+    def immutable_input_digests(self, prefix: str) -> dict[str, Digest]:
+        return {os.path.join(prefix, name): digest for name, digest in self.digests.items()}
+
+    def sys_path(self, prefix: str) -> tuple[str, ...]:
+        return tuple(os.path.join(prefix, name) for name in sorted(self.digests))
+
+
+@rule(level=LogLevel.DEBUG)
+async def extract_pex_distributions(
+    request: ExtractPexDistributionsRequest,
+) -> ExtractedPexDistributions:
+    deps_dir = os.path.join(request.pex.name, ".deps")
+    digest_entries = await Get(DigestEntries, Digest, request.pex.digest)
+    dist_entries = [
+        entry
+        for entry in digest_entries
+        if isinstance(entry, FileEntry) and os.path.dirname(entry.path) == deps_dir
+    ]
+    # NB: Each distribution is an installed wheel chroot zipped up by Pex. We rename it so that it
+    # is recognized as an archive, and so that the extraction is only keyed by its content.
+    archive_digests = await MultiGet(
+        Get(Digest, CreateDigest([FileEntry("distribution.zip", entry.file_digest)]))
+        for entry in dist_entries
+    )
+    extracted_archives = await MultiGet(
+        Get(ExtractedArchive, Digest, archive_digest) for archive_digest in archive_digests
+    )
+    return ExtractedPexDistributions(
+        FrozenDict(
+            (os.path.basename(entry.path), extracted_archive.digest)
+            for entry, extracted_archive in zip(dist_entries, extracted_archives)
+        )
+    )
+
+
 @dataclass(frozen=True)
 class PexDistributionInfo:
     """Information about an individual distribution in a PEX file, as reported by `PEX_TOOLS=1
@@ -1064,4 +1130,4 @@ async def determine_pex_resolve_info(pex_pex: PexPEX, pex: Pex) -> PexResolveInf
 
 
 def rules():
-    return [*collect_rules(), *pex_cli.rules()]
+    return [*collect_rules(), *pex_cli.rules(), *archive.rules()]
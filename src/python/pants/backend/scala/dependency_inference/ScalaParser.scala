@@ -376,16 +376,23 @@ object ScalaParser {
     analysisTraverser.toAnalysis
   }
 
+  // Arguments are pairs of `outputPath sourcePath`, so that a single JVM can analyze a batch of
+  // sources.
   def main(args: Array[String]): Unit = {
-    val outputPath = java.nio.file.Paths.get(args(0))
-    val analysis = analyze(args(1))
-
-    val json = analysis.asJson.noSpaces
-    java.nio.file.Files.write(
-      outputPath,
-      json.getBytes(),
-      java.nio.file.StandardOpenOption.CREATE_NEW,
-      java.nio.file.StandardOpenOption.WRITE
-    )
+    if (args.length % 2 != 0) {
+      throw new IllegalArgumentException("Expected pairs of `outputPath sourcePath` arguments.")
+    }
+    args.grouped(2).foreach { case Array(outputPathStr, sourcePath) =>
+      val outputPath = java.nio.file.Paths.get(outputPathStr)
+      val analysis = analyze(sourcePath)
+
+      val json = analysis.asJson.noSpaces
+      java.nio.file.Files.write(
+        outputPath,
+        json.getBytes(),
+        java.nio.file.StandardOpenOption.CREATE_NEW,
+        java.nio.file.StandardOpenOption.WRITE
+      )
+    }
   }
 }
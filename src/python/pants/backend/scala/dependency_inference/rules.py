@@ -10,7 +10,10 @@ from pants.backend.scala.compile.scalac_plugins import (
     ScalaPluginTargetsForTarget,
 )
 from pants.backend.scala.dependency_inference import scala_parser, symbol_mapper
-from pants.backend.scala.dependency_inference.scala_parser import ScalaSourceDependencyAnalysis
+from pants.backend.scala.dependency_inference.scala_parser import (
+    BatchedScalaSourceDependencyAnalysisRequest,
+    ScalaSourceDependencyAnalysis,
+)
 from pants.backend.scala.resolve.lockfile import (
     SCALA_LIBRARY_ARTIFACT,
     SCALA_LIBRARY_GROUP,
@@ -21,7 +24,6 @@ from pants.backend.scala.subsystems.scala import ScalaSubsystem
 from pants.backend.scala.subsystems.scala_infer import ScalaInferSubsystem
 from pants.backend.scala.target_types import ScalaDependenciesField, ScalaSourceField
 from pants.build_graph.address import Address
-from pants.core.util_rules.source_files import SourceFilesRequest
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import (
     Dependencies,
@@ -66,7 +68,12 @@ async def infer_scala_dependencies_via_source_analysis(
     tgt = wrapped_tgt.target
     explicitly_provided_deps, analysis = await MultiGet(
         Get(ExplicitlyProvidedDependencies, DependenciesRequest(tgt[Dependencies])),
-        Get(ScalaSourceDependencyAnalysis, SourceFilesRequest([request.sources_field])),
+        Get(
+            ScalaSourceDependencyAnalysis,
+            BatchedScalaSourceDependencyAnalysisRequest(
+                request.sources_field, batch_size=scala_infer_subsystem.parser_batch_size
+            ),
+        ),
     )
 
     symbols: OrderedSet[str] = OrderedSet()
@@ -9,7 +9,9 @@ import pkgutil
 from dataclasses import dataclass
 from typing import Any, Iterator, Mapping
 
-from pants.core.util_rules.source_files import SourceFiles
+from pants.backend.scala.target_types import ScalaSourceField
+from pants.base.specs import AddressSpecs, SiblingAddresses
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
 from pants.engine.fs import (
     AddPrefix,
     CreateDigest,
@@ -23,11 +25,18 @@ from pants.engine.fs import (
 from pants.engine.internals.selectors import Get, MultiGet
 from pants.engine.process import FallibleProcessResult, ProcessExecutionFailure, ProcessResult
 from pants.engine.rules import collect_rules, rule
+from pants.engine.target import Targets
 from pants.jvm.compile import ClasspathEntry
+from pants.jvm.dependency_inference import batched_source_analysis
+from pants.jvm.dependency_inference.batched_source_analysis import (
+    SourceAnalysisBatch,
+    SourceAnalysisBatchRequest,
+)
 from pants.jvm.jdk_rules import InternalJdk, JvmProcess
 from pants.jvm.resolve.common import ArtifactRequirements, Coordinate
 from pants.jvm.resolve.coursier_fetch import ToolClasspath, ToolClasspathRequest
 from pants.option.global_options import ProcessCleanupOption
+from pants.util.collections import partition_containing
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import FrozenOrderedSet
@@ -282,6 +291,51 @@ async def resolve_fallible_result_to_analysis(
     )
 
 
+@dataclass(frozen=True)
+class BatchedScalaSourceDependencyAnalysisRequest:
+    """Analyze a single Scala source as part of a batch of its sibling sources.
+
+    The batch is formed by stably partitioning the Scala sources living in the same directory into
+    batches of at most `batch_size` files. Every file in a batch resolves to the same
+    `SourceAnalysisBatchRequest`, so the engine only starts one JVM per batch.
+    """
+
+    source: ScalaSourceField
+    batch_size: int
+
+
+@rule(level=LogLevel.DEBUG)
+async def analyze_scala_source_dependencies_in_batch(
+    request: BatchedScalaSourceDependencyAnalysisRequest,
+    processor_classfiles: ScalaParserCompiledClassfiles,
+) -> ScalaSourceDependencyAnalysis:
+    address = request.source.address
+    if request.batch_size > 1:
+        sibling_targets = await Get(Targets, AddressSpecs([SiblingAddresses(address.spec_path)]))
+        batch_sources = partition_containing(
+            (tgt[ScalaSourceField] for tgt in sibling_targets if tgt.has_field(ScalaSourceField)),
+            address.spec,
+            key=lambda field: field.address.spec,
+            size_max=request.batch_size,
+        )
+        if batch_sources:
+            batch = await Get(
+                SourceAnalysisBatch,
+                SourceAnalysisBatchRequest(
+                    tuple(batch_sources),
+                    main="org.pantsbuild.backend.scala.dependency_inference.ScalaParser",
+                    artifact_requirements=SCALA_PARSER_ARTIFACT_REQUIREMENTS,
+                    analyzer_classfiles=processor_classfiles.digest,
+                    source_description="Scala file",
+                ),
+            )
+            analysis = batch.get(address)
+            if analysis is not None:
+                return ScalaSourceDependencyAnalysis.from_json_dict(json.loads(analysis))
+
+    return await Get(ScalaSourceDependencyAnalysis, SourceFilesRequest([request.source]))
+
+
 # TODO(13879): Consolidate compilation of wrapper binaries to common rules.
 @rule
 async def setup_scala_parser_classfiles(jdk: InternalJdk) -> ScalaParserCompiledClassfiles:
@@ -371,4 +425,7 @@ async def setup_scala_parser_classfiles(jdk: InternalJdk) -> ScalaParserCompiled
 
 
 def rules():
-    return collect_rules()
+    return [
+        *collect_rules(),
+        *batched_source_analysis.rules(),
+    ]
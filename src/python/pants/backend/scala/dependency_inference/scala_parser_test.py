@@ -7,6 +7,7 @@ import pytest
 from pants.backend.scala import target_types
 from pants.backend.scala.dependency_inference import scala_parser
 from pants.backend.scala.dependency_inference.scala_parser import (
+    BatchedScalaSourceDependencyAnalysisRequest,
     ScalaImport,
     ScalaSourceDependencyAnalysis,
 )
@@ -35,6 +36,9 @@ def rule_runner() -> RuleRunner:
             *jvm_util_rules.rules(),
             QueryRule(SourceFiles, (SourceFilesRequest,)),
             QueryRule(ScalaSourceDependencyAnalysis, (SourceFiles,)),
+            QueryRule(
+                ScalaSourceDependencyAnalysis, (BatchedScalaSourceDependencyAnalysisRequest,)
+            ),
         ],
         target_types=[ScalaSourceTarget],
     )
@@ -419,3 +423,32 @@ def test_extract_annotations(rule_runner: RuleRunner) -> None:
         "foo.valAnnotation",
         "foo.varAnnotation",
     ]
+
+
+def test_parser_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "BUILD": textwrap.dedent(
+                """\
+                scala_source(name="a", source="A.scala")
+                scala_source(name="b", source="B.scala")
+                scala_source(name="c", source="C.scala")
+                """
+            ),
+            "A.scala": "package a\nimport b.B\nclass A",
+            "B.scala": "package b\nclass B",
+            "C.scala": "package c\nobject C",
+        }
+    )
+
+    def analyze(name: str, batch_size: int) -> ScalaSourceDependencyAnalysis:
+        target = rule_runner.get_target(Address("", target_name=name))
+        return rule_runner.request(
+            ScalaSourceDependencyAnalysis,
+            [BatchedScalaSourceDependencyAnalysisRequest(target[ScalaSourceField], batch_size)],
+        )
+
+    for name in ("a", "b", "c"):
+        assert analyze(name, batch_size=2) == analyze(name, batch_size=1)
+    assert list(analyze("a", batch_size=2).all_imports()) == ["b.B"]
+    assert analyze("c", batch_size=2).provided_symbols == FrozenOrderedSet(["c.C"])
@@ -2,9 +2,12 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 from __future__ import annotations
 
-from pants.backend.scala.dependency_inference.scala_parser import ScalaSourceDependencyAnalysis
+from pants.backend.scala.dependency_inference.scala_parser import (
+    BatchedScalaSourceDependencyAnalysisRequest,
+    ScalaSourceDependencyAnalysis,
+)
+from pants.backend.scala.subsystems.scala_infer import ScalaInferSubsystem
 from pants.backend.scala.target_types import ScalaSourceField
-from pants.core.util_rules.source_files import SourceFilesRequest
 from pants.engine.internals.selectors import Get, MultiGet
 from pants.engine.rules import collect_rules, rule
 from pants.engine.target import AllTargets, Targets
@@ -36,9 +39,15 @@ async def map_first_party_scala_targets_to_symbols(
     _: FirstPartyScalaTargetsMappingRequest,
     scala_targets: AllScalaTargets,
     jvm: JvmSubsystem,
+    scala_infer_subsystem: ScalaInferSubsystem,
 ) -> SymbolMap:
     source_analysis = await MultiGet(
-        Get(ScalaSourceDependencyAnalysis, SourceFilesRequest([target[ScalaSourceField]]))
+        Get(
+            ScalaSourceDependencyAnalysis,
+            BatchedScalaSourceDependencyAnalysisRequest(
+                target[ScalaSourceField], batch_size=scala_infer_subsystem.parser_batch_size
+            ),
+        )
         for target in scala_targets
     )
     address_and_analysis = zip(
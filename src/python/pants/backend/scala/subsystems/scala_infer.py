@@ -1,7 +1,7 @@
 # Copyright 2021 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from pants.option.option_types import BoolOption
+from pants.option.option_types import BoolOption, IntOption
 from pants.option.subsystem import Subsystem
 
 
@@ -19,3 +19,16 @@ class ScalaInferSubsystem(Subsystem):
         default=True,
         help=("Infer a target's dependencies by parsing consumed types from sources."),
     )
+    parser_batch_size = IntOption(
+        "--parser-batch-size",
+        default=1,
+        advanced=True,
+        help=(
+            "The maximum number of Scala files from the same directory to analyze for dependency "
+            "inference in a single JVM process.\n\n"
+            "Values greater than 1 amortize JVM startup and warmup over many files, which speeds "
+            "up cold dependency inference. Editing a file re-analyzes the rest of its batch. If a "
+            "batch fails, its files are analyzed individually so that the error is attributed to "
+            "the right file."
+        ),
+    )
@@ -5,18 +5,20 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict
+from typing import DefaultDict, Iterable
 
 from pants.backend.shell.lint.shellcheck.subsystem import Shellcheck
 from pants.backend.shell.shell_setup import ShellSetup
 from pants.backend.shell.target_types import ShellSourceField
+from pants.base.specs import AddressSpecs, SiblingAddresses
 from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
 from pants.engine.addresses import Address
 from pants.engine.collection import DeduplicatedCollection
-from pants.engine.fs import Digest, MergeDigests
+from pants.engine.fs import AddPrefix, Digest, MergeDigests
 from pants.engine.platform import Platform
 from pants.engine.process import FallibleProcessResult, Process, ProcessCacheScope
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -33,9 +35,11 @@ from pants.engine.target import (
     WrappedTarget,
 )
 from pants.engine.unions import UnionRule
+from pants.util.collections import partition_containing
 from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import OrderedSet
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger(__name__)
 
@@ -90,49 +94,75 @@ class ParseShellImportsRequest:
     fp: str
 
 
-PATH_FROM_SHELLCHECK_ERROR = re.compile(r"Not following: (.+) was not specified as input")
+@dataclass(frozen=True)
+class ParseShellImportsBatchRequest:
+    """Parse the imports of many Shell files with a single Shellcheck process."""
 
+    requests: tuple[ParseShellImportsRequest, ...]
 
-@rule
-async def parse_shell_imports(
-    request: ParseShellImportsRequest, shellcheck: Shellcheck
-) -> ParsedShellImports:
-    # We use Shellcheck to parse for us by running it against each file in isolation, which means
-    # that all `source` statements will error. Then, we can extract the problematic paths from the
-    # JSON output.
-    downloaded_shellcheck = await Get(
-        DownloadedExternalTool, ExternalToolRequest, shellcheck.get_request(Platform.current)
-    )
-    input_digest = await Get(Digest, MergeDigests([request.digest, downloaded_shellcheck.digest]))
-    process_result = await Get(
-        FallibleProcessResult,
-        Process(
-            # NB: We do not load up `[shellcheck].{args,config}` because it would risk breaking
-            # determinism of dependency inference in an unexpected way.
-            [downloaded_shellcheck.exe, "--format=json", request.fp],
-            input_digest=input_digest,
-            description=f"Detect Shell imports for {request.fp}",
-            level=LogLevel.DEBUG,
-            # We expect this to always fail, but it should still be cached because the process is
-            # deterministic.
-            cache_scope=ProcessCacheScope.ALWAYS,
-        ),
+
+class ParsedShellImportsBatch(FrozenDict[str, ParsedShellImports]):
+    """The imports of each Shell file in a batch, keyed by its path."""
+
+
+@dataclass(frozen=True)
+class BatchedParseShellImportsRequest:
+    """Parse the imports of a single file as part of a batch of its sibling files.
+
+    The batch is formed by stably partitioning the Shell targets living in the same directory into
+    batches of at most `batch_size` files. Every file in a batch resolves to the same
+    `ParseShellImportsBatchRequest`, so the engine only runs one Shellcheck process per batch.
+    """
+
+    address: Address
+    request: ParseShellImportsRequest
+    batch_size: int
+
+
+PATH_FROM_SHELLCHECK_ERROR = re.compile(r"Not following: (.+) was not specified as input")
+
+# Each file of a batch is placed in its own directory, so that a file `source`ing another file of
+# the same batch still results in an SC1091 error, rather than Shellcheck following the import.
+_BATCH_DIR = "__shellcheck_batch"
+
+
+def _shellcheck_process(
+    shellcheck: DownloadedExternalTool, input_digest: Digest, fps: Iterable[str], description: str
+) -> Process:
+    return Process(
+        # NB: We do not load up `[shellcheck].{args,config}` because it would risk breaking
+        # determinism of dependency inference in an unexpected way.
+        [shellcheck.exe, "--format=json", *fps],
+        input_digest=input_digest,
+        description=description,
+        level=LogLevel.DEBUG,
+        # We expect this to always fail, but it should still be cached because the process is
+        # deterministic.
+        cache_scope=ProcessCacheScope.ALWAYS,
     )
 
+
+def _load_shellcheck_output(
+    process_result: FallibleProcessResult, description: str, shellcheck: Shellcheck
+) -> list[dict] | None:
     try:
-        output = json.loads(process_result.stdout)
+        return json.loads(process_result.stdout)  # type: ignore[no-any-return]
     except json.JSONDecodeError:
         logger.error(
-            f"Parsing {request.fp} for dependency inference failed because Shellcheck's output "
+            f"Parsing {description} for dependency inference failed because Shellcheck's output "
             f"could not be loaded as JSON. Please open a GitHub issue at "
             f"https://github.com/pantsbuild/pants/issues/new with this error message attached.\n\n"
             f"\nshellcheck version: {shellcheck.version}\n"
             f"process_result.stdout: {process_result.stdout.decode()}"
         )
-        return ParsedShellImports()
+        return None
+
 
+def _parse_shellcheck_errors(
+    errors: Iterable[dict], fp: str, shellcheck: Shellcheck
+) -> ParsedShellImports:
     paths = set()
-    for error in output:
+    for error in errors:
         if not error.get("code", "") == 1091:
             continue
         msg = error.get("message", "")
@@ -141,7 +171,7 @@ async def parse_shell_imports(
             paths.add(matches.group(1))
         else:
             logger.error(
-                f"Parsing {request.fp} for dependency inference failed because Shellcheck's error "
+                f"Parsing {fp} for dependency inference failed because Shellcheck's error "
                 f"message was not in the expected format. Please open a GitHub issue at "
                 f"https://github.com/pantsbuild/pants/issues/new with this error message "
                 f"attached.\n\n\nshellcheck version: {shellcheck.version}\n"
@@ -150,6 +180,112 @@ async def parse_shell_imports(
     return ParsedShellImports(paths)
 
 
+@rule
+async def parse_shell_imports(
+    request: ParseShellImportsRequest, shellcheck: Shellcheck
+) -> ParsedShellImports:
+    # We use Shellcheck to parse for us by running it against each file in isolation, which means
+    # that all `source` statements will error. Then, we can extract the problematic paths from the
+    # JSON output.
+    downloaded_shellcheck = await Get(
+        DownloadedExternalTool, ExternalToolRequest, shellcheck.get_request(Platform.current)
+    )
+    input_digest = await Get(Digest, MergeDigests([request.digest, downloaded_shellcheck.digest]))
+    process_result = await Get(
+        FallibleProcessResult,
+        Process,
+        _shellcheck_process(
+            downloaded_shellcheck,
+            input_digest,
+            [request.fp],
+            description=f"Detect Shell imports for {request.fp}",
+        ),
+    )
+    output = _load_shellcheck_output(process_result, request.fp, shellcheck)
+    if output is None:
+        return ParsedShellImports()
+    return _parse_shellcheck_errors(output, request.fp, shellcheck)
+
+
+@rule
+async def parse_shell_imports_batch(
+    request: ParseShellImportsBatchRequest, shellcheck: Shellcheck
+) -> ParsedShellImportsBatch:
+    if not request.requests:
+        return ParsedShellImportsBatch()
+
+    downloaded_shellcheck = await Get(
+        DownloadedExternalTool, ExternalToolRequest, shellcheck.get_request(Platform.current)
+    )
+    prefixed_digests = await MultiGet(
+        Get(Digest, AddPrefix(file_request.digest, os.path.join(_BATCH_DIR, str(i))))
+        for i, file_request in enumerate(request.requests)
+    )
+    input_digest = await Get(
+        Digest, MergeDigests([*prefixed_digests, downloaded_shellcheck.digest])
+    )
+    prefixed_fps = {
+        os.path.join(_BATCH_DIR, str(i), file_request.fp): file_request.fp
+        for i, file_request in enumerate(request.requests)
+    }
+    description = f"Detect Shell imports for {pluralize(len(prefixed_fps), 'file')}"
+    process_result = await Get(
+        FallibleProcessResult,
+        Process,
+        _shellcheck_process(downloaded_shellcheck, input_digest, prefixed_fps, description),
+    )
+    output = _load_shellcheck_output(process_result, ", ".join(prefixed_fps.values()), shellcheck)
+    if output is None:
+        return ParsedShellImportsBatch(
+            (fp, ParsedShellImports()) for fp in sorted(prefixed_fps.values())
+        )
+
+    errors_by_file: DefaultDict[str, list[dict]] = defaultdict(list)
+    for error in output:
+        errors_by_file[error.get("file", "")].append(error)
+    return ParsedShellImportsBatch(
+        (fp, _parse_shellcheck_errors(errors_by_file[prefixed_fp], fp, shellcheck))
+        for prefixed_fp, fp in sorted(prefixed_fps.items(), key=lambda item: item[1])
+    )
+
+
+@rule
+async def parse_shell_imports_in_batch(
+    request: BatchedParseShellImportsRequest,
+) -> ParsedShellImports:
+    if request.batch_size <= 1:
+        return await Get(ParsedShellImports, ParseShellImportsRequest, request.request)
+
+    sibling_targets = await Get(
+        Targets, AddressSpecs([SiblingAddresses(request.address.spec_path)])
+    )
+    batch_fields = partition_containing(
+        (tgt[ShellSourceField] for tgt in sibling_targets if tgt.has_field(ShellSourceField)),
+        request.address.spec,
+        key=lambda field: field.address.spec,
+        size_max=request.batch_size,
+    )
+    if not batch_fields:
+        return await Get(ParsedShellImports, ParseShellImportsRequest, request.request)
+
+    all_hydrated_sources = await MultiGet(
+        Get(HydratedSources, HydrateSourcesRequest(field)) for field in batch_fields
+    )
+    batch = await Get(
+        ParsedShellImportsBatch,
+        ParseShellImportsBatchRequest(
+            tuple(
+                ParseShellImportsRequest(
+                    hydrated_sources.snapshot.digest, hydrated_sources.snapshot.files[0]
+                )
+                for hydrated_sources in all_hydrated_sources
+                if len(hydrated_sources.snapshot.files) == 1
+            )
+        ),
+    )
+    return batch[request.request.fp]
+
+
 class InferShellDependencies(InferDependenciesRequest):
     infer_from = ShellSourceField
 
@@ -171,8 +307,12 @@ async def infer_shell_dependencies(
 
     detected_imports = await Get(
         ParsedShellImports,
-        ParseShellImportsRequest(
-            hydrated_sources.snapshot.digest, hydrated_sources.snapshot.files[0]
+        BatchedParseShellImportsRequest(
+            address,
+            ParseShellImportsRequest(
+                hydrated_sources.snapshot.digest, hydrated_sources.snapshot.files[0]
+            ),
+            batch_size=shell_setup.dependency_inference_batch_size,
         ),
     )
     result: OrderedSet[Address] = OrderedSet()
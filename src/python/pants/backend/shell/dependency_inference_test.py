@@ -11,6 +11,8 @@ from pants.backend.shell import dependency_inference
 from pants.backend.shell.dependency_inference import (
     InferShellDependencies,
     ParsedShellImports,
+    ParsedShellImportsBatch,
+    ParseShellImportsBatchRequest,
     ParseShellImportsRequest,
     ShellMapping,
 )
@@ -32,6 +34,7 @@ def rule_runner() -> RuleRunner:
             *target_types_rules(),
             QueryRule(ShellMapping, []),
             QueryRule(ParsedShellImports, [ParseShellImportsRequest]),
+            QueryRule(ParsedShellImportsBatch, [ParseShellImportsBatchRequest]),
             QueryRule(InferredDependencies, [InferShellDependencies]),
         ],
         target_types=[ShellSourcesGeneratorTarget],
@@ -148,3 +151,55 @@ def test_dependency_inference(rule_runner: RuleRunner, caplog) -> None:
     assert "The target ambiguous/main.sh:main sources `ambiguous/dep.sh`" in caplog.text
     assert "['ambiguous/dep.sh:dep1', 'ambiguous/dep.sh:dep2']" in caplog.text
     assert "disambiguated.sh" not in caplog.text
+
+
+def test_parse_imports_batch(rule_runner: RuleRunner) -> None:
+    files = {
+        "subdir/f1.sh": "source subdir/f2.sh\nsource a/b.sh",
+        "subdir/f2.sh": "",
+        "subdir/f3.sh": ". subdir/f1.sh",
+    }
+    snapshots = {fp: rule_runner.make_snapshot({fp: content}) for fp, content in files.items()}
+    result = rule_runner.request(
+        ParsedShellImportsBatch,
+        [
+            ParseShellImportsBatchRequest(
+                tuple(
+                    ParseShellImportsRequest(snapshot.digest, fp)
+                    for fp, snapshot in snapshots.items()
+                )
+            )
+        ],
+    )
+    # Files of the same batch which `source` one another must still be detected.
+    assert {fp: set(imports) for fp, imports in result.items()} == {
+        "subdir/f1.sh": {"subdir/f2.sh", "a/b.sh"},
+        "subdir/f2.sh": set(),
+        "subdir/f3.sh": {"subdir/f1.sh"},
+    }
+
+
+def test_dependency_inference_batched(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(["--shell-setup-dependency-inference-batch-size=2"])
+    rule_runner.write_files(
+        {
+            "a/f1.sh": "source a/f2.sh",
+            "a/f2.sh": "source a/f3.sh",
+            "a/f3.sh": "source b/f.sh",
+            "a/BUILD": "shell_sources()",
+            "b/f.sh": "",
+            "b/BUILD": "shell_sources()",
+        }
+    )
+
+    def run_dep_inference(address: Address) -> InferredDependencies:
+        tgt = rule_runner.get_target(address)
+        return rule_runner.request(
+            InferredDependencies, [InferShellDependencies(tgt[ShellSourceField])]
+        )
+
+    for name, expected in (("f1.sh", "a/f2.sh"), ("f2.sh", "a/f3.sh"), ("f3.sh", "b/f.sh")):
+        dep_dir, dep_name = expected.split("/")
+        assert run_dep_inference(Address("a", relative_file_path=name)) == InferredDependencies(
+            [Address(dep_dir, relative_file_path=dep_name)]
+        )
@@ -2,6 +2,9 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import pkgutil
 from dataclasses import dataclass
 from pathlib import PurePath
@@ -14,8 +17,10 @@ from pants.backend.python.util_rules.pex import PexRequest, VenvPex, VenvPexProc
 from pants.backend.terraform.target_types import TerraformModuleSourcesField
 from pants.base.specs import AddressSpecs, MaybeEmptySiblingAddresses
 from pants.core.goals.generate_lockfiles import GenerateToolLockfileSentinel
-from pants.engine.fs import CreateDigest, Digest, FileContent
-from pants.engine.internals.selectors import Get
+from pants.engine.addresses import Address
+from pants.engine.collection import DeduplicatedCollection
+from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests, PathGlobs, Paths
+from pants.engine.internals.selectors import Get, MultiGet
 from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import collect_rules, rule
 from pants.engine.target import (
@@ -26,8 +31,12 @@ from pants.engine.target import (
     Targets,
 )
 from pants.engine.unions import UnionRule
+from pants.option.option_types import IntOption
+from pants.util.collections import partition_containing
 from pants.util.docutil import git_url
+from pants.util.logging import LogLevel
 from pants.util.ordered_set import OrderedSet
+from pants.util.strutil import pluralize
 
 
 class TerraformHcl2Parser(PythonToolRequirementsBase):
@@ -44,6 +53,24 @@ class TerraformHcl2Parser(PythonToolRequirementsBase):
     default_lockfile_path = "src/python/pants/backend/terraform/hcl2_lockfile.txt"
     default_lockfile_url = git_url(default_lockfile_path)
 
+    batch_size = IntOption(
+        "--batch-size",
+        default=1,
+        help=(
+            "The maximum number of `terraform_module` targets to parse for module sources in a "
+            "single parser process.\n\n"
+            "A `terraform_module` target is batched with the other `terraform_module` targets in "
+            "its directory and in the sibling directories with `.tf` files (e.g. `tf/app` with "
+            "`tf/db`, but not with `tf/db/nested`). A module in the build root is only batched "
+            "with the other modules declared in the root BUILD file.\n\n"
+            "Batch boundaries are derived from the addresses of the targets, so that adding or "
+            "removing a module usually only changes the batch that it belongs to.\n\n"
+            "Each parsed file is also cached by its content in a named cache, so editing one "
+            "module only re-parses that module's files, even though its whole batch re-runs."
+        ),
+        advanced=True,
+    )
+
 
 class TerraformHcl2ParserLockfileSentinel(GenerateToolLockfileSentinel):
     resolve_name = TerraformHcl2Parser.options_scope
@@ -59,6 +86,8 @@ def setup_lockfile_request(
 @dataclass(frozen=True)
 class ParserSetup:
     pex: VenvPex
+    # Identifies the parser script and its requirements, for the parser's own per-file cache.
+    cache_salt: str
 
 
 @rule
@@ -79,7 +108,10 @@ async def setup_parser(hcl2_parser: TerraformHcl2Parser) -> ParserSetup:
             main=EntryPoint(PurePath(parser_content.path).stem), sources=parser_digest
         ),
     )
-    return ParserSetup(parser_pex)
+    cache_salt = hashlib.sha256(
+        parser_script_content + b"\0" + hcl2_parser.version.encode("utf-8")
+    ).hexdigest()
+    return ParserSetup(parser_pex, cache_salt)
 
 
 @dataclass(frozen=True)
@@ -104,27 +136,155 @@ async def setup_process_for_parse_terraform_module_sources(
     return process
 
 
+@dataclass(frozen=True)
+class ParseTerraformModuleSourcesBatchRequest:
+    """Parse the sources of several modules in a single parser process."""
+
+    requests: tuple[ParseTerraformModuleSources, ...]
+
+
+class ParsedTerraformModuleSourcePaths(DeduplicatedCollection[str]):
+    """The paths of the local modules referenced by a module's sources."""
+
+    sort_input = True
+
+
+@dataclass(frozen=True)
+class ParsedTerraformModuleSourcesBatch:
+    """The parse result for each of the requests of a batch, in the same order."""
+
+    results: tuple[ParsedTerraformModuleSourcePaths, ...]
+
+
+_PARSER_CACHE_NAME = "terraform_hcl2_parser"
+
+
+@rule
+async def parse_terraform_module_sources_batch(
+    request: ParseTerraformModuleSourcesBatchRequest, parser: ParserSetup
+) -> ParsedTerraformModuleSourcesBatch:
+    input_digest = await Get(
+        Digest, MergeDigests(module.sources_digest for module in request.requests)
+    )
+    all_paths = sorted({path for module in request.requests for path in module.paths})
+    cache_dir = f".cache/{_PARSER_CACHE_NAME}"
+    result = await Get(
+        ProcessResult,
+        VenvPexProcess(
+            parser.pex,
+            argv=("--batch", *all_paths),
+            input_digest=input_digest,
+            extra_env={
+                "HCL2_PARSER_CACHE_DIR": cache_dir,
+                "HCL2_PARSER_CACHE_SALT": parser.cache_salt,
+            },
+            append_only_caches={_PARSER_CACHE_NAME: cache_dir},
+            description=(
+                f"Parse Terraform module sources for {pluralize(len(request.requests), 'module')}."
+            ),
+            level=LogLevel.DEBUG,
+        ),
+    )
+    paths_by_file = json.loads(result.stdout)
+    return ParsedTerraformModuleSourcesBatch(
+        tuple(
+            ParsedTerraformModuleSourcePaths(
+                path for filename in module.paths for path in paths_by_file[filename]
+            )
+            for module in request.requests
+        )
+    )
+
+
+@dataclass(frozen=True)
+class BatchedParseTerraformModuleSources:
+    """Parse the sources of a module, along with up to `batch_size - 1` other modules.
+
+    The batch is made of the modules in the directory of the module and its sibling directories,
+    e.g. `tf/app` is batched with `tf/db`. It is stably partitioned by address, so every
+    module in a batch computes the same batch and the engine runs it once.
+    """
+
+    address: Address
+    request: ParseTerraformModuleSources
+    batch_size: int
+
+
+@rule
+async def parse_terraform_module_sources_in_batch(
+    request: BatchedParseTerraformModuleSources,
+) -> ParsedTerraformModuleSourcePaths:
+    if request.batch_size > 1:
+        spec_path = request.address.spec_path
+        module_dirs = {spec_path}
+        if spec_path:
+            # Only look for modules in the sibling directories with Terraform files, rather than
+            # resolving every BUILD file below the parent directory.
+            sibling_tf_files = await Get(
+                Paths, PathGlobs([os.path.join(os.path.dirname(spec_path), "*", "*.tf")])
+            )
+            module_dirs.update(os.path.dirname(path) for path in sibling_tf_files.files)
+        candidates = await Get(
+            Targets,
+            AddressSpecs(
+                MaybeEmptySiblingAddresses(module_dir) for module_dir in sorted(module_dirs)
+            ),
+        )
+        batch_modules = partition_containing(
+            (tgt for tgt in candidates if tgt.has_field(TerraformModuleSourcesField)),
+            request.address.spec,
+            key=lambda tgt: tgt.address.spec,
+            size_max=request.batch_size,
+        )
+        if batch_modules is not None:
+            all_hydrated_sources = await MultiGet(
+                Get(HydratedSources, HydrateSourcesRequest(tgt[TerraformModuleSourcesField]))
+                for tgt in batch_modules
+            )
+            batch = await Get(
+                ParsedTerraformModuleSourcesBatch,
+                ParseTerraformModuleSourcesBatchRequest(
+                    tuple(
+                        _parse_request(hydrated_sources)
+                        for hydrated_sources in all_hydrated_sources
+                    )
+                ),
+            )
+            index = next(i for i, tgt in enumerate(batch_modules) if tgt.address == request.address)
+            return batch.results[index]
+
+    result = await Get(ProcessResult, ParseTerraformModuleSources, request.request)
+    return ParsedTerraformModuleSourcePaths(
+        line for line in result.stdout.decode("utf-8").split("\n") if line
+    )
+
+
+def _parse_request(hydrated_sources: HydratedSources) -> ParseTerraformModuleSources:
+    paths = OrderedSet(
+        filename for filename in hydrated_sources.snapshot.files if filename.endswith(".tf")
+    )
+    return ParseTerraformModuleSources(
+        sources_digest=hydrated_sources.snapshot.digest, paths=tuple(paths)
+    )
+
+
 class InferTerraformModuleDependenciesRequest(InferDependenciesRequest):
     infer_from = TerraformModuleSourcesField
 
 
 @rule
 async def infer_terraform_module_dependencies(
-    request: InferTerraformModuleDependenciesRequest,
+    request: InferTerraformModuleDependenciesRequest, hcl2_parser: TerraformHcl2Parser
 ) -> InferredDependencies:
     hydrated_sources = await Get(HydratedSources, HydrateSourcesRequest(request.sources_field))
-
-    paths = OrderedSet(
-        filename for filename in hydrated_sources.snapshot.files if filename.endswith(".tf")
-    )
-    result = await Get(
-        ProcessResult,
-        ParseTerraformModuleSources(
-            sources_digest=hydrated_sources.snapshot.digest,
-            paths=tuple(paths),
+    candidate_spec_paths = await Get(
+        ParsedTerraformModuleSourcePaths,
+        BatchedParseTerraformModuleSources(
+            request.sources_field.address,
+            _parse_request(hydrated_sources),
+            hcl2_parser.batch_size,
         ),
     )
-    candidate_spec_paths = [line for line in result.stdout.decode("utf-8").split("\n") if line]
 
     # For each path, see if there is a `terraform_module` target at the specified spec_path.
     candidate_targets = await Get(
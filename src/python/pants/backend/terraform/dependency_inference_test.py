@@ -8,7 +8,10 @@ from pants.backend.python.util_rules.pex import rules as pex_rules
 from pants.backend.terraform import dependency_inference
 from pants.backend.terraform.dependency_inference import (
     InferTerraformModuleDependenciesRequest,
+    ParsedTerraformModuleSourcePaths,
+    ParsedTerraformModuleSourcesBatch,
     ParseTerraformModuleSources,
+    ParseTerraformModuleSourcesBatchRequest,
     TerraformHcl2Parser,
 )
 from pants.backend.terraform.target_types import TerraformModuleTarget
@@ -39,6 +42,7 @@ def rule_runner() -> RuleRunner:
             QueryRule(InferredDependencies, [InferTerraformModuleDependenciesRequest]),
             QueryRule(HydratedSources, [HydrateSourcesRequest]),
             QueryRule(ProcessResult, [ParseTerraformModuleSources]),
+            QueryRule(ParsedTerraformModuleSourcesBatch, [ParseTerraformModuleSourcesBatchRequest]),
         ],
     )
     rule_runner.set_options(
@@ -48,15 +52,29 @@ def rule_runner() -> RuleRunner:
     return rule_runner
 
 
-def test_dependency_inference(rule_runner: RuleRunner) -> None:
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_dependency_inference(rule_runner: RuleRunner, batch_size: int) -> None:
+    rule_runner.set_options(
+        [
+            "--backend-packages=pants.backend.experimental.terraform",
+            f"--terraform-hcl2-parser-batch-size={batch_size}",
+        ],
+        env_inherit={"PATH", "PYENV_ROOT", "HOME"},
+    )
     rule_runner.write_files(
         {
+            "BUILD": "terraform_module(name='root')\n",
+            "main.tf": 'module "foo" {\n  source = "./src/tf/modules/foo"\n}\n',
             "src/tf/modules/foo/BUILD": "terraform_module()\n",
             "src/tf/modules/foo/versions.tf": "",
             "src/tf/modules/foo/bar/BUILD": "terraform_module()\n",
             "src/tf/modules/foo/bar/versions.tf": "",
             "src/tf/resources/grok/subdir/BUILD": "terraform_module()\n",
             "src/tf/resources/grok/subdir/versions.tf": "",
+            "src/tf/resources/other/BUILD": "terraform_module()\n",
+            "src/tf/resources/other/main.tf": (
+                'module "bar" {\n  source = "../../modules/foo/bar"\n}\n'
+            ),
             "src/tf/resources/grok/BUILD": "terraform_module()\n",
             "src/tf/resources/grok/resources.tf": textwrap.dedent(
                 """\
@@ -79,12 +97,14 @@ def test_dependency_inference(rule_runner: RuleRunner) -> None:
         }
     )
 
-    target = rule_runner.get_target(Address("src/tf/resources/grok"))
-    inferred_deps = rule_runner.request(
-        InferredDependencies,
-        [InferTerraformModuleDependenciesRequest(target.get(SourcesField))],
-    )
-    assert inferred_deps == InferredDependencies(
+    def infer(address: Address) -> InferredDependencies:
+        target = rule_runner.get_target(address)
+        return rule_runner.request(
+            InferredDependencies,
+            [InferTerraformModuleDependenciesRequest(target.get(SourcesField))],
+        )
+
+    assert infer(Address("src/tf/resources/grok")) == InferredDependencies(
         FrozenOrderedSet(
             [
                 Address("src/tf/modules/foo"),
@@ -93,6 +113,12 @@ def test_dependency_inference(rule_runner: RuleRunner) -> None:
             ]
         ),
     )
+    assert infer(Address("src/tf/resources/other")) == InferredDependencies(
+        FrozenOrderedSet([Address("src/tf/modules/foo/bar")])
+    )
+    assert infer(Address("", target_name="root")) == InferredDependencies(
+        FrozenOrderedSet([Address("src/tf/modules/foo")])
+    )
 
 
 @pytest.mark.platform_specific_behavior
@@ -137,3 +163,40 @@ def test_hcl_parser_wrapper_runs(rule_runner: RuleRunner, major_minor_interprete
 
     lines = {line for line in result.stdout.decode("utf-8").splitlines() if line}
     assert lines == {"grok", "foo/hello/world"}
+
+
+def test_parse_module_sources_batch(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "foo/BUILD": "terraform_module()\n",
+            "foo/main.tf": 'module "grok" {\n  source = "../grok"\n}\n',
+            "foo/other.tf": 'module "bar" {\n  source = "./bar"\n}\n',
+            "baz/BUILD": "terraform_module()\n",
+            "baz/main.tf": 'module "grok" {\n  source = "../grok"\n}\n',
+            "empty/BUILD": "terraform_module()\n",
+            "empty/versions.tf": "",
+        }
+    )
+
+    def parse_request(directory: str) -> ParseTerraformModuleSources:
+        target = rule_runner.get_target(Address(directory))
+        sources = rule_runner.request(
+            HydratedSources, [HydrateSourcesRequest(target[SourcesField])]
+        )
+        return ParseTerraformModuleSources(
+            sources_digest=sources.snapshot.digest, paths=sources.snapshot.files
+        )
+
+    batch = rule_runner.request(
+        ParsedTerraformModuleSourcesBatch,
+        [
+            ParseTerraformModuleSourcesBatchRequest(
+                (parse_request("foo"), parse_request("baz"), parse_request("empty"))
+            )
+        ],
+    )
+    assert batch.results == (
+        ParsedTerraformModuleSourcePaths(["grok", "foo/bar"]),
+        ParsedTerraformModuleSourcePaths(["grok"]),
+        ParsedTerraformModuleSourcePaths(),
+    )
@@ -1,9 +1,12 @@
 # Copyright 2021 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import hashlib
+import json
+import os
 import sys
 from pathlib import PurePath
-from typing import Set
+from typing import Dict, List, Optional, Set
 
 #
 # Note: This file is used as an pex entry point in the execution sandbox.
@@ -66,5 +69,52 @@ def main(args):
         print(path)
 
 
+def _cached_module_source_paths(
+    cache_dir: Optional[str], cache_salt: str, filename: str, content: bytes
+) -> Set[str]:
+    # The module source paths of a file only depend on the file's own path and content (and on the
+    # parser itself, which the caller folds into `cache_salt`), so they can be shared across runs.
+    if not cache_dir:
+        return extract_module_source_paths(PurePath(filename).parent, content)
+
+    hasher = hashlib.sha256(cache_salt.encode("utf-8"))
+    hasher.update(b"\0" + filename.encode("utf-8") + b"\0" + content)
+    key = hasher.hexdigest()
+    cache_path = os.path.join(cache_dir, key[:2], f"{key}.json")
+    try:
+        with open(cache_path) as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+    paths = extract_module_source_paths(PurePath(filename).parent, content)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sorted(paths), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return paths
+
+
+def main_batch(args):
+    """Print a JSON object mapping each file to the module source paths it references."""
+    cache_dir = os.environ.get("HCL2_PARSER_CACHE_DIR")
+    cache_salt = os.environ.get("HCL2_PARSER_CACHE_SALT", "")
+    result: Dict[str, List[str]] = {}
+    for filename in args:
+        with open(filename, "rb") as f:
+            content = f.read()
+        result[filename] = sorted(
+            _cached_module_source_paths(cache_dir, cache_salt, filename, content)
+        )
+    json.dump(result, sys.stdout)
+
+
 if __name__ == "__main__":
-    main(sys.argv[1:])
+    if sys.argv[1:2] == ["--batch"]:
+        main_batch(sys.argv[2:])
+    else:
+        main(sys.argv[1:])
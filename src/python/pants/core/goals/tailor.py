@@ -29,7 +29,10 @@ from pants.engine.internals.build_files import BuildFileOptions
 from pants.engine.internals.selectors import Get, MultiGet
 from pants.engine.rules import collect_rules, goal_rule, rule
 from pants.engine.target import (
+    AllTargetsShardDirectories,
+    AllTargetsShardRequest,
     AllUnexpandedTargets,
+    AllUnexpandedTargetsShard,
     SourcesField,
     SourcesPaths,
     SourcesPathsRequest,
@@ -383,16 +386,32 @@ class AllOwnedSources(DeduplicatedCollection[str]):
     """All files in the project already owned by targets."""
 
 
-@rule(desc="Determine all files already owned by targets", level=LogLevel.DEBUG)
-async def determine_all_owned_sources(all_tgts: AllUnexpandedTargets) -> AllOwnedSources:
+class _OwnedSourcesShard(DeduplicatedCollection[str]):
+    """The files owned by the targets of one `AllTargetsShardRequest`."""
+
+
+@rule(desc="Determine files already owned by targets in a directory", level=LogLevel.DEBUG)
+async def determine_owned_sources_in_shard(request: AllTargetsShardRequest) -> _OwnedSourcesShard:
+    tgts = await Get(AllUnexpandedTargetsShard, AllTargetsShardRequest, request)
     all_sources_paths = await MultiGet(
-        Get(SourcesPaths, SourcesPathsRequest(tgt.get(SourcesField))) for tgt in all_tgts
+        Get(SourcesPaths, SourcesPathsRequest(tgt.get(SourcesField))) for tgt in tgts
     )
-    return AllOwnedSources(
+    return _OwnedSourcesShard(
         itertools.chain.from_iterable(sources_paths.files for sources_paths in all_sources_paths)
     )
 
 
+@rule(desc="Determine all files already owned by targets", level=LogLevel.DEBUG)
+async def determine_all_owned_sources(
+    shard_directories: AllTargetsShardDirectories,
+) -> AllOwnedSources:
+    shards = await MultiGet(
+        Get(_OwnedSourcesShard, AllTargetsShardRequest(directory))
+        for directory in shard_directories
+    )
+    return AllOwnedSources(itertools.chain.from_iterable(shards))
+
+
 @dataclass(frozen=True)
 class UniquelyNamedPutativeTargets:
     """Putative targets that have no name conflicts with existing targets (or each other)."""
@@ -4,12 +4,13 @@
 from __future__ import annotations
 
 import itertools
+import json
 import logging
 from abc import ABC, ABCMeta
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import PurePath
-from typing import Any, ClassVar, TypeVar, cast
+from typing import Any, ClassVar, Iterable, TypeVar, cast
 
 from pants.core.goals.package import BuiltPackage, PackageFieldSet
 from pants.core.util_rules.distdir import DistDir
@@ -19,7 +20,18 @@ from pants.engine.console import Console
 from pants.engine.desktop import OpenFiles, OpenFilesRequest
 from pants.engine.engine_aware import EngineAwareReturnType
 from pants.engine.environment import Environment, EnvironmentRequest
-from pants.engine.fs import EMPTY_FILE_DIGEST, Digest, FileDigest, MergeDigests, Snapshot, Workspace
+from pants.engine.fs import (
+    EMPTY_FILE_DIGEST,
+    CreateDigest,
+    Digest,
+    DigestContents,
+    FileContent,
+    FileDigest,
+    MergeDigests,
+    PathGlobs,
+    Snapshot,
+    Workspace,
+)
 from pants.engine.goal import Goal, GoalSubsystem
 from pants.engine.internals.session import RunId
 from pants.engine.process import (
@@ -41,9 +53,12 @@ from pants.engine.target import (
     Targets,
 )
 from pants.engine.unions import UnionMembership, union
+from pants.option.global_options import GlobalOptions
 from pants.option.option_types import BoolOption, EnumOption, StrListOption, StrOption
 from pants.util.docutil import bin_name
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
 
 logger = logging.getLogger(__name__)
 
@@ -170,6 +185,17 @@ class ShowOutput(Enum):
     NONE = "none"
 
 
+class TestOrder(Enum):
+    """The order in which to start tests."""
+
+    DEFAULT = "default"
+    FAILED_FIRST = "failed-first"
+    SLOWEST_FIRST = "slowest-first"
+
+    # Prevent this class from being detected by pytest as a test class.
+    __test__ = False
+
+
 @dataclass(frozen=True)
 class TestDebugRequest:
     process: InteractiveProcess | None
@@ -346,6 +372,74 @@ class TestSubsystem(GoalSubsystem):
             "`ENV_VAR` to copy the value of a variable in Pants's own environment."
         ),
     )
+    shard = StrOption(
+        "--shard",
+        default="",
+        help=(
+            "A shard specification of the form `k/N`, where N is the number of shards and k is "
+            "the 0-based index of the shard to run, e.g. `--shard=0/4`. If set, only the tests "
+            "in that shard are run.\n\n"
+            "Shards are balanced by the durations recorded in `[test].history_file` if it is set "
+            "(and by the number of tests otherwise). Shards are deterministic given the same "
+            "tests and the same history file, so every shard should use the same history file."
+        ),
+    )
+    history_file = StrOption(
+        "--history-file",
+        metavar="<FILE>",
+        default=None,
+        advanced=True,
+        help=(
+            "A JSON file, relative to the build root, recording the duration of each test "
+            "that was run, and whether it failed. The file is read before running tests and "
+            "updated afterwards, so it can be restored and saved by CI.\n\n"
+            "The file must not be ignored by `[GLOBAL].pants_ignore`."
+        ),
+    )
+    order = EnumOption(
+        "--order",
+        default=TestOrder.DEFAULT,
+        help=(
+            "The order in which to start tests, based on `[test].history_file`.\n\n"
+            "`failed-first` starts the tests that failed the last time that they ran first, then "
+            "tests that have never run, then all other tests, and starts slower tests first "
+            "within each of those groups. `slowest-first` starts tests that have never run first, "
+            "and then all other tests in order of their last duration.\n\n"
+            "The order only takes effect with `[test].fail_fast`, which starts tests in waves in "
+            "this order. Otherwise, all tests are requested at once and the engine decides which "
+            "of them start first."
+        ),
+    )
+    fail_fast = BoolOption(
+        "--fail-fast",
+        default=False,
+        help=(
+            "Stop starting new tests once a test has failed.\n\n"
+            "Tests are started in waves of `[GLOBAL].process_execution_local_parallelism` "
+            "tests, in the order given by `[test].order`, and no more waves are started once a "
+            "test in a wave fails.\n\n"
+            "This reduces throughput: each wave waits for its slowest test before the next wave "
+            "starts, so fewer tests run concurrently than without this option, particularly "
+            "with remote execution."
+        ),
+    )
+
+    @property
+    def shard_spec(self) -> tuple[int, int] | None:
+        """The index and count of shards, if `--shard` is set."""
+        if not self.shard:
+            return None
+        index, _, count = self.shard.partition("/")
+        try:
+            shard_spec = int(index), int(count)
+        except ValueError:
+            shard_spec = None
+        if shard_spec is None or not 0 <= shard_spec[0] < shard_spec[1]:
+            raise ValueError(
+                f"Invalid shard specification `{self.shard}` for `--{self.name}-shard`: expected "
+                "`k/N`, where N is the number of shards and 0 <= k < N."
+            )
+        return shard_spec
 
 
 class Test(Goal):
@@ -354,6 +448,128 @@ class Test(Goal):
     __test__ = False
 
 
+@dataclass(frozen=True)
+class TestHistoryEntry:
+    """What was recorded about a test the last time that it ran."""
+
+    duration_ms: int
+    failed: bool = False
+
+    # Prevent this class from being detected by pytest as a test class.
+    __test__ = False
+
+
+@dataclass(frozen=True)
+class TestHistory:
+    """The contents of `[test].history_file`, keyed by the address spec of each test."""
+
+    entries: FrozenDict[str, TestHistoryEntry]
+
+    # Prevent this class from being detected by pytest as a test class.
+    __test__ = False
+
+    @classmethod
+    def parse(cls, content: bytes, *, description_of_origin: str) -> TestHistory:
+        try:
+            tests = json.loads(content)["tests"]
+            return cls(
+                FrozenDict(
+                    (
+                        spec,
+                        TestHistoryEntry(
+                            duration_ms=int(entry["duration_ms"]),
+                            failed=bool(entry.get("failed", False)),
+                        ),
+                    )
+                    for spec, entry in tests.items()
+                )
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring the invalid test history in {description_of_origin}: {e!r}")
+            return cls(FrozenDict())
+
+    def serialize(self) -> bytes:
+        tests = {
+            spec: {"duration_ms": entry.duration_ms, "failed": entry.failed}
+            for spec, entry in sorted(self.entries.items())
+        }
+        return json.dumps({"tests": tests}, indent=2).encode()
+
+    def duration_ms(self, address: Address) -> int | None:
+        entry = self.entries.get(address.spec)
+        return entry.duration_ms if entry else None
+
+    def failed(self, address: Address) -> bool | None:
+        entry = self.entries.get(address.spec)
+        return entry.failed if entry else None
+
+    def updated(self, results: Iterable[TestResult]) -> TestHistory:
+        entries = dict(self.entries)
+        for result in results:
+            if result.skipped:
+                continue
+            assert result.result_metadata is not None
+            duration_ms = result.result_metadata.total_elapsed_ms
+            if duration_ms is not None:
+                entries[result.address.spec] = TestHistoryEntry(
+                    duration_ms=duration_ms, failed=result.exit_code != 0
+                )
+        return TestHistory(FrozenDict(entries))
+
+
+_TFS = TypeVar("_TFS", bound=TestFieldSet)
+
+
+def select_shard(
+    field_sets: Iterable[_TFS], shard_index: int, shard_count: int, history: TestHistory
+) -> list[_TFS]:
+    """Select the field sets of one shard, balancing the shards by historical test duration.
+
+    Tests without a recorded duration are assumed to take the median recorded duration. Tests are
+    assigned longest first to the shard with the least total duration so far, with ties broken by
+    address and by shard index, so that the assignment is deterministic.
+    """
+    field_sets = tuple(field_sets)
+    known_durations = sorted(
+        duration
+        for duration in (history.duration_ms(field_set.address) for field_set in field_sets)
+        if duration is not None
+    )
+    default_duration = known_durations[(len(known_durations) - 1) // 2] if known_durations else 1
+
+    def duration(field_set: TestFieldSet) -> int:
+        recorded = history.duration_ms(field_set.address)
+        return default_duration if recorded is None else recorded
+
+    shard_totals = [0] * shard_count
+    selected = []
+    for field_set in sorted(field_sets, key=lambda fs: (-duration(fs), fs.address)):
+        shard = min(range(shard_count), key=lambda i: (shard_totals[i], i))
+        shard_totals[shard] += duration(field_set)
+        if shard == shard_index:
+            selected.append(field_set)
+    return sorted(selected, key=lambda fs: fs.address)
+
+
+def order_tests(field_sets: Iterable[_TFS], order: TestOrder, history: TestHistory) -> list[_TFS]:
+    """Order the field sets by the priority with which to start their tests.
+
+    The sort is stable, so field sets with the same priority stay in their original order.
+    """
+    if order == TestOrder.DEFAULT:
+        return list(field_sets)
+
+    def priority(field_set: TestFieldSet) -> tuple[int, int]:
+        duration = history.duration_ms(field_set.address)
+        if duration is None:
+            return 1, 0
+        if order == TestOrder.FAILED_FIRST and history.failed(field_set.address):
+            return 0, -duration
+        return 2, -duration
+
+    return sorted(field_sets, key=priority)
+
+
 @goal_rule
 async def run_tests(
     console: Console,
@@ -362,6 +578,7 @@ async def run_tests(
     union_membership: UnionMembership,
     dist_dir: DistDir,
     run_id: RunId,
+    global_options: GlobalOptions,
 ) -> Test:
     if test_subsystem.debug:
         targets_to_valid_field_sets = await Get(
@@ -396,10 +613,53 @@ async def run_tests(
             no_applicable_targets_behavior=NoApplicableTargetsBehavior.warn,
         ),
     )
-    results = await MultiGet(
-        Get(TestResult, TestFieldSet, field_set)
-        for field_set in targets_to_valid_field_sets.field_sets
-    )
+    field_sets = targets_to_valid_field_sets.field_sets
+
+    history = TestHistory(FrozenDict())
+    history_file = test_subsystem.history_file
+    if history_file:
+        history_contents = await Get(
+            DigestContents,
+            PathGlobs([history_file]),
+        )
+        if history_contents:
+            history = TestHistory.parse(
+                history_contents[0].content, description_of_origin=f"`{history_file}`"
+            )
+
+    shard_spec = test_subsystem.shard_spec
+    if shard_spec:
+        field_sets = select_shard(field_sets, *shard_spec, history)
+
+    field_sets = order_tests(field_sets, test_subsystem.order, history)
+
+    if test_subsystem.fail_fast:
+        wave_size = max(1, global_options.options.process_execution_local_parallelism)
+        results: tuple[TestResult, ...] = ()
+        for start in range(0, len(field_sets), wave_size):
+            wave_results = await MultiGet(
+                Get(TestResult, TestFieldSet, field_set)
+                for field_set in field_sets[start : start + wave_size]
+            )
+            results += wave_results
+            if any(not result.skipped and result.exit_code != 0 for result in wave_results):
+                not_started = len(field_sets) - len(results)
+                if not_started:
+                    logger.warning(
+                        f"Did not run {pluralize(not_started, 'test')} because a test failed "
+                        f"and `--{test_subsystem.name}-fail-fast` is set."
+                    )
+                break
+    else:
+        results = await MultiGet(
+            Get(TestResult, TestFieldSet, field_set) for field_set in field_sets
+        )
+
+    if history_file:
+        history_digest = await Get(
+            Digest, CreateDigest([FileContent(history_file, history.updated(results).serialize())])
+        )
+        workspace.write_digest(history_digest)
 
     # Print summary.
     exit_code = 0
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import json
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 from functools import partial
@@ -27,11 +28,16 @@ from pants.core.goals.test import (
     Test,
     TestDebugRequest,
     TestFieldSet,
+    TestHistory,
+    TestHistoryEntry,
+    TestOrder,
     TestResult,
     TestSubsystem,
     _format_test_summary,
     build_runtime_package_dependencies,
+    order_tests,
     run_tests,
+    select_shard,
 )
 from pants.core.util_rules.distdir import DistDir
 from pants.engine.addresses import Address
@@ -54,7 +60,8 @@ from pants.engine.target import (
     TargetRootsToFieldSetsRequest,
 )
 from pants.engine.unions import UnionMembership
-from pants.testutil.option_util import create_goal_subsystem
+from pants.option.global_options import GlobalOptions
+from pants.testutil.option_util import create_goal_subsystem, create_subsystem
 from pants.testutil.rule_runner import (
     MockEffect,
     MockGet,
@@ -63,6 +70,7 @@ from pants.testutil.rule_runner import (
     mock_console,
     run_rule_with_mocks,
 )
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 
 
@@ -152,6 +160,9 @@ def run_test_rule(
     output: ShowOutput = ShowOutput.ALL,
     valid_targets: bool = True,
     run_id: RunId = RunId(999),
+    shard: str = "",
+    order: TestOrder = TestOrder.DEFAULT,
+    fail_fast: bool = False,
 ) -> tuple[int, str]:
     test_subsystem = create_goal_subsystem(
         TestSubsystem,
@@ -160,7 +171,12 @@ def run_test_rule(
         xml_dir=xml_dir,
         output=output,
         extra_env_vars=[],
+        shard=shard,
+        history_file=None,
+        order=order,
+        fail_fast=fail_fast,
     )
+    global_options = create_subsystem(GlobalOptions, process_execution_local_parallelism=1)
     workspace = Workspace(rule_runner.scheduler, _enforce_effects=False)
     union_membership = UnionMembership(
         {
@@ -200,6 +216,7 @@ def run_test_rule(
                 union_membership,
                 DistDir(relpath=Path("dist")),
                 run_id,
+                global_options,
             ],
             mock_gets=[
                 MockGet(
@@ -276,6 +293,111 @@ def test_summary(rule_runner: RuleRunner) -> None:
     )
 
 
+def test_shard(rule_runner: RuleRunner) -> None:
+    addresses = [Address("", target_name=name) for name in ("t1", "t2", "t3", "t4")]
+    exit_code, stderr = run_test_rule(
+        rule_runner,
+        field_set=SuccessfulFieldSet,
+        targets=[make_target(address) for address in addresses],
+        shard="1/2",
+    )
+    assert exit_code == 0
+    assert stderr == dedent(
+        """\
+
+        ✓ //:t2 succeeded in 1.00s (memoized).
+        ✓ //:t4 succeeded in 1.00s (memoized).
+        """
+    )
+
+
+def test_fail_fast(rule_runner: RuleRunner) -> None:
+    addresses = [Address("", target_name=name) for name in ("good", "bad", "other")]
+    exit_code, stderr = run_test_rule(
+        rule_runner,
+        field_set=ConditionallySucceedsFieldSet,
+        targets=[make_target(address) for address in addresses],
+        fail_fast=True,
+    )
+    assert exit_code == 27
+    assert stderr == dedent(
+        """\
+
+        ✓ //:good succeeded in 1.00s (memoized).
+        𐄂 //:bad failed in 1.00s (memoized).
+        """
+    )
+
+
+def test_order_tests() -> None:
+    field_sets = [
+        SuccessfulFieldSet.create(make_target(Address("", target_name=name)))
+        for name in ("fast", "slow", "failed", "unknown")
+    ]
+    history = TestHistory(
+        FrozenDict(
+            {
+                "//:fast": TestHistoryEntry(duration_ms=10),
+                "//:slow": TestHistoryEntry(duration_ms=100),
+                "//:failed": TestHistoryEntry(duration_ms=50, failed=True),
+            }
+        )
+    )
+
+    def ordered(order: TestOrder) -> list[str]:
+        return [fs.address.target_name for fs in order_tests(field_sets, order, history)]
+
+    assert ordered(TestOrder.DEFAULT) == ["fast", "slow", "failed", "unknown"]
+    assert ordered(TestOrder.FAILED_FIRST) == ["failed", "unknown", "slow", "fast"]
+    assert ordered(TestOrder.SLOWEST_FIRST) == ["unknown", "slow", "failed", "fast"]
+
+
+def test_invalid_shard() -> None:
+    for shard in ("1", "a/b", "2/2", "-1/2"):
+        test_subsystem = create_goal_subsystem(TestSubsystem, shard=shard)
+        with pytest.raises(ValueError, match="Invalid shard specification"):
+            test_subsystem.shard_spec
+
+
+def test_select_shard_balances_by_duration() -> None:
+    field_sets = [
+        SuccessfulFieldSet.create(make_target(Address("", target_name=name)))
+        for name in ("slow", "medium", "fast1", "fast2", "unknown")
+    ]
+    history = TestHistory.parse(
+        json.dumps(
+            {
+                "tests": {
+                    "//:slow": {"duration_ms": 100},
+                    "//:medium": {"duration_ms": 60},
+                    "//:fast1": {"duration_ms": 20},
+                    "//:fast2": {"duration_ms": 20},
+                }
+            }
+        ).encode(),
+        description_of_origin="test",
+    )
+
+    def shard(index: int) -> list[str]:
+        return [fs.address.target_name for fs in select_shard(field_sets, index, 2, history)]
+
+    # `unknown` is assumed to take the (lower) median duration of 20ms.
+    assert shard(0) == ["slow", "unknown"]
+    assert shard(1) == ["fast1", "fast2", "medium"]
+    # The assignment doesn't depend on the order of the field sets.
+    reversed_shard = select_shard(reversed(field_sets), 0, 2, history)
+    assert [fs.address.target_name for fs in reversed_shard] == ["slow", "unknown"]
+
+
+def test_test_history_updated() -> None:
+    address = Address("", target_name="t1")
+    result = SuccessfulFieldSet.create(make_target(address)).test_result
+    history = TestHistory.parse(b"not json", description_of_origin="test").updated([result])
+    assert history.duration_ms(address) == 999
+    assert history.failed(address) is False
+    assert TestHistory.parse(history.serialize(), description_of_origin="test") == history
+
+
 def _assert_test_summary(
     expected: str,
     *,
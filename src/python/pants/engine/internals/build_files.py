@@ -3,26 +3,33 @@
 
 from __future__ import annotations
 
+import hashlib
 import itertools
 import os.path
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any
 
 from pants.base.exceptions import ResolveError
-from pants.base.specs import AddressSpecs
+from pants.base.specs import AddressSpecs, MaybeEmptyDescendantAddresses
 from pants.engine.addresses import Address, Addresses, AddressInput, BuildFileAddress
 from pants.engine.engine_aware import EngineAwareParameter
 from pants.engine.fs import DigestContents, GlobMatchErrorBehavior, PathGlobs, Paths
 from pants.engine.internals.mapper import AddressFamily, AddressMap, AddressSpecsFilter
 from pants.engine.internals.parametrize import _TargetParametrizations
-from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser, error_on_imports
+from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser, exec_preludes
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.engine.target import WrappedTarget
+from pants.engine.target import (
+    AllTargetsShard,
+    AllTargetsShardDirectories,
+    AllTargetsShardRequest,
+    AllUnexpandedTargetsShard,
+    WrappedTarget,
+)
 from pants.option.global_options import GlobalOptions
 from pants.util.docutil import bin_name, doc_url
 from pants.util.frozendict import FrozenDict
+from pants.util.logging import LogLevel
 from pants.util.ordered_set import OrderedSet
 
 
@@ -51,20 +58,13 @@ async def evaluate_preludes(build_file_options: BuildFileOptions) -> BuildFilePr
             glob_match_error_behavior=GlobMatchErrorBehavior.ignore,
         ),
     )
-    values: dict[str, Any] = {}
-    for file_content in prelude_digest_contents:
-        try:
-            file_content_str = file_content.content.decode()
-            content = compile(file_content_str, file_content.path, "exec")
-            exec(content, values)
-        except Exception as e:
-            raise Exception(f"Error parsing prelude file {file_content.path}: {e}")
-        error_on_imports(file_content_str, file_content.path)
-    # __builtins__ is a dict, so isn't hashable, and can't be put in a FrozenDict.
-    # Fortunately, we don't care about it - preludes should not be able to override builtins, so we just pop it out.
-    # TODO: Give a nice error message if a prelude tries to set a expose a non-hashable value.
-    values.pop("__builtins__", None)
-    return BuildFilePreludeSymbols(FrozenDict(values))
+    sources = tuple((fc.path, fc.content) for fc in prelude_digest_contents)
+    values = exec_preludes(sources)
+    fingerprint = hashlib.sha256()
+    for path, content in sources:
+        fingerprint.update(f"{path}\0{len(content)}\0".encode())
+        fingerprint.update(content)
+    return BuildFilePreludeSymbols(FrozenDict(values), fingerprint.hexdigest(), sources)
 
 
 @rule
@@ -259,5 +259,59 @@ async def addresses_from_address_specs(
     return Addresses(sorted(matched_addresses))
 
 
+@rule(desc="Find all directories with BUILD files", level=LogLevel.DEBUG)
+async def find_all_targets_shard_directories(
+    build_file_options: BuildFileOptions,
+) -> AllTargetsShardDirectories:
+    build_file_paths = await Get(
+        Paths,
+        PathGlobs,
+        AddressSpecs([MaybeEmptyDescendantAddresses("")]).to_build_file_path_globs(
+            build_patterns=build_file_options.patterns,
+            build_ignore_patterns=build_file_options.ignores,
+        ),
+    )
+    return AllTargetsShardDirectories(os.path.dirname(f) for f in build_file_paths.files)
+
+
+@rule(desc="Find targets in BUILD files", level=LogLevel.DEBUG)
+async def find_all_unexpanded_targets_shard(
+    request: AllTargetsShardRequest,
+) -> AllUnexpandedTargetsShard:
+    address_family = await Get(AddressFamily, AddressFamilyDir(request.directory))
+    target_parametrizations_list = await MultiGet(
+        Get(_TargetParametrizations, Address, address)
+        for address in address_family.addresses_to_target_adaptors
+    )
+    return AllUnexpandedTargetsShard(
+        sorted(
+            itertools.chain.from_iterable(
+                target_parametrizations.all
+                for target_parametrizations in target_parametrizations_list
+            ),
+            key=lambda tgt: tgt.address,
+        )
+    )
+
+
+@rule(desc="Find targets in BUILD files", level=LogLevel.DEBUG)
+async def find_all_targets_shard(request: AllTargetsShardRequest) -> AllTargetsShard:
+    address_family = await Get(AddressFamily, AddressFamilyDir(request.directory))
+    target_parametrizations_list = await MultiGet(
+        Get(_TargetParametrizations, Address, address)
+        for address in address_family.addresses_to_target_adaptors
+    )
+
+    # Replace all generating targets with what they generate. If a target generator does not
+    # generate any targets, keep the target generator.
+    targets = []
+    for target_parametrizations in target_parametrizations_list:
+        for parametrization in target_parametrizations:
+            if parametrization.original_target and not parametrization.parametrization:
+                targets.append(parametrization.original_target)
+            targets.extend(parametrization.parametrization.values())
+    return AllTargetsShard(sorted(targets, key=lambda tgt: tgt.address))
+
+
 def rules():
     return collect_rules()
@@ -34,6 +34,10 @@ from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.rules import Get, rule
 from pants.engine.target import (
+    AllTargetsShard,
+    AllTargetsShardDirectories,
+    AllTargetsShardRequest,
+    AllUnexpandedTargetsShard,
     Dependencies,
     GeneratedTargets,
     GenerateTargetsRequest,
@@ -602,3 +606,52 @@ def test_address_specs_parametrize(
         Address("demo", parameters={"resolve": "a"}),
         Address("demo", parameters={"resolve": "b"}),
     }
+
+
+def test_all_targets_shards() -> None:
+    rule_runner = RuleRunner(
+        rules=[
+            generate_mock_generated_target,
+            UnionRule(GenerateTargetsRequest, MockGenerateTargetsRequest),
+            QueryRule(AllTargetsShardDirectories, []),
+            QueryRule(AllUnexpandedTargetsShard, [AllTargetsShardRequest]),
+            QueryRule(AllTargetsShard, [AllTargetsShardRequest]),
+        ],
+        target_types=[MockTgt, MockGeneratedTarget, MockTargetGenerator],
+    )
+    rule_runner.write_files(
+        {
+            "BUILD": "target(name='root')",
+            "demo/BUILD": "generator(sources=['f.txt', 'subdir/g.txt'])",
+            "demo/f.txt": "",
+            "demo/subdir/g.txt": "",
+            "demo/subdir/BUILD": "target(name='sub')\ngenerator(name='empty')",
+            "no_build_file/f.txt": "",
+        }
+    )
+    directories = rule_runner.request(AllTargetsShardDirectories, [])
+    assert list(directories) == ["", "demo", "demo/subdir"]
+
+    def shard_addresses(directory: str, *, expanded: bool = False) -> set[Address]:
+        shard_type = AllTargetsShard if expanded else AllUnexpandedTargetsShard
+        shard = rule_runner.request(shard_type, [AllTargetsShardRequest(directory)])
+        return {tgt.address for tgt in shard}
+
+    assert shard_addresses("") == {Address("", target_name="root")}
+    # Generated targets belong to the shard of their generator's BUILD file, even if they reside
+    # in a different directory.
+    generated_addresses = {
+        Address("demo", relative_file_path="f.txt"),
+        Address("demo", relative_file_path="subdir/g.txt"),
+        Address("demo", generated_name="f.txt"),
+        Address("demo", generated_name="subdir/g.txt"),
+    }
+    assert shard_addresses("demo") == {Address("demo"), *generated_addresses}
+    assert shard_addresses("demo", expanded=True) == generated_addresses
+    # A target generator which generates nothing is kept when expanding.
+    sub_addresses = {
+        Address("demo/subdir", target_name="sub"),
+        Address("demo/subdir", target_name="empty"),
+    }
+    assert shard_addresses("demo/subdir") == sub_addresses
+    assert shard_addresses("demo/subdir", expanded=True) == sub_addresses
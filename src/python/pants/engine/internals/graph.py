@@ -18,7 +18,6 @@ from pants.base.specs import (
     AscendantAddresses,
     FileLiteralSpec,
     FilesystemSpecs,
-    MaybeEmptyDescendantAddresses,
     Specs,
 )
 from pants.engine.addresses import (
@@ -39,6 +38,7 @@ from pants.engine.fs import (
     SpecsSnapshot,
 )
 from pants.engine.internals import native_engine
+from pants.engine.internals.interned_graph import InternedGraph, InternedGraphBuilder
 from pants.engine.internals.parametrize import Parametrize, _TargetParametrization
 from pants.engine.internals.parametrize import (  # noqa: F401
     _TargetParametrizations as _TargetParametrizations,
@@ -48,7 +48,11 @@ from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import (
     AllTargets,
     AllTargetsRequest,
+    AllTargetsShard,
+    AllTargetsShardDirectories,
+    AllTargetsShardRequest,
     AllUnexpandedTargets,
+    AllUnexpandedTargetsShard,
     CoarsenedTarget,
     CoarsenedTargets,
     Dependencies,
@@ -340,15 +344,28 @@ async def resolve_targets(
 
 
 @rule(desc="Find all targets in the project", level=LogLevel.DEBUG)
-async def find_all_targets(_: AllTargetsRequest) -> AllTargets:
-    tgts = await Get(Targets, AddressSpecs([MaybeEmptyDescendantAddresses("")]))
-    return AllTargets(tgts)
+async def find_all_targets(
+    _: AllTargetsRequest, shard_directories: AllTargetsShardDirectories
+) -> AllTargets:
+    # NB: Each shard is memoized separately, so after an edit only the affected shards are
+    # recomputed before being concatenated here.
+    shards = await MultiGet(
+        Get(AllTargetsShard, AllTargetsShardRequest(directory)) for directory in shard_directories
+    )
+    return AllTargets(sorted(itertools.chain.from_iterable(shards), key=lambda tgt: tgt.address))
 
 
 @rule(desc="Find all targets in the project", level=LogLevel.DEBUG)
-async def find_all_unexpanded_targets(_: AllTargetsRequest) -> AllUnexpandedTargets:
-    tgts = await Get(UnexpandedTargets, AddressSpecs([MaybeEmptyDescendantAddresses("")]))
-    return AllUnexpandedTargets(tgts)
+async def find_all_unexpanded_targets(
+    _: AllTargetsRequest, shard_directories: AllTargetsShardDirectories
+) -> AllUnexpandedTargets:
+    shards = await MultiGet(
+        Get(AllUnexpandedTargetsShard, AllTargetsShardRequest(directory))
+        for directory in shard_directories
+    )
+    return AllUnexpandedTargets(
+        sorted(itertools.chain.from_iterable(shards), key=lambda tgt: tgt.address)
+    )
 
 
 @rule
@@ -384,53 +401,13 @@ class CycleException(Exception):
         self.path = path
 
 
-def _detect_cycles(
-    roots: tuple[Address, ...], dependency_mapping: dict[Address, tuple[Address, ...]]
-) -> None:
-    path_stack: OrderedSet[Address] = OrderedSet()
-    visited: set[Address] = set()
-
-    def maybe_report_cycle(address: Address) -> None:
-        # NB: File-level dependencies are cycle tolerant.
-        if address.is_file_target or address not in path_stack:
-            return
-
-        # The path of the cycle is shorter than the entire path to the cycle: if the suffix of
-        # the path representing the cycle contains a file dep, it is ignored.
-        in_cycle = False
-        for path_address in path_stack:
-            if in_cycle and path_address.is_file_target:
-                # There is a file address inside the cycle: do not report it.
-                return
-            elif in_cycle:
-                # Not a file address.
-                continue
-            else:
-                # We're entering the suffix of the path that contains the cycle if we've reached
-                # the address in question.
-                in_cycle = path_address == address
-        # If we did not break out early, it's because there were no file addresses in the cycle.
-        raise CycleException(address, (*path_stack, address))
-
-    def visit(address: Address):
-        if address in visited:
-            maybe_report_cycle(address)
-            return
-        path_stack.add(address)
-        visited.add(address)
-
-        for dep_address in dependency_mapping[address]:
-            visit(dep_address)
-
-        path_stack.remove(address)
-
-    for root in roots:
-        visit(root)
-        if path_stack:
-            raise AssertionError(
-                f"The stack of visited nodes should have been empty at the end of recursion, "
-                f"but it still contained: {path_stack}"
-            )
+def _detect_cycles(roots: tuple[Address, ...], dependency_graph: InternedGraph[Address]) -> None:
+    # NB: File-level dependencies are cycle tolerant: if the node closing the cycle, or any node in
+    # the rest of the cycle, is a file address, the cycle is ignored.
+    cycle = dependency_graph.find_cycle(roots, cycle_tolerant=lambda a: a.is_file_target)
+    if cycle:
+        address, path = cycle
+        raise CycleException(address, path)
 
 
 @dataclass(frozen=True)
@@ -441,7 +418,9 @@ class _DependencyMappingRequest:
 
 @dataclass(frozen=True)
 class _DependencyMapping:
-    mapping: FrozenDict[Address, tuple[Address, ...]]
+    # NB: This is an integer-indexed graph rather than a dict of `Address` -> `tuple[Address, ...]`
+    # to avoid allocating millions of small objects for large graphs.
+    graph: InternedGraph[Address]
     visited: FrozenOrderedSet[Target]
     roots_as_targets: Collection[Target]
 
@@ -456,7 +435,7 @@ async def transitive_dependency_mapping(request: _DependencyMappingRequest) -> _
     roots_as_targets = await Get(UnexpandedTargets, Addresses(request.tt_request.roots))
     visited: OrderedSet[Target] = OrderedSet()
     queued = FrozenOrderedSet(roots_as_targets)
-    dependency_mapping: dict[Address, tuple[Address, ...]] = {}
+    graph_builder: InternedGraphBuilder[Address] = InternedGraphBuilder()
     while queued:
         direct_dependencies: tuple[Collection[Target], ...]
         if request.expanded_targets:
@@ -482,12 +461,8 @@ async def transitive_dependency_mapping(request: _DependencyMappingRequest) -> _
                 for tgt in queued
             )
 
-        dependency_mapping.update(
-            zip(
-                (t.address for t in queued),
-                (tuple(t.address for t in deps) for deps in direct_dependencies),
-            )
-        )
+        for tgt, deps in zip(queued, direct_dependencies):
+            graph_builder.add_edges(tgt.address, (dep.address for dep in deps))
 
         queued = FrozenOrderedSet(itertools.chain.from_iterable(direct_dependencies)).difference(
             visited
@@ -498,10 +473,9 @@ async def transitive_dependency_mapping(request: _DependencyMappingRequest) -> _
     # is because expanding from the `Addresses` -> `Targets` may have resulted in generated
     # targets being used, so we need to use `roots_as_targets` to have this expansion.
     # TODO(#12871): Fix this to not be based on generated targets.
-    _detect_cycles(tuple(t.address for t in roots_as_targets), dependency_mapping)
-    return _DependencyMapping(
-        FrozenDict(dependency_mapping), FrozenOrderedSet(visited), roots_as_targets
-    )
+    dependency_graph = graph_builder.build()
+    _detect_cycles(tuple(t.address for t in roots_as_targets), dependency_graph)
+    return _DependencyMapping(dependency_graph, FrozenOrderedSet(visited), roots_as_targets)
 
 
 @rule(desc="Resolve transitive targets")
@@ -537,8 +511,26 @@ async def transitive_targets(request: TransitiveTargetsRequest) -> TransitiveTar
 # -----------------------------------------------------------------------------------------------
 
 
+@dataclass(frozen=True)
+class _CoarsenedTargetsRequest:
+    """The normalized (sorted and deduped) root set of a `CoarsenedTargets` request.
+
+    Normalizing the roots means that requests for the same set of roots, in a different order or
+    with duplicates, are memoized as one.
+    """
+
+    roots: FrozenOrderedSet[Address]
+
+
 @rule
 async def coarsened_targets(addresses: Addresses) -> CoarsenedTargets:
+    return await Get(
+        CoarsenedTargets, _CoarsenedTargetsRequest(FrozenOrderedSet(sorted(set(addresses))))
+    )
+
+
+@rule
+async def coarsened_targets_for_roots(request: _CoarsenedTargetsRequest) -> CoarsenedTargets:
     dependency_mapping = await Get(
         _DependencyMapping,
         _DependencyMappingRequest(
@@ -546,10 +538,11 @@ async def coarsened_targets(addresses: Addresses) -> CoarsenedTargets:
             # requires a transitive graph walk (to ensure that all cycles are actually detected),
             # the resulting CoarsenedTargets instance is not itself transitive: everything not directly
             # involved in a cycle with one of the input Addresses is discarded in the output.
-            TransitiveTargetsRequest(addresses, include_special_cased_deps=True),
+            TransitiveTargetsRequest(request.roots, include_special_cased_deps=True),
             expanded_targets=False,
         ),
     )
+    graph = dependency_mapping.graph
     addresses_to_targets = {
         t.address: t for t in [*dependency_mapping.visited, *dependency_mapping.roots_as_targets]
     }
@@ -558,35 +551,46 @@ async def coarsened_targets(addresses: Addresses) -> CoarsenedTargets:
     # in reverse topological order. We can thus assume when building the structure shared
     # `CoarsenedTarget` instances that each instance will already have had its dependencies
     # constructed.
+    #
+    # NB: The graph is passed as node indices, which are cheaper for the engine to intern than
+    # `Address`es.
     components = native_engine.strongly_connected_components(
-        list(dependency_mapping.mapping.items())
+        [(i, graph.successors(i).tolist()) for i in range(len(graph))]
     )
 
-    coarsened_targets: dict[Address, CoarsenedTarget] = {}
+    # The CoarsenedTarget for each node index of the graph.
+    coarsened_targets: list[CoarsenedTarget | None] = [None] * len(graph)
     root_coarsened_targets = []
-    root_addresses_set = set(addresses)
+    try:
+        root_indices = {graph.index(address) for address in request.roots}
+    except KeyError as e:
+        raise AssertionError(
+            f"The root {e.args[0]} was missing from its own dependency graph. This indicates a "
+            "programming error in Pants. Please file a bug report at "
+            "https://github.com/pantsbuild/pants/issues/new."
+        )
     for component in components:
-        component = sorted(component)
+        component = sorted(component, key=graph.nodes.__getitem__)
         component_set = set(component)
 
         # For each member of the component, include the CoarsenedTarget for each of its external
         # dependencies.
         coarsened_target = CoarsenedTarget(
-            (addresses_to_targets[a] for a in component),
+            (addresses_to_targets[graph.nodes[i]] for i in component),
             (
-                coarsened_targets[d]
-                for a in component
-                for d in dependency_mapping.mapping[a]
-                if d not in component_set
+                cast(CoarsenedTarget, coarsened_targets[j])
+                for i in component
+                for j in graph.successors(i)
+                if j not in component_set
             ),
         )
 
-        # Add to the coarsened_targets mapping under each of the component's Addresses.
-        for address in component:
-            coarsened_targets[address] = coarsened_target
+        # Add to the coarsened_targets mapping under each of the component's members.
+        for i in component:
+            coarsened_targets[i] = coarsened_target
 
         # If any of the input Addresses was a member of this component, it is a root.
-        if component_set & root_addresses_set:
+        if not root_indices.isdisjoint(component_set):
             root_coarsened_targets.append(coarsened_target)
     return CoarsenedTargets(tuple(root_coarsened_targets))
 
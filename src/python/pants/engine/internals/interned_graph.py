@@ -0,0 +1,158 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import itertools
+from array import array
+from typing import Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+_N = TypeVar("_N", bound=Hashable)
+
+# Unsigned machine ints: at least 32 bits on every platform Pants supports.
+_INDEX_TYPECODE = "I"
+
+
+class InternedGraph(Generic[_N]):
+    """A compact, integer-indexed directed graph.
+
+    Nodes (usually `Address`es) are interned to consecutive ints, and the edges are stored in
+    compressed sparse row (CSR) form: the successors of node `i` are
+    `edges[offsets[i]:offsets[i + 1]]`. Both are flat `array`s of machine ints, rather than a
+    tuple of nodes per node, which avoids allocating an object per edge for large graphs.
+    """
+
+    __slots__ = ("nodes", "_indices", "offsets", "edges", "_hash")
+
+    def __init__(self, indices: Mapping[_N, int], offsets: array, edges: array) -> None:
+        """Create a graph from the index of each node (in order of index) and its CSR edges."""
+        self.nodes = tuple(indices)
+        self._indices = indices
+        self.offsets = offsets
+        self.edges = edges
+        self._hash: int | None = None
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[_N, Iterable[_N]]) -> InternedGraph[_N]:
+        """Create a graph from a mapping of each node to its successors.
+
+        Successors which are not themselves keys of the mapping are added as nodes with no
+        successors.
+        """
+        builder: InternedGraphBuilder[_N] = InternedGraphBuilder()
+        for node, successors in mapping.items():
+            builder.add_edges(node, successors)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self.nodes, self.offsets.tobytes(), self.edges.tobytes()))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, InternedGraph):
+            return NotImplemented
+        return (
+            self.nodes == other.nodes
+            and self.offsets == other.offsets
+            and self.edges == other.edges
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(nodes={len(self.nodes)}, edges={len(self.edges)})"
+
+    def index(self, node: _N) -> int:
+        return self._indices[node]
+
+    def successors(self, i: int) -> array:
+        return self.edges[self.offsets[i] : self.offsets[i + 1]]
+
+    def find_cycle(
+        self, roots: Iterable[_N], *, cycle_tolerant: Callable[[_N], bool] = lambda _: False
+    ) -> tuple[_N, tuple[_N, ...]] | None:
+        """Find a cycle reachable from the roots, using an iterative depth-first search.
+
+        A cycle is ignored if the node that closes it is `cycle_tolerant`, or if any node in the
+        cycle after that node is `cycle_tolerant`.
+
+        Returns the node closing the cycle and the path from the root to that node (ending with the
+        node again), or None if there are no cycles.
+        """
+        nodes, offsets, edges = self.nodes, self.offsets, self.edges
+        visited = bytearray(len(nodes))
+        on_path = bytearray(len(nodes))
+        path: list[int] = []
+        # The next edge offset to visit for each node on the path.
+        next_edges: list[int] = []
+
+        for root in roots:
+            r = self._indices[root]
+            if visited[r]:
+                continue
+            visited[r] = on_path[r] = 1
+            path.append(r)
+            next_edges.append(offsets[r])
+            while path:
+                i = path[-1]
+                edge = next_edges[-1]
+                if edge == offsets[i + 1]:
+                    on_path[i] = 0
+                    path.pop()
+                    next_edges.pop()
+                    continue
+                next_edges[-1] = edge + 1
+                j = edges[edge]
+                if not visited[j]:
+                    visited[j] = on_path[j] = 1
+                    path.append(j)
+                    next_edges.append(offsets[j])
+                    continue
+                # NB: Cycles are rare, so only check whether they are tolerated when found.
+                if not on_path[j] or cycle_tolerant(nodes[j]):
+                    continue
+                cycle = path[path.index(j) + 1 :]
+                if any(cycle_tolerant(nodes[k]) for k in cycle):
+                    continue
+                return nodes[j], tuple(nodes[k] for k in (*path, j))
+        return None
+
+
+class InternedGraphBuilder(Generic[_N]):
+    """Incrementally builds an `InternedGraph`, e.g. over the rounds of a graph walk.
+
+    The successors of each node are held as a tuple until `build` interns them all at once.
+    """
+
+    def __init__(self) -> None:
+        self._successors: dict[_N, tuple[_N, ...]] = {}
+
+    def add_edges(self, node: _N, successors: Iterable[_N]) -> None:
+        self._successors[node] = tuple(successors)
+
+    def build(self) -> InternedGraph[_N]:
+        # NB: Nodes are interned in bulk here rather than in `add_edges`, so that the per-edge work
+        # happens in `map` and `array` rather than in Python bytecode. The nodes with successors
+        # come first, in insertion order, so that their edges are already in CSR order.
+        successors = self._successors
+        indices = dict(zip(successors, range(len(successors))))
+        all_successors = itertools.chain.from_iterable
+        try:
+            edges = array(
+                _INDEX_TYPECODE, map(indices.__getitem__, all_successors(successors.values()))
+            )
+        except KeyError:
+            # Some successors had no edges added, which a complete graph walk never produces: add
+            # them after the other nodes.
+            for successor in all_successors(successors.values()):
+                indices.setdefault(successor, len(indices))
+            edges = array(
+                _INDEX_TYPECODE, map(indices.__getitem__, all_successors(successors.values()))
+            )
+        offsets = array(
+            _INDEX_TYPECODE, itertools.accumulate(map(len, successors.values()), initial=0)
+        )
+        offsets.extend(itertools.repeat(len(edges), len(indices) - len(successors)))
+        return InternedGraph(indices, offsets, edges)
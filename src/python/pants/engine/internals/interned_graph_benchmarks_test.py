@@ -0,0 +1,117 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Callable
+
+from pants.engine.addresses import Address
+from pants.engine.internals.interned_graph import InternedGraph, InternedGraphBuilder
+from pants.util.ordered_set import OrderedSet
+
+# A layered DAG of 150k targets, each depending on a handful of targets in the next layer, which
+# mirrors a large repository's target graph.
+NUM_LAYERS = 100
+LAYER_WIDTH = 1_500
+
+
+def _walk_rounds() -> list[list[tuple[Address, tuple[Address, ...]]]]:
+    """The (target, dependencies) pairs discovered by each round of a transitive graph walk."""
+    addresses = [
+        [Address(f"src/layer{layer}", target_name=f"t{k}") for k in range(LAYER_WIDTH)]
+        for layer in range(NUM_LAYERS)
+    ]
+    return [
+        [
+            (
+                addresses[layer][k],
+                tuple(
+                    addresses[layer + 1][(k * m + c) % LAYER_WIDTH]
+                    for m, c in ((7, 1), (3, 2), (2, 3), (1, 5))
+                )
+                if layer + 1 < NUM_LAYERS
+                else (),
+            )
+            for k in range(LAYER_WIDTH)
+        ]
+        for layer in range(NUM_LAYERS)
+    ]
+
+
+def _dict_detect_cycles(
+    roots: tuple[Address, ...], dependency_mapping: dict[Address, tuple[Address, ...]]
+) -> None:
+    # The previous implementation of `graph._detect_cycles`, over a dict of tuples.
+    path_stack: OrderedSet[Address] = OrderedSet()
+    visited: set[Address] = set()
+
+    def visit(address: Address) -> None:
+        if address in visited:
+            if not address.is_file_target and address in path_stack:
+                raise AssertionError(f"Unexpected cycle at {address}.")
+            return
+        path_stack.add(address)
+        visited.add(address)
+        for dep_address in dependency_mapping[address]:
+            visit(dep_address)
+        path_stack.remove(address)
+
+    for root in roots:
+        visit(root)
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> tuple[float, Any]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def test_bench_dependency_mapping() -> None:
+    rounds = _walk_rounds()
+    roots = tuple(address for address, _ in rounds[0])
+
+    def dict_mapping() -> dict[Address, tuple[Address, ...]]:
+        dependency_mapping: dict[Address, tuple[Address, ...]] = {}
+        for walk_round in rounds:
+            dependency_mapping.update(walk_round)
+        _dict_detect_cycles(roots, dependency_mapping)
+        return dependency_mapping
+
+    def interned_graph() -> InternedGraph[Address]:
+        graph_builder: InternedGraphBuilder[Address] = InternedGraphBuilder()
+        for walk_round in rounds:
+            for address, dependencies in walk_round:
+                graph_builder.add_edges(address, dependencies)
+        graph = graph_builder.build()
+        assert graph.find_cycle(roots, cycle_tolerant=lambda a: a.is_file_target) is None
+        return graph
+
+    dict_time, mapping = _best_of(3, dict_mapping)
+    graph_time, graph = _best_of(3, interned_graph)
+
+    # The nodes themselves are shared with the rest of Pants, so only count the structure.
+    dict_size = sys.getsizeof(mapping) + sum(sys.getsizeof(deps) for deps in mapping.values())
+    graph_size = (
+        sys.getsizeof(graph.nodes)
+        + sys.getsizeof(graph._indices)
+        + sys.getsizeof(graph.offsets)
+        + sys.getsizeof(graph.edges)
+    )
+    print(
+        f"\n{len(graph)} targets and {len(graph.edges)} dependencies: dict of tuples "
+        f"{dict_time:.3f}s and {dict_size} bytes, interned graph {graph_time:.3f}s and "
+        f"{graph_size} bytes"
+    )
+
+    assert {
+        node: tuple(graph.nodes[j] for j in graph.successors(i))
+        for i, node in enumerate(graph.nodes)
+    } == mapping
+    assert graph_size < dict_size
+    # Generous, to avoid flakiness on loaded machines.
+    assert graph_time < dict_time * 1.5
@@ -0,0 +1,73 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+from pants.engine.internals.interned_graph import InternedGraph, InternedGraphBuilder
+
+
+def _successors(graph: InternedGraph[str]) -> dict[str, tuple[str, ...]]:
+    return {
+        node: tuple(graph.nodes[j] for j in graph.successors(i))
+        for i, node in enumerate(graph.nodes)
+    }
+
+
+def test_from_mapping() -> None:
+    graph = InternedGraph.from_mapping({"a": ["b", "c"], "b": ["c"], "d": []})
+    # Successors which have no successors of their own come last.
+    assert graph.nodes == ("a", "b", "d", "c")
+    assert list(graph.offsets) == [0, 2, 3, 3, 3]
+    assert list(graph.edges) == [1, 3, 3]
+    assert graph.index("c") == 3
+    assert _successors(graph) == {"a": ("b", "c"), "b": ("c",), "c": (), "d": ()}
+
+
+def test_equality() -> None:
+    graph = InternedGraph.from_mapping({"a": ["b"]})
+    assert graph == InternedGraph.from_mapping({"a": ["b"]})
+    assert hash(graph) == hash(InternedGraph.from_mapping({"a": ["b"]}))
+    assert graph != InternedGraph.from_mapping({"a": ["c"]})
+    assert graph != InternedGraph.from_mapping({"b": ["a"]})
+
+
+def test_builder() -> None:
+    builder: InternedGraphBuilder[str] = InternedGraphBuilder()
+    builder.add_edges("root", ["x", "y"])
+    builder.add_edges("y", ["x"])
+    builder.add_edges("x", [])
+    graph = builder.build()
+    assert graph.nodes == ("root", "y", "x")
+    assert _successors(graph) == {"root": ("x", "y"), "x": (), "y": ("x",)}
+
+
+def test_find_cycle() -> None:
+    assert InternedGraph.from_mapping({"a": ["b"], "b": ["c"]}).find_cycle(["a"]) is None
+    # A diamond is not a cycle.
+    diamond = InternedGraph.from_mapping({"a": ["b", "c"], "b": ["d"], "c": ["d"]})
+    assert diamond.find_cycle(["a"]) is None
+
+    graph = InternedGraph.from_mapping({"root": ["a"], "a": ["b"], "b": ["c"], "c": ["a"]})
+    assert graph.find_cycle(["root"]) == ("a", ("root", "a", "b", "c", "a"))
+    assert graph.find_cycle(["c"]) == ("c", ("c", "a", "b", "c"))
+
+    self_cycle = InternedGraph.from_mapping({"a": ["a"]})
+    assert self_cycle.find_cycle(["a"]) == ("a", ("a", "a"))
+
+
+def test_find_cycle_tolerant() -> None:
+    def tolerant(node: str) -> bool:
+        return node.endswith(".py")
+
+    # The node closing the cycle is tolerant.
+    graph = InternedGraph.from_mapping({"a.py": ["b"], "b": ["a.py"]})
+    assert graph.find_cycle(["a.py"], cycle_tolerant=tolerant) is None
+    # A tolerant node inside of the cycle.
+    graph = InternedGraph.from_mapping({"a": ["b.py"], "b.py": ["a"]})
+    assert graph.find_cycle(["a"], cycle_tolerant=tolerant) is None
+    # A tolerant node on the path to the cycle, but not in it.
+    graph = InternedGraph.from_mapping({"root.py": ["a"], "a": ["b"], "b": ["a"]})
+    assert graph.find_cycle(["root.py"], cycle_tolerant=tolerant) == (
+        "a",
+        ("root.py", "a", "b", "a"),
+    )
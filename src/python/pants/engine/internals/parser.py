@@ -3,9 +3,18 @@
 
 from __future__ import annotations
 
+import hashlib
+import itertools
+import logging
+import marshal
+import multiprocessing
 import os.path
+import pickle
 import threading
 import tokenize
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from difflib import get_close_matches
 from io import StringIO
@@ -15,13 +24,41 @@ from pants.base.exceptions import MappingError
 from pants.base.parse_context import ParseContext
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.engine.internals.target_adaptor import TargetAdaptor
+from pants.util.dirutil import safe_mkdir
 from pants.util.docutil import doc_url
 from pants.util.frozendict import FrozenDict
+from pants.version import VERSION
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
 class BuildFilePreludeSymbols:
     symbols: FrozenDict[str, Any]
+    # A fingerprint of the prelude files that the symbols were evaluated from, used to key the
+    # BuildFileParseCache. If None, parses using these symbols are not cached.
+    fingerprint: str | None = None
+    # The (path, content) of the prelude files, so that they can be re-evaluated in parser worker
+    # processes. If empty and there are symbols, the parse is never done in a worker process.
+    sources: tuple[tuple[str, bytes], ...] = ()
+
+
+def exec_preludes(sources: Iterable[tuple[str, bytes]]) -> dict[str, Any]:
+    """Evaluate the given prelude files, and return the symbols that they define."""
+    values: dict[str, Any] = {}
+    for path, content in sources:
+        try:
+            content_str = content.decode()
+            code = compile(content_str, path, "exec")
+            exec(code, values)
+        except Exception as e:
+            raise Exception(f"Error parsing prelude file {path}: {e}")
+        error_on_imports(content_str, path)
+    # __builtins__ is a dict, so isn't hashable, and can't be put in a FrozenDict.
+    # Fortunately, we don't care about it - preludes should not be able to override builtins, so we just pop it out.
+    # TODO: Give a nice error message if a prelude tries to set a expose a non-hashable value.
+    values.pop("__builtins__", None)
+    return values
 
 
 class ParseError(Exception):
@@ -36,14 +73,23 @@ class ParseState(threading.local):
     def __init__(self):
         self._rel_path: str | None = None
         self._target_adapters: list[TargetAdaptor] = []
+        self._cacheable = True
 
     def reset(self, rel_path: str) -> None:
         self._rel_path = rel_path
         self._target_adapters.clear()
+        self._cacheable = True
 
     def add(self, target_adapter: TargetAdaptor) -> None:
         self._target_adapters.append(target_adapter)
 
+    def mark_uncacheable(self) -> None:
+        self._cacheable = False
+
+    @property
+    def cacheable(self) -> bool:
+        return self._cacheable
+
     def rel_path(self) -> str:
         if self._rel_path is None:
             raise AssertionError(
@@ -57,6 +103,114 @@ class ParseState(threading.local):
         return list(self._target_adapters)
 
 
+class BuildFileParseCache:
+    """A persistent cache of the targets parsed from BUILD files.
+
+    Entries are pickled lists of `TargetAdaptor`s, stored in one file per key. Keys cover
+    everything which can influence the result of a parse, so entries are never invalidated: they
+    are only ever written (atomically, so concurrent Pants processes may share the directory).
+
+    Reads touch the modification time of an entry, and every so often writes evict the least
+    recently used entries beyond `max_entries`, so that entries for stale BUILD files, symbols and
+    Pants versions don't accumulate.
+    """
+
+    DEFAULT_MAX_ENTRIES = 100_000
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        # Evicting lists the whole cache, so only do so once the cache may have grown by a tenth.
+        self._evict_interval = max(1, max_entries // 10)
+        self._puts = itertools.count(1)
+
+    @staticmethod
+    def key(
+        *, symbols_fingerprint: str, prelude_fingerprint: str, filepath: str, content: str
+    ) -> str:
+        hasher = hashlib.sha256()
+        for component in (VERSION, symbols_fingerprint, prelude_fingerprint, filepath, content):
+            hasher.update(component.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], key)
+
+    def get(self, key: str) -> list[TargetAdaptor] | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                target_adaptors = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable BUILD file parse cache entry {key}: {e}")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # E.g. the entry was concurrently evicted: it was still read successfully.
+            pass
+        return target_adaptors  # type: ignore[no-any-return]
+
+    def put(self, key: str, target_adaptors: list[TargetAdaptor]) -> None:
+        try:
+            data = pickle.dumps(target_adaptors, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # E.g. a prelude macro passed a lambda as a field value.
+            logger.debug(f"Not caching the BUILD file parse for {key}: {e}")
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            safe_mkdir(os.path.dirname(path))
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # E.g. the cache directory is read-only or the disk is full: the cache is best-effort.
+            logger.debug(f"Failed to write the BUILD file parse cache entry {key}: {e}")
+            return
+        if next(self._puts) % self._evict_interval == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries beyond `max_entries`."""
+        entries = []
+        try:
+            for shard in os.scandir(self._cache_dir):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if not entry.name.endswith(".tmp"):
+                        entries.append((entry.stat().st_mtime, entry.path))
+        except OSError as e:
+            # E.g. a concurrent Pants process evicted an entry while it was being listed.
+            logger.debug(f"Failed to list the BUILD file parse cache for eviction: {e}")
+            return
+        if len(entries) <= self._max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self._max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class _UncacheableSymbol:
+    """Wraps a BUILD file symbol whose result may depend on more than the BUILD file content."""
+
+    def __init__(self, symbol: Any, parse_state: ParseState) -> None:
+        self._symbol = symbol
+        self._parse_state = parse_state
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self._parse_state.mark_uncacheable()
+        return self._symbol(*args, **kwargs)
+
+
 _AMBIGUOUS_PYTHON_MACRO_SYMBOLS = {
     "python_requirements",
     "pipenv_requirements",
@@ -72,10 +226,142 @@ class Parser:
         target_type_aliases: Iterable[str],
         object_aliases: BuildFileAliases,
         use_deprecated_python_macros: bool = True,
+        cache_dir: str | None = None,
+        parse_processes: int = 0,
     ) -> None:
+        target_type_aliases = tuple(target_type_aliases)
         self._symbols, self._parse_state = self._generate_symbols(
             build_root, target_type_aliases, object_aliases, use_deprecated_python_macros
         )
+        self._cache = BuildFileParseCache(cache_dir) if cache_dir else None
+        self._symbols_fingerprint = self._fingerprint_symbols(self._symbols)
+        self._process_pool = (
+            _ParserProcessPool(
+                parse_processes,
+                dict(
+                    build_root=build_root,
+                    target_type_aliases=target_type_aliases,
+                    object_aliases=object_aliases,
+                    use_deprecated_python_macros=use_deprecated_python_macros,
+                    cache_dir=cache_dir,
+                ),
+            )
+            if parse_processes > 0
+            else None
+        )
+
+    @staticmethod
+    def _fingerprint_symbols(symbols: dict[str, Any]) -> str | None:
+        """Fingerprint the given symbols, or return None if they can't be reliably fingerprinted.
+
+        Functions, classes and modules defined by Pants itself are identified by name, since the
+        Pants version is part of each cache key. Other functions are identified by their bytecode,
+        and recursively by their defaults, the values that they close over, and the globals that
+        they reference, so that e.g. editing a helper function of a plugin changes the fingerprint.
+        Other modules are identified by the content of their source file, and other values by their
+        pickle, or, if they can't be pickled, by their type if Pants defines it. Classes and
+        unpicklable values from plugins can't be identified, so they disable the cache.
+        """
+        # The ids of the functions being described, to stop at recursive references.
+        in_progress: set[int] = set()
+
+        def is_defined_by_pants(name: str | None) -> bool:
+            return (name or "").split(".")[0] == "pants"
+
+        def join(parts: Iterable[bytes | None]) -> bytes | None:
+            result = []
+            for part in parts:
+                if part is None:
+                    return None
+                result.append(b"%d:%s" % (len(part), part))
+            return b"".join(result)
+
+        def referenced_names(code: types.CodeType) -> set[str]:
+            names = set(code.co_names)
+            for const in code.co_consts:
+                if isinstance(const, types.CodeType):
+                    names |= referenced_names(const)
+            return names
+
+        def describe_module(module: types.ModuleType) -> bytes | None:
+            path = getattr(module, "__file__", None)
+            if is_defined_by_pants(module.__name__) or not path:
+                return f"module:{module.__name__}".encode()
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return None
+            return f"module:{module.__name__}:{digest}".encode()
+
+        def describe_function(function: types.FunctionType) -> bytes | None:
+            if id(function) in in_progress:
+                return f"recursive:{function.__qualname__}".encode()
+            in_progress.add(id(function))
+            try:
+                cells = []
+                for cell in function.__closure__ or ():
+                    try:
+                        cells.append(describe(cell.cell_contents))
+                    except ValueError:
+                        # An empty cell, e.g. for a variable assigned after the function.
+                        cells.append(b"empty")
+                global_names = sorted(
+                    name
+                    for name in referenced_names(function.__code__)
+                    if name in function.__globals__
+                )
+                return join(
+                    [
+                        marshal.dumps(function.__code__),
+                        join(describe(value) for value in function.__defaults__ or ()),
+                        join(
+                            join([name.encode(), describe(value)])
+                            for name, value in sorted((function.__kwdefaults__ or {}).items())
+                        ),
+                        join(cells),
+                        join(
+                            join([name.encode(), describe(function.__globals__[name])])
+                            for name in global_names
+                        ),
+                    ]
+                )
+            finally:
+                in_progress.discard(id(function))
+
+        def describe(symbol: Any) -> bytes | None:
+            if isinstance(symbol, _UncacheableSymbol):
+                # Parses which call the symbol are never cached, so its identity doesn't matter.
+                return b"uncacheable"
+            if isinstance(symbol, types.ModuleType):
+                return describe_module(symbol)
+            if isinstance(symbol, (type, types.FunctionType)):
+                if is_defined_by_pants(symbol.__module__):
+                    return f"{symbol.__module__}.{symbol.__qualname__}".encode()
+                if isinstance(symbol, type):
+                    return None
+                return describe_function(symbol)
+            try:
+                return pickle.dumps(symbol, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # NB: E.g. Registrars are instances of a local class, and are identified by alias.
+                symbol_type = type(symbol)
+                if is_defined_by_pants(symbol_type.__module__):
+                    return f"{symbol_type.__module__}.{symbol_type.__qualname__}".encode()
+                return None
+
+        hasher = hashlib.sha256()
+        for alias, symbol in sorted(symbols.items()):
+            description = describe(symbol)
+            if description is None:
+                logger.debug(
+                    f"Not caching BUILD file parses, because the symbol `{alias}` can't be "
+                    "fingerprinted."
+                )
+                return None
+            hasher.update(f"{alias}={len(description)}:".encode())
+            hasher.update(description)
+        return hasher.hexdigest()
 
     @staticmethod
     def _generate_symbols(
@@ -119,12 +405,45 @@ class Parser:
         )
         for alias, object_factory in object_aliases.context_aware_object_factories.items():
             if use_deprecated_python_macros or alias not in _AMBIGUOUS_PYTHON_MACRO_SYMBOLS:
-                symbols[alias] = object_factory(parse_context)
+                symbols[alias] = _UncacheableSymbol(object_factory(parse_context), parse_state)
 
         return symbols, parse_state
 
     def parse(
         self, filepath: str, build_file_content: str, extra_symbols: BuildFilePreludeSymbols
+    ) -> list[TargetAdaptor]:
+        if self._process_pool is not None and (extra_symbols.sources or not extra_symbols.symbols):
+            target_adaptors = self._process_pool.parse(filepath, build_file_content, extra_symbols)
+            if target_adaptors is not None:
+                return target_adaptors
+        return self._parse_cached(filepath, build_file_content, extra_symbols)
+
+    def _parse_cached(
+        self, filepath: str, build_file_content: str, extra_symbols: BuildFilePreludeSymbols
+    ) -> list[TargetAdaptor]:
+        if (
+            self._cache is None
+            or self._symbols_fingerprint is None
+            or extra_symbols.fingerprint is None
+        ):
+            return self._parse(filepath, build_file_content, extra_symbols)
+
+        key = BuildFileParseCache.key(
+            symbols_fingerprint=self._symbols_fingerprint,
+            prelude_fingerprint=extra_symbols.fingerprint,
+            filepath=filepath,
+            content=build_file_content,
+        )
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        target_adaptors = self._parse(filepath, build_file_content, extra_symbols)
+        if self._parse_state.cacheable:
+            self._cache.put(key, target_adaptors)
+        return target_adaptors
+
+    def _parse(
+        self, filepath: str, build_file_content: str, extra_symbols: BuildFilePreludeSymbols
     ) -> list[TargetAdaptor]:
         self._parse_state.reset(rel_path=os.path.dirname(filepath))
 
@@ -171,6 +490,109 @@ class Parser:
         return self._parse_state.parsed_targets()
 
 
+class _ParserProcessPool:
+    """Evaluates BUILD files in worker processes, so that cold graph loading scales with cores.
+
+    Each worker constructs its own `Parser` (the symbols, and the thread local `ParseState` they
+    close over, can't be shared across processes), and re-evaluates the preludes it is sent. The
+    parsed `TargetAdaptor`s are shipped back pickled.
+
+    Parallelism comes from the engine running `parse_address_family` for many directories
+    concurrently: each blocks on its worker without holding the GIL. If the parser configuration
+    can't be sent to workers, or a worker dies, BUILD files are evaluated in-process instead.
+    """
+
+    def __init__(self, processes: int, parser_kwargs: dict[str, Any]) -> None:
+        self._processes = processes
+        self._parser_kwargs = parser_kwargs
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._disabled = False
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        with self._lock:
+            if self._executor is None and not self._disabled:
+                try:
+                    pickle.dumps(self._parser_kwargs)
+                except Exception as e:
+                    logger.warning(
+                        "Evaluating BUILD files in-process, because the registered BUILD file "
+                        f"symbols can't be sent to worker processes: {e}"
+                    )
+                    self._disabled = True
+                    return None
+                # NB: We `spawn` rather than `fork`, since forking a multithreaded process (such
+                # as pantsd) is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_parser_worker,
+                    initargs=(self._parser_kwargs,),
+                )
+            return self._executor
+
+    def _disable(self, reason: Exception) -> None:
+        with self._lock:
+            if self._disabled:
+                return
+            logger.warning(f"Evaluating BUILD files in-process, because a worker failed: {reason}")
+            self._disabled = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def parse(
+        self, filepath: str, build_file_content: str, extra_symbols: BuildFilePreludeSymbols
+    ) -> list[TargetAdaptor] | None:
+        """Parse in a worker, or return None if the BUILD file must be parsed in-process."""
+        executor = self._get_executor()
+        if executor is None:
+            return None
+        try:
+            result = executor.submit(
+                _parse_in_worker,
+                filepath,
+                build_file_content,
+                extra_symbols.fingerprint,
+                extra_symbols.sources,
+            ).result()
+        except BrokenProcessPool as e:
+            self._disable(e)
+            return None
+        return None if result is None else pickle.loads(result)  # type: ignore[no-any-return]
+
+
+# The state of a parser worker process: see `_ParserProcessPool`.
+_worker_parser: Parser | None = None
+_worker_preludes: dict[str | None, BuildFilePreludeSymbols] = {}
+
+
+def _init_parser_worker(parser_kwargs: dict[str, Any]) -> None:
+    global _worker_parser
+    _worker_parser = Parser(**parser_kwargs)
+
+
+def _parse_in_worker(
+    filepath: str,
+    build_file_content: str,
+    prelude_fingerprint: str | None,
+    prelude_sources: tuple[tuple[str, bytes], ...],
+) -> bytes | None:
+    assert _worker_parser is not None
+    extra_symbols = _worker_preludes.get(prelude_fingerprint)
+    if extra_symbols is None or extra_symbols.sources != prelude_sources:
+        extra_symbols = BuildFilePreludeSymbols(
+            FrozenDict(exec_preludes(prelude_sources)), prelude_fingerprint, prelude_sources
+        )
+        _worker_preludes[prelude_fingerprint] = extra_symbols
+    target_adaptors = _worker_parser.parse(filepath, build_file_content, extra_symbols)
+    try:
+        return pickle.dumps(target_adaptors, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # E.g. a prelude macro passed a lambda as a field value: the parent will parse in-process.
+        return None
+
+
 def error_on_imports(build_file_content: str, filepath: str) -> None:
     # This is poor sandboxing; there are many ways to get around this. But it's sufficient to tell
     # users who aren't malicious that they're doing something wrong, and it has a low performance
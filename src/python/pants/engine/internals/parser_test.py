@@ -3,10 +3,21 @@
 
 from __future__ import annotations
 
+import os
+from textwrap import dedent
+from typing import Any, Callable
+
 import pytest
 
 from pants.build_graph.build_file_aliases import BuildFileAliases
-from pants.engine.internals.parser import BuildFilePreludeSymbols, ParseError, Parser
+from pants.engine.internals.parser import (
+    BuildFileParseCache,
+    BuildFilePreludeSymbols,
+    ParseError,
+    Parser,
+    exec_preludes,
+)
+from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.util.docutil import doc_url
 from pants.util.frozendict import FrozenDict
 
@@ -52,3 +63,199 @@ def test_unrecogonized_symbol() -> None:
     perform_test(test_targs[:2], dym_two)
     dym_many = "Did you mean fake5, fake4, or fake3?\n\n"
     perform_test(test_targs, dym_many)
+
+
+def test_parse_cache(tmp_path) -> None:
+    factory_calls = []
+
+    def context_aware_factory(parse_context):
+        def factory(name: str) -> None:
+            factory_calls.append(name)
+
+        return factory
+
+    def make_parser() -> Parser:
+        return Parser(
+            build_root="",
+            target_type_aliases=["tgt"],
+            object_aliases=BuildFileAliases(
+                context_aware_object_factories={"caof": context_aware_factory}
+            ),
+            cache_dir=str(tmp_path),
+        )
+
+    prelude_symbols = BuildFilePreludeSymbols(FrozenDict(), fingerprint="prelude")
+    content = "tgt(name='a', sources=['*.py'])\ntgt()\n"
+    expected = [
+        TargetAdaptor("tgt", name="a", sources=["*.py"]),
+        TargetAdaptor("tgt", name="dir"),
+    ]
+    assert make_parser().parse("dir/BUILD", content, prelude_symbols) == expected
+    assert len(list(tmp_path.glob("*/*"))) == 1
+
+    # A fresh parser (as in a fresh pantsd) reads the cached result, without evaluating the file.
+    parser = make_parser()
+    parser._parse = None  # type: ignore[assignment]
+    assert parser.parse("dir/BUILD", content, prelude_symbols) == expected
+
+    # A different path, prelude, or content is a miss.
+    assert make_parser().parse("other/BUILD", content, prelude_symbols) == [
+        TargetAdaptor("tgt", name="a", sources=["*.py"]),
+        TargetAdaptor("tgt", name="other"),
+    ]
+    make_parser().parse(
+        "dir/BUILD", content, BuildFilePreludeSymbols(FrozenDict(), fingerprint="changed")
+    )
+    assert len(list(tmp_path.glob("*/*"))) == 3
+
+    # Parses which call context aware object factories or which have an unknown prelude are never
+    # cached.
+    for _ in range(2):
+        make_parser().parse("dir/BUILD", "caof(name='b')", prelude_symbols)
+    assert factory_calls == ["b", "b"]
+    make_parser().parse("dir/BUILD", "tgt(name='c')", BuildFilePreludeSymbols(FrozenDict()))
+    assert len(list(tmp_path.glob("*/*"))) == 3
+
+
+def test_parse_cache_symbols_fingerprint(tmp_path) -> None:
+    def plugin_function(value: str = "a") -> str:
+        return value
+
+    def other_plugin_function(value: str = "b") -> str:
+        return value
+
+    class PluginObject:
+        pass
+
+    for obj in (plugin_function, other_plugin_function, PluginObject):
+        obj.__module__ = "my_plugin"
+    # As if the function had been edited in place.
+    other_plugin_function.__qualname__ = plugin_function.__qualname__
+
+    def parse(objects: dict) -> None:
+        parser = Parser(
+            build_root="",
+            target_type_aliases=["tgt"],
+            object_aliases=BuildFileAliases(objects=objects),
+            cache_dir=str(tmp_path),
+        )
+        parser.parse(
+            "dir/BUILD", "tgt(name=obj())", BuildFilePreludeSymbols(FrozenDict(), fingerprint="p")
+        )
+
+    # Plugin functions are fingerprinted by their code, and other values by their value.
+    parse({"obj": plugin_function})
+    parse({"obj": plugin_function})
+    assert len(list(tmp_path.glob("*/*"))) == 1
+    parse({"obj": other_plugin_function})
+    assert len(list(tmp_path.glob("*/*"))) == 2
+    parse({"obj": plugin_function, "value": 1})
+    parse({"obj": plugin_function, "value": 2})
+    assert len(list(tmp_path.glob("*/*"))) == 4
+
+    # Plugin classes can't be fingerprinted, so disable the cache.
+    parse({"obj": plugin_function, "cls": PluginObject})
+    assert len(list(tmp_path.glob("*/*"))) == 4
+
+
+def test_parse_cache_symbols_fingerprint_dependencies() -> None:
+    def plugin_function(source: str) -> Callable:
+        namespace: dict[str, Any] = {"__name__": "my_plugin"}
+        exec(source, namespace)
+        return namespace["obj"]  # type: ignore[no-any-return]
+
+    def fingerprint(obj: Any) -> str | None:
+        return Parser._fingerprint_symbols({"obj": obj})
+
+    source = dedent(
+        """\
+        import json
+        LIMIT = {limit}
+        def helper(value):
+            return value[:LIMIT]
+        def obj(value):
+            return helper(json.dumps(value))
+        """
+    )
+    original = fingerprint(plugin_function(source.format(limit=1)))
+    assert original is not None
+    assert original == fingerprint(plugin_function(source.format(limit=1)))
+    # Module globals and helper functions referenced by a plugin function are fingerprinted.
+    assert original != fingerprint(plugin_function(source.format(limit=2)))
+    assert original != fingerprint(
+        plugin_function(source.format(limit=1).replace("value[:LIMIT]", "value[LIMIT:]"))
+    )
+
+    # As are the values which a plugin function closes over.
+    def make_closure(value: int) -> Callable:
+        def obj() -> int:
+            return value
+
+        obj.__module__ = "my_plugin"
+        return obj
+
+    assert fingerprint(make_closure(1)) == fingerprint(make_closure(1))
+    assert fingerprint(make_closure(1)) != fingerprint(make_closure(2))
+
+    # Recursive functions terminate.
+    recursive = plugin_function("def obj(n):\n    return obj(n - 1) if n else 0\n")
+    assert fingerprint(recursive) is not None
+
+
+def test_parse_cache_eviction(tmp_path) -> None:
+    cache = BuildFileParseCache(str(tmp_path), max_entries=2)
+    adaptors = [TargetAdaptor("tgt", name="a")]
+    cache.put("aa1", adaptors)
+    cache.put("bb2", adaptors)
+    os.utime(tmp_path / "aa" / "aa1", (1000, 1000))
+    os.utime(tmp_path / "bb" / "bb2", (2000, 2000))
+
+    # Reading an entry marks it as recently used, so the least recently used entry is evicted.
+    assert cache.get("aa1") == adaptors
+    cache.put("cc3", adaptors)
+    assert sorted(path.name for path in tmp_path.glob("*/*")) == ["aa1", "cc3"]
+    assert cache.get("bb2") is None
+
+
+def test_parse_cache_unwritable(tmp_path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("Not a directory.")
+    parser = Parser(
+        build_root="",
+        target_type_aliases=["tgt"],
+        object_aliases=BuildFileAliases(),
+        cache_dir=str(cache_dir),
+    )
+    prelude_symbols = BuildFilePreludeSymbols(FrozenDict(), fingerprint="prelude")
+    assert parser.parse("dir/BUILD", "tgt()", prelude_symbols) == [TargetAdaptor("tgt", name="dir")]
+
+
+def test_parse_processes() -> None:
+    parser = Parser(
+        build_root="",
+        target_type_aliases=["tgt"],
+        object_aliases=BuildFileAliases(),
+        parse_processes=2,
+    )
+    prelude_sources = (("prelude.py", b"def macro(name):\n    tgt(name=name, tags=['macro'])\n"),)
+    prelude_symbols = BuildFilePreludeSymbols(
+        FrozenDict(exec_preludes(prelude_sources)), "prelude", prelude_sources
+    )
+    assert parser.parse("dir/BUILD", "tgt()\nmacro('m')", prelude_symbols) == [
+        TargetAdaptor("tgt", name="dir"),
+        TargetAdaptor("tgt", name="m", tags=["macro"]),
+    ]
+    with pytest.raises(ParseError) as exc:
+        parser.parse("dir/BUILD", "import os", prelude_symbols)
+    assert "Import used in dir/BUILD at line 1" in str(exc.value)
+
+    # Symbols which can't be sent to workers fall back to evaluating in-process.
+    parser = Parser(
+        build_root="",
+        target_type_aliases=["tgt"],
+        object_aliases=BuildFileAliases(objects={"obj": lambda: "x"}),
+        parse_processes=2,
+    )
+    assert parser.parse("dir/BUILD", "tgt(name=obj())", BuildFilePreludeSymbols(FrozenDict())) == [
+        TargetAdaptor("tgt", name="x")
+    ]
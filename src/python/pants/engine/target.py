@@ -805,6 +805,45 @@ class AllTargetsRequest:
     """
 
 
+class AllTargetsShardDirectories(DeduplicatedCollection[str]):
+    """Every directory in the project with BUILD files.
+
+    Each directory is the key of one shard of all the targets in the project: see
+    `AllTargetsShardRequest`.
+    """
+
+    sort_input = True
+
+
+@dataclass(frozen=True)
+class AllTargetsShardRequest:
+    """Find the targets defined by the BUILD files in a single directory.
+
+    Every target in the project belongs to exactly one shard, so iterating over the shards for
+    `AllTargetsShardDirectories` visits the same targets as `AllUnexpandedTargets`. Unlike that
+    monolithic collection, each shard is memoized independently, so consumers that compute
+    something per shard only need to recompute the shards whose BUILD files (or sources) changed.
+
+    Use with either `AllUnexpandedTargetsShard` or `AllTargetsShard`.
+
+    To consume all targets as a stream, request a result derived from each shard (e.g. a partial
+    mapping) with a `MultiGet` over `AllTargetsShardDirectories`, and then merge those results.
+    This avoids materializing every target in one collection, and means an edit only recomputes
+    the derived results for the affected shards.
+    """
+
+    directory: str
+
+
+class AllUnexpandedTargetsShard(Collection[Target]):
+    """The targets defined by the BUILD files in a single directory, including generated targets."""
+
+
+class AllTargetsShard(Collection[Target]):
+    """The targets defined by the BUILD files in a single directory, but with target generators
+    replaced by their generated targets, unlike `AllUnexpandedTargetsShard`."""
+
+
 # -----------------------------------------------------------------------------------------------
 # Target generation
 # -----------------------------------------------------------------------------------------------
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, ClassVar, Iterable, cast
@@ -194,6 +195,12 @@ class EngineInitializer:
             engine_visualize_to=bootstrap_options.engine_visualize_to,
             watch_filesystem=bootstrap_options.watch_filesystem,
             use_deprecated_python_macros=bootstrap_options.use_deprecated_python_macros,
+            build_file_parse_cache_dir=(
+                os.path.join(bootstrap_options.named_caches_dir, "build_file_parse")
+                if bootstrap_options.build_file_parse_cache
+                else None
+            ),
+            build_file_parse_processes=bootstrap_options.build_file_parse_processes,
         )
 
     @staticmethod
@@ -213,6 +220,8 @@ class EngineInitializer:
         include_trace_on_error: bool = True,
         engine_visualize_to: str | None = None,
         watch_filesystem: bool = True,
+        build_file_parse_cache_dir: str | None = None,
+        build_file_parse_processes: int = 0,
     ) -> GraphScheduler:
         build_root_path = build_root or get_buildroot()
 
@@ -229,6 +238,8 @@ class EngineInitializer:
                 target_type_aliases=registered_target_types.aliases,
                 object_aliases=build_configuration.registered_aliases,
                 use_deprecated_python_macros=use_deprecated_python_macros,
+                cache_dir=build_file_parse_cache_dir,
+                parse_processes=build_file_parse_processes,
             )
 
         @rule
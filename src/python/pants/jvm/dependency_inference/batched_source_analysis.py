@@ -0,0 +1,115 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Analyze many JVM source files with a single launch of a source analyzer."""
+
+from __future__ import annotations
+
+import os.path
+from dataclasses import dataclass
+
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
+from pants.engine.addresses import Address
+from pants.engine.fs import AddPrefix, CreateDigest, Digest, DigestContents, Directory, MergeDigests
+from pants.engine.process import FallibleProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import SourcesField
+from pants.jvm.jdk_rules import InternalJdk, JvmProcess
+from pants.jvm.resolve.common import ArtifactRequirements
+from pants.jvm.resolve.coursier_fetch import ToolClasspath, ToolClasspathRequest
+from pants.util.frozendict import FrozenDict
+from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
+
+
+@dataclass(frozen=True)
+class SourceAnalysisBatchRequest:
+    """Analyze many single-file sources with one JVM process.
+
+    The `main` class is invoked with a pair of arguments per source: the path to write the JSON
+    analysis of the source to, followed by the path of the source.
+    """
+
+    sources: tuple[SourcesField, ...]
+    main: str
+    artifact_requirements: ArtifactRequirements
+    analyzer_classfiles: Digest
+    source_description: str
+
+
+class SourceAnalysisBatch(FrozenDict[Address, bytes]):
+    """The JSON analysis of each source in a batch, keyed by address.
+
+    Empty if the batch failed: the sources should then be analyzed individually, so that the
+    failure is attributed to the right file.
+    """
+
+
+@rule(level=LogLevel.DEBUG)
+async def analyze_sources_batch(
+    jdk: InternalJdk, request: SourceAnalysisBatchRequest
+) -> SourceAnalysisBatch:
+    source_prefix = "__source_to_analyze"
+    analysis_dir = "__source_analysis"
+    processorcp_relpath = "__processorcp"
+    toolcp_relpath = "__toolcp"
+
+    all_source_files = await MultiGet(
+        Get(SourceFiles, SourceFilesRequest([source])) for source in request.sources
+    )
+    source_files_digest = await Get(
+        Digest, MergeDigests(source_files.snapshot.digest for source_files in all_source_files)
+    )
+    tool_classpath, prefixed_source_files_digest, analysis_dir_digest = await MultiGet(
+        Get(
+            ToolClasspath, ToolClasspathRequest(artifact_requirements=request.artifact_requirements)
+        ),
+        Get(Digest, AddPrefix(source_files_digest, source_prefix)),
+        Get(Digest, CreateDigest([Directory(analysis_dir)])),
+    )
+    extra_immutable_input_digests = {
+        toolcp_relpath: tool_classpath.digest,
+        processorcp_relpath: request.analyzer_classfiles,
+    }
+
+    input_digest = await Get(
+        Digest, MergeDigests([prefixed_source_files_digest, analysis_dir_digest])
+    )
+
+    args = []
+    for i, source_files in enumerate(all_source_files):
+        assert len(source_files.files) == 1
+        args.extend(
+            [f"{analysis_dir}/{i}.json", os.path.join(source_prefix, source_files.files[0])]
+        )
+
+    process_result = await Get(
+        FallibleProcessResult,
+        JvmProcess(
+            jdk=jdk,
+            classpath_entries=[
+                *tool_classpath.classpath_entries(toolcp_relpath),
+                processorcp_relpath,
+            ],
+            argv=[request.main, *args],
+            input_digest=input_digest,
+            extra_immutable_input_digests=extra_immutable_input_digests,
+            output_directories=(analysis_dir,),
+            extra_nailgun_keys=extra_immutable_input_digests,
+            description=f"Analyzing {pluralize(len(request.sources), request.source_description)}",
+            level=LogLevel.DEBUG,
+        ),
+    )
+    if process_result.exit_code != 0:
+        return SourceAnalysisBatch()
+
+    analysis_contents = await Get(DigestContents, Digest, process_result.output_digest)
+    analysis_by_path = {fc.path: fc.content for fc in analysis_contents}
+    return SourceAnalysisBatch(
+        (source.address, analysis_by_path[f"{analysis_dir}/{i}.json"])
+        for i, source in enumerate(request.sources)
+    )
+
+
+def rules():
+    return collect_rules()
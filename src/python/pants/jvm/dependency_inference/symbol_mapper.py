@@ -5,8 +5,10 @@ from __future__ import annotations
 
 import json
 import logging
+import sys
 from collections import defaultdict
 from dataclasses import dataclass
+from typing import DefaultDict
 
 from pants.build_graph.address import Address
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -51,6 +53,25 @@ class SymbolMap:
         for (resolve, symbol), addresses in other._symbol_map.items():
             self._symbol_map[(resolve, symbol)] |= addresses
 
+    def memory_usage(self) -> dict[str, int]:
+        """An estimate of the number of bytes used by the index of each resolve.
+
+        This includes the index structure and its keys, but not the `Address`es, which are shared
+        with the rest of Pants.
+        """
+        table_size = sys.getsizeof(self._symbol_map)
+        entry_table_size = table_size // len(self._symbol_map) if self._symbol_map else 0
+        usage: DefaultDict[str, int] = defaultdict(int)
+        for key, addresses in self._symbol_map.items():
+            resolve, symbol = key
+            usage[resolve] += (
+                entry_table_size
+                + sys.getsizeof(key)
+                + sys.getsizeof(symbol)
+                + sys.getsizeof(addresses)
+            )
+        return dict(sorted(usage.items()))
+
     def to_json_dict(self):
         return {
             "symbol_map": {
@@ -99,6 +120,11 @@ async def merge_first_party_module_mappings(
     merged_dep_map = SymbolMap()
     for dep_map in all_mappings:
         merged_dep_map.merge(dep_map)
+    if logger.isEnabledFor(logging.DEBUG):
+        for resolve, size in merged_dep_map.memory_usage().items():
+            logger.debug(
+                f"The first-party JVM symbol index for resolve `{resolve}` uses ~{size} bytes."
+            )
 
     # `experimental_provides_types` ("`provides`") can be declared on a `java_sources` target,
     # so each generated `java_source` target will have that `provides` annotation. All that matters
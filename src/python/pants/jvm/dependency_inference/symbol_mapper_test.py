@@ -0,0 +1,56 @@
+# Copyright 2022 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import annotations
+
+from pants.build_graph.address import Address
+from pants.jvm.dependency_inference.symbol_mapper import SymbolMap
+
+
+def _address(name: str) -> Address:
+    return Address("src", relative_file_path=f"{name}.java")
+
+
+def test_symbol_map() -> None:
+    a, b, c = _address("A"), _address("B"), _address("C")
+    symbol_map = SymbolMap()
+    symbol_map.add_symbol("org.pantsbuild.a.A", a, resolve="jvm-default")
+    symbol_map.add_symbol("org.pantsbuild.a", a, resolve="jvm-default")
+    symbol_map.add_symbol("org.pantsbuild.a.Shared", a, resolve="jvm-default")
+    symbol_map.add_symbol("org.pantsbuild.a.Shared", b, resolve="jvm-default")
+    symbol_map.add_symbol("org.pantsbuild.a.A", c, resolve="other")
+
+    assert {
+        symbol: sorted(addresses)
+        for symbol, addresses in symbol_map.to_json_dict()["symbol_map"].items()
+    } == {
+        "jvm-default/org.pantsbuild.a.A": ["src/A.java"],
+        "jvm-default/org.pantsbuild.a": ["src/A.java"],
+        "jvm-default/org.pantsbuild.a.Shared": ["src/A.java", "src/B.java"],
+        "other/org.pantsbuild.a.A": ["src/C.java"],
+    }
+    memory_usage = symbol_map.memory_usage()
+    assert set(memory_usage) == {"jvm-default", "other"}
+    assert memory_usage["jvm-default"] > memory_usage["other"] > 0
+
+    assert symbol_map.addresses_for_symbol("org.pantsbuild.a.A", resolve="jvm-default") == {a}
+    assert symbol_map.addresses_for_symbol("org.pantsbuild.a.A", resolve="other") == {c}
+    assert symbol_map.addresses_for_symbol("org.pantsbuild.a.Shared", resolve="jvm-default") == {
+        a,
+        b,
+    }
+    assert not symbol_map.addresses_for_symbol("org.pantsbuild", resolve="jvm-default")
+    assert not symbol_map.addresses_for_symbol("org.pantsbuild.a.A.B", resolve="jvm-default")
+    assert not symbol_map.addresses_for_symbol("org.pantsbuild.a.A", resolve="missing")
+
+
+def test_merge() -> None:
+    a, b = _address("A"), _address("B")
+    left = SymbolMap()
+    left.add_symbol("org.pantsbuild.A", a, resolve="jvm-default")
+    right = SymbolMap()
+    right.add_symbol("org.pantsbuild.A", b, resolve="jvm-default")
+    right.add_symbol("org.pantsbuild.B", b, resolve="other")
+    left.merge(right)
+    assert left.addresses_for_symbol("org.pantsbuild.A", resolve="jvm-default") == {a, b}
+    assert left.addresses_for_symbol("org.pantsbuild.B", resolve="other") == {b}
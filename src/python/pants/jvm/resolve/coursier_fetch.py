@@ -22,16 +22,19 @@ from pants.engine.addresses import UnparsedAddressInputs
 from pants.engine.collection import Collection
 from pants.engine.fs import (
     AddPrefix,
+    CreateDigest,
     Digest,
     DigestContents,
+    DigestEntries,
     DigestSubset,
     FileDigest,
+    FileEntry,
     MergeDigests,
     PathGlobs,
     RemovePrefix,
     Snapshot,
 )
-from pants.engine.process import ProcessResult
+from pants.engine.process import FallibleProcessResult, ProcessResult
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import CoarsenedTargets, Target, Targets
 from pants.engine.unions import UnionRule
@@ -49,7 +52,7 @@ from pants.jvm.resolve.common import (
     Coordinates,
     GatherJvmCoordinatesRequest,
 )
-from pants.jvm.resolve.coursier_setup import Coursier, CoursierFetchProcess
+from pants.jvm.resolve.coursier_setup import Coursier, CoursierFetchProcess, CoursierSubsystem
 from pants.jvm.resolve.key import CoursierResolveKey
 from pants.jvm.resolve.lockfile_metadata import JVMLockfileMetadata, LockfileContext
 from pants.jvm.subsystems import JvmSubsystem
@@ -60,7 +63,9 @@ from pants.jvm.target_types import (
     JvmResolveField,
 )
 from pants.jvm.util_rules import ExtractFileDigest
+from pants.util.collections import partition_sequentially
 from pants.util.docutil import bin_name, doc_url
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.strutil import bullet_list, pluralize
 
@@ -461,9 +466,9 @@ async def fetch_with_coursier(request: CoursierFetchRequest) -> FallibleClasspat
         requirement.coordinate,
     )
 
-    classpath_entries = await MultiGet(
-        Get(ClasspathEntry, CoursierLockfileEntry, entry)
-        for entry in (root_entry, *transitive_entries)
+    classpath_entries = await Get(
+        ResolvedClasspathEntries,
+        CoursierFetchLockfileEntriesRequest(lockfile, (root_entry, *transitive_entries)),
     )
     exported_digest = await Get(Digest, MergeDigests(cpe.digest for cpe in classpath_entries))
 
@@ -570,13 +575,165 @@ async def coursier_fetch_one_coord(
     return ClasspathEntry(digest=stripped_digest, filenames=(classpath_dest_name,))
 
 
+@dataclass(frozen=True)
+class CoursierFetchBatchRequest:
+    """Fetch many lockfile entries in a single Coursier process.
+
+    Entries which set `pants_address` are not supported, and should be fetched individually.
+    """
+
+    entries: tuple[CoursierLockfileEntry, ...]
+
+
+@dataclass(frozen=True)
+class CoursierFetchBatch:
+    """The entries of a `CoursierFetchBatchRequest` which were fetched, by coordinate."""
+
+    classpath_entries: FrozenDict[Coordinate, ClasspathEntry]
+
+    def get(self, coord: Coordinate) -> ClasspathEntry | None:
+        return self.classpath_entries.get(coord)
+
+
+@rule(level=LogLevel.DEBUG)
+async def coursier_fetch_batch(request: CoursierFetchBatchRequest) -> CoursierFetchBatch:
+    """Run `coursier fetch --intransitive` to fetch a batch of artifacts.
+
+    Like `coursier_fetch_one_coord`, each artifact is verified against the lockfile, and is
+    returned in its own `ClasspathEntry` so that consumers only depend on the artifacts they use.
+
+    If Coursier fails, an empty batch is returned, and callers fall back to fetching entries
+    individually (which will then report the error for the offending entry).
+    """
+    coursier_resolve_info = await Get(
+        CoursierResolveInfo,
+        ArtifactRequirements(
+            ArtifactRequirement(entry.coord, url=entry.remote_url) for entry in request.entries
+        ),
+    )
+
+    coursier_report_file_name = "coursier_report.json"
+
+    process_result = await Get(
+        FallibleProcessResult,
+        CoursierFetchProcess(
+            args=(
+                coursier_report_file_name,
+                "--intransitive",
+                *coursier_resolve_info.coord_arg_strings,
+            ),
+            input_digest=coursier_resolve_info.digest,
+            output_directories=("classpath",),
+            output_files=(coursier_report_file_name,),
+            description=(
+                f"Fetching {pluralize(len(request.entries), 'artifact')} with coursier: "
+                f"{request.entries[0].coord.to_coord_str()}, ..."
+            ),
+        ),
+    )
+    if process_result.exit_code != 0:
+        logger.debug(
+            f"Failed to fetch a batch of {pluralize(len(request.entries), 'artifact')} with "
+            f"coursier, falling back to fetching them individually:\n"
+            f"{process_result.stderr.decode()}"
+        )
+        return CoursierFetchBatch(FrozenDict())
+
+    report_digest, classpath_digest = await MultiGet(
+        Get(
+            Digest,
+            DigestSubset(process_result.output_digest, PathGlobs([coursier_report_file_name])),
+        ),
+        Get(Digest, DigestSubset(process_result.output_digest, PathGlobs(["classpath/**"]))),
+    )
+    stripped_classpath_digest = await Get(Digest, RemovePrefix(classpath_digest, "classpath"))
+    report_contents, classpath_digest_entries = await MultiGet(
+        Get(DigestContents, Digest, report_digest),
+        Get(DigestEntries, Digest, stripped_classpath_digest),
+    )
+    report = json.loads(report_contents[0].content)
+
+    dest_names_by_coord = {
+        Coordinate.from_coord_str(dep["coord"]): classpath_dest_filename(dep["coord"], dep["file"])
+        for dep in report["dependencies"]
+    }
+    file_entries_by_name = {
+        entry.path: entry for entry in classpath_digest_entries if isinstance(entry, FileEntry)
+    }
+
+    fetched: list[tuple[Coordinate, FileEntry]] = []
+    for entry in request.entries:
+        dest_name = dest_names_by_coord.get(entry.coord)
+        file_entry = file_entries_by_name.get(dest_name) if dest_name else None
+        if file_entry is None:
+            continue
+        if file_entry.file_digest != entry.file_digest:
+            raise CoursierError(
+                f"Coursier fetch for '{entry.coord}' succeeded, but fetched artifact {file_entry.file_digest} did not match the expected artifact: {entry.file_digest}."
+            )
+        fetched.append((entry.coord, file_entry))
+
+    digests = await MultiGet(Get(Digest, CreateDigest([file_entry])) for _, file_entry in fetched)
+    return CoursierFetchBatch(
+        FrozenDict(
+            (coord, ClasspathEntry(digest=digest, filenames=(file_entry.path,)))
+            for (coord, file_entry), digest in zip(fetched, digests)
+        )
+    )
+
+
+@dataclass(frozen=True)
+class CoursierFetchLockfileEntriesRequest:
+    """Fetch some of the entries of a lockfile, in batches of `[coursier].fetch_batch_size`."""
+
+    lockfile: CoursierResolvedLockfile
+    entries: tuple[CoursierLockfileEntry, ...]
+
+
+@rule(level=LogLevel.DEBUG)
+async def coursier_fetch_lockfile_entries(
+    request: CoursierFetchLockfileEntriesRequest, coursier: CoursierSubsystem
+) -> ResolvedClasspathEntries:
+    batch_size = coursier.fetch_batch_size
+    fetched: dict[Coordinate, ClasspathEntry] = {}
+    if batch_size > 1:
+        # NB: Batches are formed from the whole lockfile rather than from the requested entries, so
+        # that every consumer of the lockfile requests (and caches) the same batches.
+        batch_request_by_coord: dict[Coordinate, CoursierFetchBatchRequest] = {}
+        for batch in partition_sequentially(
+            (entry for entry in request.lockfile.entries if not entry.pants_address),
+            key=lambda entry: entry.coord.to_coord_str(),
+            size_target=max(2, batch_size // 2),
+            size_max=batch_size,
+        ):
+            batch_request = CoursierFetchBatchRequest(tuple(batch))
+            batch_request_by_coord.update((entry.coord, batch_request) for entry in batch)
+        batch_requests = {
+            batch_request_by_coord[entry.coord]: None
+            for entry in request.entries
+            if entry.coord in batch_request_by_coord
+        }
+        batches = await MultiGet(
+            Get(CoursierFetchBatch, CoursierFetchBatchRequest, batch_request)
+            for batch_request in batch_requests
+        )
+        for batch in batches:
+            fetched.update(batch.classpath_entries)
+
+    unfetched_entries = [entry for entry in request.entries if entry.coord not in fetched]
+    individually_fetched = await MultiGet(
+        Get(ClasspathEntry, CoursierLockfileEntry, entry) for entry in unfetched_entries
+    )
+    fetched.update(zip((entry.coord for entry in unfetched_entries), individually_fetched))
+    return ResolvedClasspathEntries(fetched[entry.coord] for entry in request.entries)
+
+
 @rule(level=LogLevel.DEBUG)
 async def coursier_fetch_lockfile(lockfile: CoursierResolvedLockfile) -> ResolvedClasspathEntries:
     """Fetch every artifact in a lockfile."""
-    classpath_entries = await MultiGet(
-        Get(ClasspathEntry, CoursierLockfileEntry, entry) for entry in lockfile.entries
+    return await Get(
+        ResolvedClasspathEntries, CoursierFetchLockfileEntriesRequest(lockfile, lockfile.entries)
     )
-    return ResolvedClasspathEntries(classpath_entries)
 
 
 @rule
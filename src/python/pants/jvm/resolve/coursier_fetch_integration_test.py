@@ -20,7 +20,14 @@ from pants.jvm.resolve.common import (
     Coordinate,
     Coordinates,
 )
-from pants.jvm.resolve.coursier_fetch import CoursierLockfileEntry, CoursierResolvedLockfile
+from pants.jvm.resolve.coursier_fetch import (
+    CoursierError,
+    CoursierFetchBatch,
+    CoursierFetchBatchRequest,
+    CoursierLockfileEntry,
+    CoursierResolvedLockfile,
+    ResolvedClasspathEntries,
+)
 from pants.jvm.resolve.coursier_fetch import rules as coursier_fetch_rules
 from pants.jvm.target_types import JvmArtifactJarSourceField, JvmArtifactTarget
 from pants.jvm.testutil import maybe_skip_jdk_test
@@ -46,6 +53,8 @@ def rule_runner() -> RuleRunner:
             QueryRule(Targets, [AddressSpecs]),
             QueryRule(CoursierResolvedLockfile, (ArtifactRequirements,)),
             QueryRule(ClasspathEntry, (CoursierLockfileEntry,)),
+            QueryRule(CoursierFetchBatch, (CoursierFetchBatchRequest,)),
+            QueryRule(ResolvedClasspathEntries, (CoursierResolvedLockfile,)),
             QueryRule(FileDigest, (ExtractFileDigest,)),
         ],
         target_types=[JvmArtifactTarget],
@@ -572,6 +581,51 @@ def test_fetch_one_coord_with_mismatched_coord(rule_runner: RuleRunner) -> None:
         rule_runner.request(ClasspathEntry, [lockfile_entry])
 
 
+@maybe_skip_jdk_test
+def test_fetch_batch(rule_runner: RuleRunner) -> None:
+    resolved_lockfile = rule_runner.request(
+        CoursierResolvedLockfile,
+        [
+            ArtifactRequirements.from_coordinates(
+                [Coordinate(group="junit", artifact="junit", version="4.13.2")]
+            )
+        ],
+    )
+    assert len(resolved_lockfile.entries) == 2
+
+    batch = rule_runner.request(
+        CoursierFetchBatch, [CoursierFetchBatchRequest(resolved_lockfile.entries)]
+    )
+    for entry in resolved_lockfile.entries:
+        # Each artifact is fetched into its own entry, identical to fetching it on its own.
+        assert batch.get(entry.coord) == rule_runner.request(ClasspathEntry, [entry])
+
+    # Batches of any size fetch the same classpath as fetching entries individually.
+    individually_fetched = rule_runner.request(ResolvedClasspathEntries, [resolved_lockfile])
+    rule_runner.set_options(
+        args=["--coursier-fetch-batch-size=2"], env_inherit=PYTHON_BOOTSTRAP_ENV
+    )
+    assert (
+        rule_runner.request(ResolvedClasspathEntries, [resolved_lockfile]) == individually_fetched
+    )
+
+
+@maybe_skip_jdk_test
+def test_fetch_batch_with_bad_fingerprint(rule_runner: RuleRunner) -> None:
+    lockfile_entry = CoursierLockfileEntry(
+        coord=HAMCREST_COORD,
+        file_name="hamcrest-core-1.3.jar",
+        direct_dependencies=Coordinates([]),
+        dependencies=Coordinates([]),
+        file_digest=FileDigest(
+            fingerprint="ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff",
+            serialized_bytes_length=45024,
+        ),
+    )
+    with engine_error(CoursierError, contains="did not match the expected artifact"):
+        rule_runner.request(CoursierFetchBatch, [CoursierFetchBatchRequest((lockfile_entry,))])
+
+
 @maybe_skip_jdk_test
 def test_user_repo_order_is_respected(rule_runner: RuleRunner) -> None:
     """Tests that the repo resolution order issue found in #14577 is avoided."""
@@ -21,7 +21,7 @@ from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
 from pants.engine.platform import Platform
 from pants.engine.process import Process
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
-from pants.option.option_types import StrListOption
+from pants.option.option_types import IntOption, StrListOption
 from pants.util.logging import LogLevel
 from pants.util.memo import memoized_property
 from pants.util.ordered_set import FrozenOrderedSet
@@ -137,6 +137,19 @@ class CoursierSubsystem(TemplatedExternalTool):
             "re-downloaded. This can result in artifacts in lockfiles becoming invalid."
         ),
     )
+    fetch_batch_size = IntOption(
+        "--fetch-batch-size",
+        default=1,
+        help=(
+            "The maximum number of lockfile entries to fetch in a single Coursier process.\n\n"
+            "Batches are formed by stably partitioning the entries of a lockfile, so that "
+            "adding an entry only changes its own batch. Values greater than 1 reduce the "
+            "number of Coursier processes on cold runs, at the cost of fetching the whole batch "
+            "when only some of its entries are needed. Each fetched artifact is still verified "
+            "against the lockfile and cached individually."
+        ),
+        advanced=True,
+    )
 
     def generate_exe(self, plat: Platform) -> str:
         archive_filename = os.path.basename(self.generate_url(plat))
@@ -966,6 +966,36 @@ class GlobalOptions(Subsystem):
             ),
             default=os.path.join(get_pants_cachedir(), "named_caches"),
         )
+        register(
+            "--build-file-parse-cache",
+            advanced=True,
+            type=bool,
+            default=False,
+            help=(
+                "If true, persist the targets parsed from each BUILD file in the "
+                "`build_file_parse` directory of `--named-caches-dir`, keyed by the content of the "
+                "BUILD file, the content of the `--build-file-prelude-globs`, and the registered "
+                "BUILD file symbols. A fresh Pants daemon can then skip evaluating BUILD files "
+                "which have not changed.\n\n"
+                "BUILD files which call context aware object factories, such as the deprecated "
+                "Python macros, are never cached, because those may read other files. The "
+                "least recently used entries are evicted once the cache holds more than 100,000 "
+                "parses."
+            ),
+        )
+        register(
+            "--build-file-parse-processes",
+            advanced=True,
+            type=int,
+            default=0,
+            help=(
+                "If greater than zero, evaluate BUILD files in a pool of this many worker "
+                "processes rather than in the Pants process, so that loading the build graph "
+                "without a warm Pants daemon scales with the number of cores.\n\n"
+                "Pants will evaluate BUILD files in-process if the registered BUILD file symbols "
+                "cannot be sent to worker processes."
+            ),
+        )
 
         register(
             "--local-execution-root-dir",
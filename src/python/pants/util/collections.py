@@ -145,3 +145,22 @@ def partition_sequentially(
             yield emit_batch()
     if batch:
         yield emit_batch()
+
+
+def partition_containing(
+    items: Iterable[_T], item_key: str, *, key: Callable[[_T], str], size_max: int
+) -> list[_T] | None:
+    """Stably partition the items into batches of at most `size_max` items, and return the batch
+    containing the item whose key is `item_key`, or None if there is no such item.
+
+    This is for rules which process each item as part of a batch: every item of a batch computes the
+    same batch, so a memoized rule for the batch only runs once. Batches target half of `size_max`
+    items (but at least 2), so that only a minority of batches are capped, which would weaken
+    stability: see `partition_sequentially`.
+    """
+    for batch in partition_sequentially(
+        items, key=key, size_target=max(2, size_max // 2), size_max=size_max
+    ):
+        if any(key(item) == item_key for item in batch):
+            return batch
+    return None
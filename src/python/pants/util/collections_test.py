@@ -12,6 +12,7 @@ from pants.util.collections import (
     assert_single_element,
     ensure_list,
     ensure_str_list,
+    partition_containing,
     partition_sequentially,
     recursively_update,
 )
@@ -107,3 +108,18 @@ def test_partition_sequentially(size_target: int) -> None:
     for to_add in [item for i, item in enumerate(all_items) if i % 2 == 1]:
         updated_partitions = partitioned_buckets([to_add, *base_items])
         assert 1 <= len(base_partitions ^ updated_partitions) <= 4
+
+
+def test_partition_containing() -> None:
+    items = [f"item{i}" for i in range(100)]
+    batches = {
+        item: partition_containing(reversed(items), item, key=str, size_max=8) for item in items
+    }
+    for item, batch in batches.items():
+        assert batch is not None
+        assert item in batch
+        assert 1 <= len(batch) <= 8
+        assert batch == sorted(batch)
+        # Every item of a batch computes the same batch.
+        assert all(batches[other] == batch for other in batch)
+    assert partition_containing(items, "missing", key=str, size_max=8) is None